@@ -0,0 +1,16 @@
+"""
+Benchmark suite for the setup pipeline.
+
+Times each stage of initial_setup() (assessment validation, ConfigManager
+load/lookup/update, WorkspaceManager load/save, lesson plan rendering and
+prompt customization) against synthetic cohorts of students.
+
+Usage:
+    python -m benchmarks                        # 1, 100 and 10,000 students
+    python -m benchmarks --sizes 1 100 --output results.json
+    python -m benchmarks --compare baseline.json
+"""
+
+from .runner import BenchmarkRunner, compare_results, synthetic_students
+
+__all__ = ['BenchmarkRunner', 'compare_results', 'synthetic_students']
@@ -0,0 +1,47 @@
+"""
+Command-line entry point: python -m benchmarks
+"""
+
+import argparse
+import logging
+import sys
+
+from .runner import (DEFAULT_SIZES, BenchmarkRunner, compare_results, format_comparison,
+                     format_results, load_results, save_results)
+
+def main(argv=None) -> int:
+    """Run the benchmarks and optionally compare against a previous run."""
+    parser = argparse.ArgumentParser(description="Benchmark the setup pipeline.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES),
+                        help='Cohort sizes to benchmark')
+    parser.add_argument('--stage', action='append', dest='stages', metavar='NAME',
+                        help='Only report this stage (repeatable)')
+    parser.add_argument('--seed', type=int, default=0, help='Seed for the synthetic students')
+    parser.add_argument('--no-memory', action='store_true', help='Skip the traced memory pass')
+    parser.add_argument('--output', metavar='FILE', default='benchmark_results.json',
+                        help='Write results as JSON')
+    parser.add_argument('--compare', metavar='FILE', help='Compare p50 timings against a previous results file')
+    parser.add_argument('--workdir', metavar='DIR', help='Parent directory for temporary cohorts')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING, format='%(levelname)s - %(message)s')
+
+    runner = BenchmarkRunner(
+        sizes=args.sizes,
+        seed=args.seed,
+        measure_memory=not args.no_memory,
+        stages=args.stages,
+        workdir=args.workdir
+    )
+    results = runner.run()
+    save_results(results, args.output)
+    print(format_results(results))
+    print(f"\nResults written to {args.output}")
+
+    if args.compare:
+        print()
+        print(format_comparison(compare_results(load_results(args.compare), results)))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
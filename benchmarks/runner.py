@@ -0,0 +1,272 @@
+"""
+Benchmark runner: synthetic cohorts, timing, memory peaks and JSON results.
+
+Every stage is timed per student with perf_counter_ns, without tracing. Memory
+is measured in a second, tracemalloc-enabled pass over a fresh working
+directory so tracing overhead never leaks into the timings.
+"""
+
+import json
+import logging
+import math
+import platform
+import random
+import subprocess
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+from setup.assessment import UserAssessment
+
+from .stages import REPO_ROOT, PipelineContext, build_stages
+
+DEFAULT_SIZES = (1, 100, 10_000)
+PERCENTILES = (50, 90, 95, 99)
+RESULTS_FORMAT_VERSION = 1
+
+INTERESTS = ["games", "web", "data", "robots", "music", "art", "science", "automation"]
+GOALS = ["Build a game", "Automate chores", "Analyse data", "Make a website"]
+PACES = ["Quick", "Standard", "Thorough"]
+FREQUENCIES = ["After each concept", "End of each lesson", "Custom schedule"]
+
+def synthetic_students(count: int, seed: int = 0) -> List[Dict]:
+    """Generate deterministic assessment records.
+
+    Args:
+        count: Number of students
+        seed: Random seed, so runs compare like with like
+
+    Returns:
+        Assessment records accepted by UserAssessment.validate_assessment
+    """
+    rng = random.Random(seed)
+    return [
+        {
+            "id": f"student_{i:05d}",
+            "name": f"Student {i}",
+            "skill_level": rng.choice(UserAssessment.SKILL_LEVELS),
+            "theme": rng.choice(UserAssessment.THEMES),
+            "interests": rng.sample(INTERESTS, rng.randint(1, 3)),
+            "goals": rng.choice(GOALS),
+            "preferences": {
+                "pace": rng.choice(PACES),
+                "practice_frequency": rng.choice(FREQUENCIES),
+                "show_hints": rng.random() < 0.5,
+                "notifications_enabled": True
+            }
+        }
+        for i in range(count)
+    ]
+
+def percentile(sorted_values: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted sequence."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(len(sorted_values) * pct / 100))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+def summarize(durations_ns: List[int]) -> Dict:
+    """Summarise per-operation durations in microseconds."""
+    values = sorted(d / 1000 for d in durations_ns)
+    total = sum(values)
+    summary = {
+        "count": len(values),
+        "total_us": total,
+        "mean_us": total / len(values) if values else 0.0,
+        "min_us": values[0] if values else 0.0,
+        "max_us": values[-1] if values else 0.0,
+        "ops_per_sec": len(values) / (total / 1_000_000) if total else 0.0
+    }
+    for pct in PERCENTILES:
+        summary[f"p{pct}_us"] = percentile(values, pct)
+    return summary
+
+def git_revision() -> Optional[str]:
+    """Short commit hash of the working tree, if it is a git checkout."""
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=REPO_ROOT, capture_output=True, text=True, check=True
+        )
+        return result.stdout.strip() or None
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+class BenchmarkRunner:
+    """Runs the setup pipeline benchmarks for a list of cohort sizes."""
+
+    def __init__(self,
+                 sizes: Sequence[int] = DEFAULT_SIZES,
+                 seed: int = 0,
+                 measure_memory: bool = True,
+                 stages: Optional[Sequence[str]] = None,
+                 workdir: Optional[str] = None):
+        """Initialize the runner.
+
+        Args:
+            sizes: Cohort sizes to benchmark
+            seed: Seed for the synthetic students
+            measure_memory: Run a second, traced pass to record memory peaks
+            stages: Names of stages to report (all when None); every stage
+                still runs so later stages have the files they depend on
+            workdir: Parent directory for temporary cohorts (system default when None)
+        """
+        self.logger = logging.getLogger(__name__)
+        self.sizes = list(sizes)
+        self.seed = seed
+        self.measure_memory = measure_memory
+        self.stages = set(stages) if stages else None
+        self.workdir = workdir
+
+    def run(self) -> Dict:
+        """Run every cohort size.
+
+        Returns:
+            Results document with metadata and one entry per (stage, size)
+        """
+        results = []
+        for size in self.sizes:
+            self.logger.info(f"Benchmarking {size} students")
+            students = synthetic_students(size, self.seed)
+            timings = self._run_pipeline(students, trace_memory=False)
+            memory = self._run_pipeline(students, trace_memory=True) if self.measure_memory else {}
+            for name, durations in timings.items():
+                entry = {"stage": name, "students": size, "timings": summarize(durations)}
+                if name in memory:
+                    entry["memory"] = memory[name]
+                results.append(entry)
+
+        return {
+            "format_version": RESULTS_FORMAT_VERSION,
+            "metadata": {
+                "created": datetime.now().isoformat(),
+                "git_revision": git_revision(),
+                "python": platform.python_version(),
+                "implementation": platform.python_implementation(),
+                "platform": platform.platform(),
+                "seed": self.seed,
+                "sizes": self.sizes
+            },
+            "results": results
+        }
+
+    def _run_pipeline(self, students: List[Dict], trace_memory: bool) -> Dict:
+        """Run every stage over a cohort in a fresh working directory.
+
+        Returns:
+            Stage name -> list of per-student durations in nanoseconds, or
+            stage name -> memory statistics when trace_memory is set
+        """
+        measurements = {}
+        with tempfile.TemporaryDirectory(prefix="bench-", dir=self.workdir) as workdir:
+            ctx = PipelineContext(students, Path(workdir))
+            if trace_memory:
+                tracemalloc.start()
+            try:
+                for stage in build_stages(ctx):
+                    if trace_memory:
+                        result = self._trace_stage(stage, len(students))
+                    else:
+                        result = self._time_stage(stage, len(students))
+                    if self.stages is None or stage.name in self.stages:
+                        measurements[stage.name] = result
+            finally:
+                if trace_memory:
+                    tracemalloc.stop()
+        return measurements
+
+    @staticmethod
+    def _time_stage(stage, count: int) -> List[int]:
+        """Time each operation of a stage, excluding its per-operation setup."""
+        durations = []
+        clock = time.perf_counter_ns
+        for i in range(count):
+            prepared = stage.setup(i) if stage.setup else None
+            start = clock()
+            stage.op(i, prepared)
+            durations.append(clock() - start)
+        return durations
+
+    @staticmethod
+    def _trace_stage(stage, count: int) -> Dict:
+        """Record the largest per-operation allocation peak and retained growth."""
+        stage_start, _ = tracemalloc.get_traced_memory()
+        peak = 0
+        for i in range(count):
+            prepared = stage.setup(i) if stage.setup else None
+            before, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            stage.op(i, prepared)
+            _, op_peak = tracemalloc.get_traced_memory()
+            peak = max(peak, op_peak - before)
+            del prepared
+        stage_end, _ = tracemalloc.get_traced_memory()
+        return {"peak_bytes": peak, "retained_bytes": max(0, stage_end - stage_start)}
+
+def compare_results(baseline: Dict, current: Dict, metric: str = "p50_us") -> List[Dict]:
+    """Pair up matching (stage, size) entries of two results documents.
+
+    Args:
+        baseline: Earlier results document
+        current: Newer results document
+        metric: Timing key to compare
+
+    Returns:
+        One row per entry present in both, with the relative change
+        (negative means faster)
+    """
+    previous = {(r["stage"], r["students"]): r for r in baseline.get("results", [])}
+    rows = []
+    for entry in current.get("results", []):
+        old = previous.get((entry["stage"], entry["students"]))
+        if old is None:
+            continue
+        before = old["timings"].get(metric, 0.0)
+        after = entry["timings"].get(metric, 0.0)
+        rows.append({
+            "stage": entry["stage"],
+            "students": entry["students"],
+            "metric": metric,
+            "baseline": before,
+            "current": after,
+            "change": (after - before) / before if before else None
+        })
+    return rows
+
+def format_results(results: Dict) -> str:
+    """Render a results document as a fixed-width table."""
+    header = (f"{'stage':<22}{'students':>9}{'p50 us':>11}{'p90 us':>11}"
+              f"{'p99 us':>11}{'max us':>11}{'peak KiB':>10}")
+    lines = [header, "-" * len(header)]
+    for entry in results["results"]:
+        t = entry["timings"]
+        peak = entry.get("memory", {}).get("peak_bytes")
+        peak_text = f"{peak / 1024:.1f}" if peak is not None else "-"
+        lines.append(
+            f"{entry['stage']:<22}{entry['students']:>9}{t['p50_us']:>11.1f}{t['p90_us']:>11.1f}"
+            f"{t['p99_us']:>11.1f}{t['max_us']:>11.1f}{peak_text:>10}"
+        )
+    return "\n".join(lines)
+
+def format_comparison(rows: List[Dict]) -> str:
+    """Render compare_results() rows as a fixed-width table."""
+    header = f"{'stage':<22}{'students':>9}{'baseline':>11}{'current':>11}{'change':>9}"
+    lines = [header, "-" * len(header)]
+    for row in rows:
+        change = f"{row['change'] * 100:+.1f}%" if row["change"] is not None else "-"
+        lines.append(
+            f"{row['stage']:<22}{row['students']:>9}{row['baseline']:>11.1f}"
+            f"{row['current']:>11.1f}{change:>9}"
+        )
+    return "\n".join(lines)
+
+def save_results(results: Dict, path: str) -> None:
+    """Write a results document as JSON."""
+    Path(path).write_text(json.dumps(results, indent=2))
+
+def load_results(path: str) -> Dict:
+    """Read a results document written by save_results."""
+    return json.loads(Path(path).read_text())
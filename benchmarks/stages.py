@@ -0,0 +1,127 @@
+"""
+Benchmark stages mirroring initial_setup().
+
+Each stage is timed once per synthetic student. Stages run in pipeline order
+against a shared working directory, so later stages (e.g. config.load) operate
+on the files written by earlier ones (config.initialize), just like a real
+setup run.
+"""
+
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+from config.config_manager import ConfigManager
+from setup.assessment import UserAssessment
+from setup.lesson_plan import LessonPlanGenerator
+from setup.profile import UserProfile
+from setup.prompt_setup import PromptManager
+from setup.workspace import WorkspaceManager
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+TEMPLATE_DIR = REPO_ROOT / "docs"
+TEMPLATE_FILE = "LESSON_PLAN_TEMPLATE.md"
+PROMPT_FILE = REPO_ROOT / "ai_agents" / "prompts" / "learning_assistant.md"
+
+# Lookups performed per student by the config.lookup stage
+SETTING_PATHS = [
+    "editor.tab_size",
+    "ai_assistants.specialized_agents.debug.enabled",
+    "learning_env.difficulty_scaling"
+]
+PREFERENCE_PATHS = ["preferences.pace", "theme", "skill_level"]
+
+class Stage(NamedTuple):
+    """A timed pipeline step.
+
+    setup(index) runs untimed before each operation and its return value is
+    passed to op(index, prepared); only op is measured.
+    """
+    name: str
+    op: Callable[[int, Any], Any]
+    setup: Optional[Callable[[int], Any]] = None
+
+class PipelineContext:
+    """Shared components and per-student paths for one benchmark run."""
+
+    def __init__(self, students: List[Dict], workdir: Path):
+        """Initialize the pipeline context.
+
+        Args:
+            students: Synthetic assessment records
+            workdir: Directory receiving one sub-directory per student
+        """
+        self.students = students
+        self.workdir = Path(workdir)
+        self.assessment = UserAssessment()
+        self.lesson_gen = LessonPlanGenerator(template_dir=str(TEMPLATE_DIR), cache_dir=None)
+        self.prompt_mgr = PromptManager(prompt_file=str(PROMPT_FILE))
+        self.template = self.lesson_gen._load_template(TEMPLATE_FILE)
+
+    def student_dir(self, index: int) -> Path:
+        """Directory holding one student's configuration and workspace."""
+        return self.workdir / f"student_{index:05d}"
+
+    def cursor_dir(self, index: int) -> str:
+        """Cursor configuration directory of one student."""
+        return str(self.student_dir(index) / ".cursor")
+
+def build_stages(ctx: PipelineContext) -> List[Stage]:
+    """Create the benchmark stages, in initial_setup() order.
+
+    Args:
+        ctx: Pipeline context shared by all stages
+
+    Returns:
+        Stages to run for every student
+    """
+    students = ctx.students
+
+    def initialize_config(i: int, _: Any) -> None:
+        record = students[i]
+        ConfigManager(str(ctx.student_dir(i))).initialize_student(
+            name=record["name"], skill_level=record["skill_level"], profile=record
+        )
+
+    def load_config(i: int) -> ConfigManager:
+        return ConfigManager(str(ctx.student_dir(i)))
+
+    def lookup_config(i: int, config: ConfigManager) -> None:
+        for path in SETTING_PATHS:
+            config.get_setting(path)
+        for path in PREFERENCE_PATHS:
+            config.get_student_preference(path)
+
+    def save_workspace(i: int, _: Any) -> None:
+        WorkspaceManager(cursor_config_dir=ctx.cursor_dir(i)).configure_workspace(str(PROMPT_FILE))
+
+    def update_workspace(i: int, _: Any) -> None:
+        WorkspaceManager(cursor_config_dir=ctx.cursor_dir(i)).update_workspace_config(
+            {"settings": {"theme": students[i]["theme"]}}
+        )
+
+    def render_plan(i: int, _: Any) -> None:
+        ctx.lesson_gen._render_template(ctx.template, students[i])
+
+    def generate_plan(i: int, _: Any) -> None:
+        ctx.lesson_gen.generate_plan(
+            TEMPLATE_FILE, str(ctx.student_dir(i) / "LESSON_PLAN_CUSTOM.md"), students[i], force=True
+        )
+
+    return [
+        Stage("assessment.validate", lambda i, _: ctx.assessment.validate_assessment(students[i])),
+        Stage("assessment.profile", lambda i, _: UserProfile.from_dict(students[i])),
+        Stage("config.initialize", initialize_config),
+        Stage("config.load", lambda i, _: load_config(i)),
+        Stage("config.lookup", lookup_config, setup=load_config),
+        Stage("config.update",
+              lambda i, config: config.update_progress("exercise_completed", f"ex_{i}"),
+              setup=load_config),
+        Stage("workspace.save", save_workspace),
+        Stage("workspace.load",
+              lambda i, workspace: workspace._load_workspace_config(),
+              setup=lambda i: WorkspaceManager(cursor_config_dir=ctx.cursor_dir(i))),
+        Stage("workspace.update", update_workspace),
+        Stage("lesson_plan.render", render_plan),
+        Stage("lesson_plan.generate", generate_plan),
+        Stage("prompt.customize", lambda i, _: ctx.prompt_mgr.customize_prompt(students[i]))
+    ]
@@ -1,8 +1,31 @@
 """
 Configuration package for the Interactive Learning Environment.
 Provides tools for managing student preferences, progress tracking, and system settings.
+
+Modules are imported on first attribute access, see setup/__init__.py.
 """
 
-from .config_manager import ConfigManager
+from importlib import import_module
+
+# Public name -> submodule that defines it
+_EXPORTS = {
+    'ConfigManager': '.config_manager',
+    'SQLiteProgressStore': '.progress_store',
+    'ConfigManagerPool': '.pool',
+    'CohortData': '.analytics',
+    'load_cohort': '.analytics',
+    'CurriculumGraph': '.curriculum',
+}
+
+__all__ = ['ConfigManager', 'SQLiteProgressStore', 'ConfigManagerPool', 'CohortData', 'load_cohort',
+           'CurriculumGraph']
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        value = getattr(import_module(_EXPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-__all__ = ['ConfigManager'] 
\ No newline at end of file
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,223 @@
+"""
+Incremental streak, points and badge maintenance for progress documents.
+
+Each progress event updates achievements.streaks, achievements.points and
+achievements.badges in constant time from the running state already stored in
+progress.json (the last activity date and current counters); lesson_history is
+never rescanned. Badge rules are declared in the `achievements` section of
+settings.yaml and compiled into an index from event type to the rules that
+event can affect, so an event only evaluates the rules it could trigger.
+
+Settings format:
+    achievements:
+      points:
+        lesson_completed: 100     # points per event type
+        active_day: 5             # points for the first event of each day
+      badges:
+        first_lesson:
+          description: "Complete your first lesson"
+          when: {lessons_completed: 1}
+
+Usage:
+    from config.achievements import engine_for
+    engine = engine_for(settings)
+    new_badges = engine.apply(progress, 'lesson_completed', '2024-01-01T10:00:00')
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from datetime import date, timedelta
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+# Pseudo-event earning points on the first activity of each day
+ACTIVE_DAY = "active_day"
+
+# Rules triggered by every event are indexed under this key
+ANY_EVENT = "*"
+
+# Metric name -> (event types that can change it, reader over the progress document).
+# None means any event can change the metric.
+METRICS: Dict[str, Tuple[Optional[Tuple[str, ...]], Callable[[Dict], Any]]] = {
+    "lessons_completed": (
+        ("lesson_completed",),
+        lambda p: len(p.get("user_progress", {}).get("completed_lessons", ()))
+    ),
+    "exercises_completed": (
+        ("exercise_completed",),
+        lambda p: p.get("practice_stats", {}).get("exercises_completed", 0)
+    ),
+    "exercises_attempted": (
+        ("exercise_attempted", "exercise_completed"),
+        lambda p: p.get("practice_stats", {}).get("exercises_attempted", 0)
+    ),
+    "success_rate": (
+        ("exercise_attempted", "exercise_completed"),
+        lambda p: p.get("practice_stats", {}).get("success_rate", 0)
+    ),
+    "points": (None, lambda p: p.get("achievements", {}).get("points", 0)),
+    "current_streak": (
+        None, lambda p: p.get("achievements", {}).get("streaks", {}).get("current_streak", 0)
+    ),
+    "longest_streak": (
+        None, lambda p: p.get("achievements", {}).get("streaks", {}).get("longest_streak", 0)
+    ),
+}
+
+class BadgeRule:
+    """A badge awarded once every condition reaches its threshold."""
+
+    __slots__ = ("name", "description", "conditions")
+
+    def __init__(self, name: str, description: str, conditions: List[Tuple[Callable, float]]):
+        self.name = name
+        self.description = description
+        self.conditions = conditions
+
+    def satisfied(self, progress: Dict) -> bool:
+        for read, threshold in self.conditions:
+            value = read(progress)
+            if not isinstance(value, (int, float)) or value < threshold:
+                return False
+        return True
+
+class AchievementEngine:
+    """Applies point and badge rules to progress documents, one event at a time."""
+
+    def __init__(self, config: Optional[Mapping] = None):
+        """Compile the achievement rules.
+
+        Invalid rules are logged and skipped, so a typo in settings.yaml never
+        prevents progress from being recorded.
+
+        Args:
+            config: The `achievements` section of settings.yaml
+        """
+        self.logger = logging.getLogger(__name__)
+        config = config or {}
+        self.points: Dict[str, float] = {
+            str(event): value for event, value in (config.get("points") or {}).items()
+            if isinstance(value, (int, float))
+        }
+        self.rules: List[BadgeRule] = []
+        self._index: Dict[str, List[BadgeRule]] = {}
+
+        for name, spec in (config.get("badges") or {}).items():
+            rule, events = self._compile_rule(str(name), spec)
+            if rule is None:
+                continue
+            self.rules.append(rule)
+            for event in events:
+                self._index.setdefault(event, []).append(rule)
+
+        # Per-event candidate lists, built on first use of each event type
+        self._candidates: Dict[str, Tuple[BadgeRule, ...]] = {}
+
+    def _compile_rule(self, name: str, spec: Any) -> Tuple[Optional[BadgeRule], Tuple[str, ...]]:
+        """Build a rule and the event types that can trigger it."""
+        when = spec.get("when") if isinstance(spec, dict) else None
+        if not isinstance(when, dict) or not when:
+            self.logger.error(f"Ignoring badge rule {name}: no 'when' conditions")
+            return None, ()
+
+        conditions = []
+        events = set()
+        for metric, threshold in when.items():
+            if metric not in METRICS or not isinstance(threshold, (int, float)):
+                self.logger.error(f"Ignoring badge rule {name}: invalid condition {metric}: {threshold}")
+                return None, ()
+            triggers, read = METRICS[metric]
+            if metric == "points":
+                # Points only change on events that are worth points
+                triggers = None if ACTIVE_DAY in self.points else tuple(self.points)
+            events.update((ANY_EVENT,) if triggers is None else triggers)
+            conditions.append((read, threshold))
+        if ANY_EVENT in events:
+            events = {ANY_EVENT}
+        return BadgeRule(name, str(spec.get("description", "")), conditions), tuple(events)
+
+    def rules_for(self, event: str) -> Tuple[BadgeRule, ...]:
+        """Rules that an event of this type can trigger."""
+        candidates = self._candidates.get(event)
+        if candidates is None:
+            candidates = tuple(self._index.get(event, ())) + tuple(self._index.get(ANY_EVENT, ()))
+            self._candidates[event] = candidates
+        return candidates
+
+    def apply(self, progress: Dict, event: str, timestamp: str, award_points: bool = True) -> List[str]:
+        """Update streaks, points and badges for one event, in place.
+
+        Args:
+            progress: Progress document the event was already applied to
+            event: Event type
+            timestamp: ISO timestamp of the event (empty if unknown)
+            award_points: False for events that repeat an earlier one (such as
+                completing a lesson twice), which still count as activity
+
+        Returns:
+            Names of badges awarded by this event
+        """
+        achievements = progress.setdefault("achievements", {})
+        streaks = achievements.setdefault("streaks", {})
+        points = self.points.get(event, 0) if award_points else 0
+        if self._record_activity(streaks, timestamp):
+            points += self.points.get(ACTIVE_DAY, 0)
+        if points:
+            achievements["points"] = achievements.get("points", 0) + points
+
+        awarded = []
+        badges = achievements.setdefault("badges", [])
+        for rule in self.rules_for(event):
+            if rule.name not in badges and rule.satisfied(progress):
+                badges.append(rule.name)
+                awarded.append(rule.name)
+        return awarded
+
+    @staticmethod
+    def _record_activity(streaks: Dict, timestamp: str) -> bool:
+        """Advance the daily streak; returns True on the first event of a new day."""
+        try:
+            day = date.fromisoformat(timestamp[:10])
+        except (TypeError, ValueError):
+            return False
+        last = streaks.get("last_activity_date") or ""
+        try:
+            last_day = date.fromisoformat(last[:10]) if last else None
+        except ValueError:
+            last_day = None
+        if last_day is not None and day <= last_day:
+            return False  # same day, or an event older than the last activity
+
+        current = streaks.get("current_streak", 0) if last_day == day - timedelta(days=1) else 0
+        streaks["current_streak"] = current + 1
+        streaks["longest_streak"] = max(streaks.get("longest_streak", 0), current + 1)
+        streaks["last_activity_date"] = day.isoformat()
+        return True
+
+# Compiled engines keyed by the identity of a parsed settings document; the
+# document is kept with its engine so the id cannot be reused while cached
+_engines: "OrderedDict[int, Tuple[Mapping, AchievementEngine]]" = OrderedDict()
+_engines_lock = threading.Lock()
+_ENGINE_CACHE_LIMIT = 64
+
+def engine_for(settings: Mapping) -> AchievementEngine:
+    """Return the engine for a settings document, compiling it once.
+
+    Managers sharing a parsed settings.yaml (see load_shared_settings) share
+    one engine as well.
+    """
+    key = id(settings)
+    with _engines_lock:
+        entry = _engines.get(key)
+        if entry is not None and entry[0] is settings:
+            _engines.move_to_end(key)
+            return entry[1]
+
+    section = settings.get("achievements") if isinstance(settings, Mapping) else None
+    engine = AchievementEngine(section if isinstance(section, Mapping) else None)
+    with _engines_lock:
+        _engines[key] = (settings, engine)
+        _engines.move_to_end(key)
+        while len(_engines) > _ENGINE_CACHE_LIMIT:
+            _engines.popitem(last=False)
+    return engine
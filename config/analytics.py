@@ -0,0 +1,370 @@
+"""
+Vectorised cohort analytics over student progress.json files.
+
+Progress files are parsed in parallel worker processes, each returning a
+compact columnar chunk. The chunks are concatenated into NumPy arrays (one
+float column per statistic, a datetime column for the last activity and a
+students x lessons boolean matrix), so distributions, at-risk lists and lesson
+funnels are computed with array operations instead of per-student loops.
+Reports are exported as plain JSON and CSV.
+
+Usage:
+    from config.analytics import load_cohort
+    cohort = load_cohort("students", workers=8)
+    print(cohort.distribution("success_rate"))
+    cohort.write_csv("cohort.csv")
+"""
+
+import csv
+import json
+import logging
+import math
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Numeric columns: name -> (section, key); "streaks" is achievements.streaks
+COLUMNS = {
+    "exercises_completed": ("practice_stats", "exercises_completed"),
+    "exercises_attempted": ("practice_stats", "exercises_attempted"),
+    "success_rate": ("practice_stats", "success_rate"),
+    "total_coding_time": ("practice_stats", "total_coding_time"),
+    "points": ("achievements", "points"),
+    "current_streak": ("streaks", "current_streak"),
+    "longest_streak": ("streaks", "longest_streak"),
+    "total_sessions": ("session_data", "total_sessions"),
+    "average_session_length": ("session_data", "average_session_length"),
+}
+COLUMN_NAMES = list(COLUMNS) + ["completed_lessons"]
+
+DEFAULT_PERCENTILES = (10, 25, 50, 75, 90, 99)
+
+logger = logging.getLogger(__name__)
+
+def _number(value) -> float:
+    if type(value) in (int, float):
+        return value
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+def _section(parent: Dict, key: str) -> Dict:
+    value = parent.get(key)
+    return value if isinstance(value, dict) else {}
+
+def _read_progress_chunk(job: Tuple[str, List[str]]) -> Dict:
+    """Parse the progress files of a chunk of students into columnar form.
+
+    Runs in worker processes, so it only returns plain lists and arrays.
+    """
+    root_dir, students = job
+    found = []
+    rows = []
+    last_active = []
+    started_rows, started_lessons = [], []
+    completed_rows, completed_lessons = [], []
+    errors = []
+
+    for student in students:
+        try:
+            with open(os.path.join(root_dir, student, "progress.json"), 'rb') as f:
+                progress = json.loads(f.read())
+            if not isinstance(progress, dict):
+                raise ValueError("progress is not an object")
+        except FileNotFoundError:
+            continue
+        except (OSError, ValueError) as e:
+            errors.append((student, str(e)))
+            continue
+
+        row = len(found)
+        found.append(student)
+        achievements = _section(progress, "achievements")
+        sections = {
+            "practice_stats": _section(progress, "practice_stats"),
+            "achievements": achievements,
+            "streaks": _section(achievements, "streaks"),
+            "session_data": _section(progress, "session_data")
+        }
+        user_progress = _section(progress, "user_progress")
+        completed = set(user_progress.get("completed_lessons") or ())
+        started = set(completed)
+        current_lesson = _section(user_progress, "current_lesson")
+        if current_lesson.get("id"):
+            started.add(current_lesson["id"])
+        # Activity comes from recorded events only: metadata.last_updated is
+        # also set when a student is provisioned, before they ever start.
+        # ISO timestamps compare correctly as strings.
+        newest = ""
+        for timestamp in (current_lesson.get("last_accessed"),
+                          sections["streaks"].get("last_activity_date")):
+            if isinstance(timestamp, str) and timestamp > newest:
+                newest = timestamp
+        for entry in user_progress.get("lesson_history") or ():
+            if not isinstance(entry, dict):
+                continue
+            timestamp = entry.get("timestamp")
+            if isinstance(timestamp, str) and timestamp > newest:
+                newest = timestamp
+            if entry.get("event") == "lesson_started" and entry.get("value"):
+                started.add(entry["value"])
+
+        rows.append([_number(sections[section].get(key)) for section, key in COLUMNS.values()] +
+                    [len(completed)])
+        last_active.append(newest)
+        started_rows.extend([row] * len(started))
+        started_lessons.extend(str(lesson) for lesson in started)
+        completed_rows.extend([row] * len(completed))
+        completed_lessons.extend(str(lesson) for lesson in completed)
+
+    return {
+        "students": found,
+        "values": np.array(rows, dtype=np.float64).reshape(len(rows), len(COLUMN_NAMES)),
+        "last_active": last_active,
+        "started": (started_rows, started_lessons),
+        "completed": (completed_rows, completed_lessons),
+        "errors": errors
+    }
+
+def _to_datetimes(values: List[str]) -> np.ndarray:
+    """Convert ISO timestamps to datetime64[s]; unparseable values become NaT."""
+    try:
+        return np.array(values, dtype="datetime64[us]").astype("datetime64[s]")
+    except ValueError:
+        pass
+    converted = []
+    for value in values:
+        try:
+            converted.append(np.datetime64(datetime.fromisoformat(value).replace(tzinfo=None), "s"))
+        except (TypeError, ValueError):
+            converted.append(np.datetime64("NaT", "s"))
+    return np.array(converted, dtype="datetime64[s]")
+
+def _lesson_key(lesson: str):
+    """Natural sort key, so lesson_2 comes before lesson_10."""
+    return [int(part) if part.isdigit() else part for part in re.split(r"(\d+)", lesson)]
+
+class CohortData:
+    """Columnar progress data for a cohort of students."""
+
+    def __init__(self,
+                 students: np.ndarray,
+                 columns: Dict[str, np.ndarray],
+                 last_active: np.ndarray,
+                 lessons: List[str],
+                 started: np.ndarray,
+                 completed: np.ndarray,
+                 errors: Optional[List[Tuple[str, str]]] = None):
+        """Wrap the arrays of a loaded cohort.
+
+        Args:
+            students: Student ids, one per row
+            columns: Column name -> float64 array (NaN where missing)
+            last_active: datetime64[s] of each student's latest recorded activity
+                (NaT if they were never active)
+            lessons: Lesson ids in curriculum order, one per matrix column
+            started: Boolean students x lessons matrix of started lessons
+            completed: Boolean students x lessons matrix of completed lessons
+            errors: (student, message) pairs for unreadable progress files
+        """
+        self.students = students
+        self.columns = columns
+        self.last_active = last_active
+        self.lessons = lessons
+        self.started = started
+        self.completed = completed
+        self.errors = errors or []
+
+    def __len__(self) -> int:
+        return len(self.students)
+
+    def distribution(self, column: str,
+                     percentiles: Sequence[float] = DEFAULT_PERCENTILES) -> Dict:
+        """Summary statistics of one column, ignoring missing values.
+
+        Returns:
+            Dictionary with count, mean, std, min, max and p<N> keys
+        """
+        values = self.columns[column]
+        values = values[~np.isnan(values)]
+        summary = {"count": int(values.size)}
+        if not values.size:
+            return summary
+        summary.update(mean=float(values.mean()), std=float(values.std()),
+                       min=float(values.min()), max=float(values.max()))
+        for pct, value in zip(percentiles, np.percentile(values, percentiles)):
+            summary[f"p{pct:g}"] = float(value)
+        return summary
+
+    def histogram(self, column: str, bins: int = 10) -> Dict:
+        """Histogram of one column.
+
+        Returns:
+            Dictionary with bin edges and counts
+        """
+        values = self.columns[column]
+        counts, edges = np.histogram(values[~np.isnan(values)], bins=bins)
+        return {"edges": edges.tolist(), "counts": counts.tolist()}
+
+    def at_risk(self,
+                min_success_rate: float = 0.5,
+                min_attempts: int = 5,
+                inactive_days: int = 14,
+                now: Optional[datetime] = None) -> List[Dict]:
+        """Students who struggle, have gone quiet or broke an established streak.
+
+        Args:
+            min_success_rate: Success rate below which a student is struggling
+            min_attempts: Attempts needed before the success rate counts
+            inactive_days: Days without activity before a student is inactive
+            now: Reference time (defaults to the current local time)
+
+        Returns:
+            At-risk students, most reasons first, then lowest success rate, each
+            with student, reasons, success_rate and days_inactive keys. Students
+            with no recorded activity are "never_active" (days_inactive None)
+        """
+        now = np.datetime64(now or datetime.now(), "s")
+        success = self.columns["success_rate"]
+        attempts = np.nan_to_num(self.columns["exercises_attempted"])
+        idle_days = (now - self.last_active) / np.timedelta64(1, "D")
+
+        reasons = {
+            "low_success_rate": (attempts >= min_attempts) & (success < min_success_rate),
+            "never_active": np.isnat(self.last_active),
+            "inactive": idle_days > inactive_days,
+            "broken_streak": (np.nan_to_num(self.columns["longest_streak"]) >= 3) &
+                             (np.nan_to_num(self.columns["current_streak"]) == 0)
+        }
+        flags = np.column_stack(list(reasons.values()))
+        score = flags.sum(axis=1)
+        rows = np.flatnonzero(score)
+        # Most reasons first, ties broken by the lowest success rate
+        rows = rows[np.lexsort((np.nan_to_num(success[rows], nan=1.0), -score[rows]))]
+
+        # Convert the selected rows in bulk rather than element by element
+        names = np.array(list(reasons), dtype=object)
+        rates = np.where(np.isnan(success[rows]), None, success[rows].astype(object))
+        idle = np.where(np.isnan(idle_days[rows]), None, np.round(idle_days[rows], 1).astype(object))
+        return [
+            {"student": student, "reasons": names[row_flags].tolist(),
+             "success_rate": rate, "days_inactive": days}
+            for student, row_flags, rate, days in zip(
+                self.students[rows].tolist(), flags[rows], rates.tolist(), idle.tolist())
+        ]
+
+    def lesson_funnel(self) -> List[Dict]:
+        """Per-lesson counts of students who started and completed each lesson.
+
+        Returns:
+            One entry per lesson in curriculum order with lesson, started,
+            completed, completion_rate and reached (share of the cohort) keys
+        """
+        started = self.started.sum(axis=0)
+        completed = self.completed.sum(axis=0)
+        cohort = max(len(self), 1)
+        rate = np.divide(completed, started, out=np.zeros(len(self.lessons)), where=started > 0)
+        return [
+            {
+                "lesson": lesson,
+                "started": int(started[i]),
+                "completed": int(completed[i]),
+                "completion_rate": round(float(rate[i]), 4),
+                "reached": round(float(started[i]) / cohort, 4)
+            }
+            for i, lesson in enumerate(self.lessons)
+        ]
+
+    def report(self, **at_risk_options) -> Dict:
+        """Complete cohort report (distributions, funnel and at-risk list)."""
+        return {
+            "students": len(self),
+            "unreadable": len(self.errors),
+            "distributions": {name: self.distribution(name) for name in COLUMN_NAMES},
+            "lesson_funnel": self.lesson_funnel(),
+            "at_risk": self.at_risk(**at_risk_options)
+        }
+
+    def write_csv(self, path: str) -> None:
+        """Write one row per student with every column and the last activity."""
+        last_active = np.datetime_as_string(self.last_active).tolist()
+        columns = [self.columns[name].tolist() for name in COLUMN_NAMES]
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(["student"] + COLUMN_NAMES + ["last_active"])
+            writer.writerows(zip(self.students.tolist(), *columns, last_active))
+
+def load_cohort(root_dir: str = "students",
+                workers: Optional[int] = 1,
+                chunksize: Optional[int] = None) -> CohortData:
+    """Load every student's progress.json under root_dir into columnar arrays.
+
+    Args:
+        root_dir: Directory with one sub-directory per student
+        workers: Worker processes parsing files (None for the CPU count)
+        chunksize: Students per task (defaults to ~4 tasks per worker)
+
+    Returns:
+        CohortData for the students whose progress file could be read
+    """
+    root = Path(root_dir)
+    students = sorted(entry.name for entry in os.scandir(root) if entry.is_dir()) \
+        if root.is_dir() else []
+    workers = max(1, min(workers or os.cpu_count() or 1, len(students) or 1))
+    chunksize = chunksize or max(1, math.ceil(len(students) / (workers * 4)))
+    jobs = [(str(root), students[i:i + chunksize]) for i in range(0, len(students), chunksize)]
+
+    if workers == 1:
+        chunks = [_read_progress_chunk(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            chunks = list(executor.map(_read_progress_chunk, jobs))
+
+    # Concatenate chunks, shifting each chunk's row numbers by its offset
+    offsets = np.cumsum([0] + [len(c["students"]) for c in chunks])
+    n_students = int(offsets[-1])
+    found = np.array([s for c in chunks for s in c["students"]], dtype=str)
+    values = np.concatenate([c["values"] for c in chunks]) if chunks else \
+        np.zeros((0, len(COLUMN_NAMES)))
+    last_active = _to_datetimes([t for c in chunks for t in c["last_active"]])
+
+    def pairs(kind: str) -> Tuple[np.ndarray, np.ndarray]:
+        rows = [np.asarray(c[kind][0], dtype=np.int64) + offset for c, offset in zip(chunks, offsets)]
+        names = [name for c in chunks for name in c[kind][1]]
+        return (np.concatenate(rows) if rows else np.zeros(0, dtype=np.int64),
+                np.array(names, dtype=str))
+
+    started_rows, started_names = pairs("started")
+    completed_rows, completed_names = pairs("completed")
+    # Completed lessons are always among the started ones, so one vocabulary
+    # in curriculum order covers both; codes are found via its lexical order
+    lessons = sorted(np.unique(started_names).tolist(), key=_lesson_key)
+    lesson_array = np.array(lessons, dtype=str)
+    order = np.argsort(lesson_array)
+
+    def matrix(rows: np.ndarray, names: np.ndarray) -> np.ndarray:
+        result = np.zeros((n_students, len(lessons)), dtype=bool)
+        if rows.size:
+            codes = order[np.searchsorted(lesson_array[order], names)]
+            result[rows, codes] = True
+        return result
+
+    errors = [error for c in chunks for error in c["errors"]]
+    if errors:
+        logger.warning(f"Skipped {len(errors)} unreadable progress files under {root_dir}")
+
+    return CohortData(
+        students=found,
+        columns={name: values[:, i] for i, name in enumerate(COLUMN_NAMES)},
+        last_active=last_active,
+        lessons=lessons,
+        started=matrix(started_rows, started_names),
+        completed=matrix(completed_rows, completed_names),
+        errors=errors
+    )
@@ -13,7 +13,7 @@ Usage:
     config = ConfigManager()
     
     # Get student preferences
-    theme = config.get_student_preference('learning.theme')
+    theme = config.get_student_preference('theme')
     
     # Update progress
     config.update_progress('lesson_completed', 'lesson_1')
@@ -23,21 +23,166 @@ Usage:
 """
 
 import os
+import atexit
 import json
-import yaml
+import logging
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from contextlib import contextmanager
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, Optional, Union
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Mapping, Optional, Tuple, Union
+
+from .fileio import Signature, atomic_write_text, file_signature
+from .serialization import dump_yaml, load_yaml
+
+# Optional backends (sqlite3, ctypes) are imported only when enabled, and the
+# achievement rules and curriculum graph only when progress needs them
+if TYPE_CHECKING:
+    from .achievements import AchievementEngine
+    from .curriculum import CurriculumGraph, LearningPath
+    from .watcher import ConfigWatcher
+
+# Bundled defaults used when a config directory does not provide its own copy
+DEFAULT_SETTINGS_PATH = Path(__file__).parent / "settings.yaml"
+DEFAULT_PROGRESS_PATH = Path(__file__).parent / "progress.json"
+
+class PathAccessor:
+    """A dotted path split once and reused to walk nested dictionaries."""
+    
+    __slots__ = ("path", "keys")
+    
+    def __init__(self, path: str):
+        self.path = path
+        self.keys = tuple(path.split(".")) if path else ()
+    
+    def get(self, data: Any, default: Any = None) -> Any:
+        """Return the value at this path in data, or default if it does not exist."""
+        current = data
+        for key in self.keys:
+            if not isinstance(current, dict) or key not in current:
+                return default
+            current = current[key]
+        return current
+
+@lru_cache(maxsize=4096)
+def compile_path(path: str) -> PathAccessor:
+    """Return the cached accessor for a dotted path."""
+    return PathAccessor(path)
+
+def flatten_settings(settings: Dict, prefix: str = "") -> Dict[str, Any]:
+    """Index every node of a nested dictionary by its dotted path.
+    
+    The empty path maps to the whole dictionary, so any lookup that walking
+    the tree would answer is a single dict hit.
+    """
+    index = {prefix: settings} if not prefix else {}
+    for key, value in settings.items():
+        path = f"{prefix}.{key}" if prefix else str(key)
+        index[path] = value
+        if isinstance(value, dict):
+            index.update(flatten_settings(value, path))
+    return index
+
+# Parsed settings shared by every manager reading the same unchanged file,
+# keyed by resolved path and holding (signature, settings, index)
+_SHARED_SETTINGS_LIMIT = 64
+_shared_settings: "OrderedDict[str, Tuple[Signature, Dict, Mapping[str, Any]]]" = OrderedDict()
+_shared_settings_lock = threading.Lock()
+
+def load_shared_settings(path: Path) -> Tuple[Dict, Mapping[str, Any]]:
+    """Return the parsed settings and their dotted-path index for a file.
+    
+    Managers reading the same settings file share one parsed copy (treat it as
+    read-only) until the file's mtime, size or inode changes.
+    
+    Args:
+        path: settings.yaml to load
+        
+    Returns:
+        Tuple of (settings, read-only index by dotted path)
+    """
+    key = str(Path(path).resolve())
+    signature = file_signature(path)
+    with _shared_settings_lock:
+        cached = _shared_settings.get(key)
+        if cached and cached[0] == signature:
+            _shared_settings.move_to_end(key)
+            return cached[1], cached[2]
+    
+    try:
+        settings = load_yaml(path) or {}
+    except FileNotFoundError:
+        settings = {}
+    except Exception as e:
+        logging.getLogger(__name__).error(f"Error loading {path}: {str(e)}")
+        return {}, MappingProxyType({"": {}})
+    index = MappingProxyType(flatten_settings(settings))
+    
+    with _shared_settings_lock:
+        _shared_settings[key] = (signature, settings, index)
+        _shared_settings.move_to_end(key)
+        while len(_shared_settings) > _SHARED_SETTINGS_LIMIT:
+            _shared_settings.popitem(last=False)
+    return settings, index
+
+def copy_document(data: Any) -> Any:
+    """Copy the dicts and lists of a parsed document so it can be changed.
+    
+    Items inside lists (such as lesson_history entries) are never modified
+    once appended, so they are shared with the original.
+    """
+    if isinstance(data, dict):
+        return {key: copy_document(value) for key, value in data.items()}
+    if isinstance(data, list):
+        return list(data)
+    return data
+
+# Managers whose deferred flush has not run yet. Held weakly so that pending
+# writes are flushed at exit without keeping unused managers alive.
+_pending_flushes: "weakref.WeakSet[ConfigManager]" = weakref.WeakSet()
+
+def _flush_pending() -> None:
+    """Flush every manager whose auto-flush timer had not fired yet."""
+    for manager in list(_pending_flushes):
+        try:
+            manager.flush()
+        except Exception as e:
+            manager.logger.error(f"Error flushing {manager.config_dir} at exit: {str(e)}")
+
+atexit.register(_flush_pending)
 
 class ConfigManager:
     """Manages configuration files for the learning environment."""
     
-    def __init__(self, config_dir: str = "."):
+    def __init__(self,
+                 config_dir: str = ".",
+                 progress_backend: str = "json",
+                 progress_db: Optional[str] = None,
+                 student_id: Optional[str] = None,
+                 auto_flush_interval: Optional[float] = None,
+                 curriculum_path: Optional[str] = None):
         """Initialize the configuration manager.
         
         Args:
             config_dir: Directory containing configuration files (defaults to current directory)
+            progress_backend: 'json' to keep progress in progress.json, 'sqlite'
+                to append events to a SQLite database, or 'eventlog' to append
+                events to progress.log and compact them into progress.json
+            progress_db: SQLite database path (defaults to progress.db in config_dir)
+            student_id: Key for this student's rows in a shared database
+                (defaults to the config directory name)
+            auto_flush_interval: If set, writes are coalesced and flushed by a
+                background timer at most once per this many seconds (and at
+                interpreter exit)
+            curriculum_path: Lesson plan defining topics and prerequisites for
+                learning_path recommendations (defaults to docs/LESSON_PLAN.md)
         """
+        self.logger = logging.getLogger(__name__)
         self.config_dir = Path(config_dir)
         self.student_config_path = self.config_dir / "student_config.yaml"
         self.progress_path = self.config_dir / "progress.json"
@@ -46,7 +191,535 @@ class ConfigManager:
         # Create config directory if it doesn't exist
         self.config_dir.mkdir(exist_ok=True)
         
+        if progress_backend not in ("json", "sqlite", "eventlog"):
+            raise ValueError(f"Unknown progress backend: {progress_backend}")
+        self.student_id = student_id or self.config_dir.resolve().name
+        self.progress_store = None
+        self.event_log = None
+        if progress_backend == "sqlite":
+            from .progress_store import SQLiteProgressStore
+            self.progress_store = SQLiteProgressStore(
+                progress_db or str(self.config_dir / "progress.db")
+            )
+        elif progress_backend == "eventlog":
+            from .event_log import ProgressEventLog
+            self.event_log = ProgressEventLog(
+                self.config_dir / "progress.log",
+                self.progress_path,
+                apply_event=self._apply_event,
+                default_factory=self._default_progress,
+                on_replayed=self._refresh_recommendations
+            )
+        
+        # Pending writes, coalesced by batch() and auto_flush_interval
+        self.auto_flush_interval = auto_flush_interval
+        self._batch_depth = 0
+        self._dirty = set()
+        self._last_flush = time.monotonic()
+        self._flush_timer: Optional[threading.Timer] = None
+        # Serialises writers, reloads and the deferred flush timer
+        self._lock = threading.RLock()
+        
+        # Recommendation frontier, built from progress on first use
+        self.curriculum_path = Path(curriculum_path) if curriculum_path else None
+        self._learning_path: Optional["LearningPath"] = None
+        self._curriculum_missing = False
+        self._achievements: Optional["AchievementEngine"] = None
+        
+        # Hot-reload state, see watch()
+        self._watcher: Optional["ConfigWatcher"] = None
+        self._subscribers: List[Callable[[str, "ConfigManager"], None]] = []
+        self._written: Dict[str, Signature] = {}
+        
         # Load configurations
         self.reload_configs()
 
-    # ... rest of the code remains the same ... 
\ No newline at end of file
+    def reload_configs(self) -> None:
+        """Reload all configuration files from disk."""
+        # Settings come first: replaying logged progress needs the achievement rules
+        for name in ("settings", "student_config", "progress"):
+            self.reload_file(name)
+
+    def reload_file(self, name: str) -> None:
+        """Re-parse a single configuration file.
+        
+        Each file's parsed state is replaced by a single attribute assignment,
+        so readers never need a lock. Writers copy the document, change the
+        copy and publish it the same way while holding the manager lock, which
+        reloads take too, so a reload cannot land between an update's read
+        and its save.
+        
+        Args:
+            name: 'student_config', 'progress' or 'settings'
+        """
+        with self._lock:
+            if name == "student_config":
+                self.student_config = self._load_yaml(self.student_config_path)
+            elif name == "progress":
+                self.progress = self._load_progress()
+                self._learning_path = None
+            elif name == "settings":
+                settings, index = load_shared_settings(self._active_settings_path())
+                self._settings_index = index
+                self._achievements = None
+                self.settings = settings
+            else:
+                raise ValueError(f"Unknown configuration file: {name}")
+
+    @property
+    def achievements(self) -> "AchievementEngine":
+        """Achievement rules compiled from the loaded settings."""
+        engine = self._achievements
+        if engine is None:
+            from .achievements import engine_for
+            engine = self._achievements = engine_for(self.settings)
+        return engine
+
+    def watch(self, interval: float = 1.0, use_inotify: bool = True) -> None:
+        """Reload configuration files in the background as they change on disk.
+        
+        Only the file whose mtime, size or inode changed is re-parsed, and every
+        subscriber is then called with its name.
+        
+        Args:
+            interval: Polling interval in seconds when inotify is unavailable
+            use_inotify: Use inotify where available instead of stat polling
+        """
+        if self._watcher:
+            return
+        files = {
+            "student_config": self.student_config_path,
+            "settings": self._active_settings_path()
+        }
+        # Only progress.json is rewritten in place; the other backends append
+        if not (self.progress_store or self.event_log):
+            files["progress"] = self.progress_path
+        from .watcher import ConfigWatcher
+        self._watcher = ConfigWatcher(files, self._on_file_changed, interval, use_inotify)
+        self._watcher.start()
+
+    def stop_watching(self) -> None:
+        """Stop the background watcher started by watch()."""
+        if self._watcher:
+            self._watcher.stop()
+            self._watcher = None
+
+    def subscribe(self, callback: Callable[[str, "ConfigManager"], None]) -> None:
+        """Register a callback(name, manager) invoked after a file is reloaded."""
+        self._subscribers.append(callback)
+
+    def _on_file_changed(self, name: str) -> None:
+        """Reload a changed file unless it has unsaved local changes."""
+        with self._lock:
+            if name in self._dirty:
+                self.logger.debug(f"Ignoring change to {name}: local changes pending")
+                return
+            # A flush that held the lock while the change was detected wrote it
+            path = self._written_paths().get(name)
+            if path and file_signature(path) == self._written.get(name):
+                return
+            self.reload_file(name)
+        for callback in list(self._subscribers):
+            callback(name, self)
+
+    def _written_paths(self) -> Dict[str, Path]:
+        """Files flush() writes, by logical name."""
+        return {"student_config": self.student_config_path, "progress": self.progress_path}
+
+    def _active_settings_path(self) -> Path:
+        """settings.yaml in the config directory, or the bundled default."""
+        return self.settings_path if self.settings_path.exists() else DEFAULT_SETTINGS_PATH
+
+    def initialize_student(self,
+                           name: str,
+                           skill_level: str,
+                           profile: Optional[Dict] = None) -> None:
+        """Create the student configuration and a fresh progress record.
+        
+        Args:
+            name: Student display name
+            skill_level: Assessed skill level
+            profile: Optional assessment data (theme, interests, goals,
+                preferences), as a dictionary or a setup.profile.UserProfile
+        """
+        # Profiles are converted by duck typing, so config does not import setup
+        if hasattr(profile, "to_dict"):
+            profile = profile.to_dict()
+        profile = profile or {}
+        with self._lock:
+            self.student_config = {
+                "name": name,
+                "skill_level": skill_level,
+                "theme": profile.get("theme"),
+                "interests": list(profile.get("interests", [])),
+                "goals": profile.get("goals", ""),
+                "preferences": dict(profile.get("preferences", {})),
+                "created_at": datetime.now().isoformat()
+            }
+            self.progress = self._default_progress()
+            self.progress["metadata"]["last_updated"] = datetime.now().isoformat()
+            
+            self._mark_dirty("student_config")
+            self._save_progress()
+
+    def get_student_preference(self, path: str, default: Any = None) -> Any:
+        """Get a student preference by dotted path.
+        
+        Args:
+            path: Dotted path such as 'preferences.pace' (empty for everything)
+            default: Value returned when the path does not exist
+            
+        Returns:
+            Preference value or default
+        """
+        return compile_path(path).get(self.student_config, default)
+
+    def set_student_preference(self, path: str, value: Any) -> None:
+        """Set a student preference by dotted path and persist it.
+        
+        Args:
+            path: Dotted path such as 'preferences.pace'
+            value: New value
+        """
+        keys = path.split(".")
+        with self._lock:
+            student_config = copy_document(self.student_config)
+            current = student_config
+            for key in keys[:-1]:
+                if not isinstance(current.get(key), dict):
+                    current[key] = {}
+                current = current[key]
+            current[keys[-1]] = value
+            self.student_config = student_config
+            self._mark_dirty("student_config")
+
+    def get_setting(self, path: str, default: Any = None) -> Any:
+        """Get a system setting by dotted path.
+        
+        Args:
+            path: Dotted path such as 'ai_assistants.learning_assistant.enabled'
+            default: Value returned when the path does not exist
+            
+        Returns:
+            Setting value or default
+        """
+        return self._settings_index.get(path, default)
+
+    def update_progress(self, event: str, value: Any = None) -> List[str]:
+        """Record a progress event and persist it.
+        
+        Streaks, points and badges are updated incrementally by the achievement
+        rules from settings.yaml. With the SQLite backend the event is appended
+        to the database instead of rewriting progress.json, and lesson_history
+        is not kept in memory. With the event log backend the event is appended
+        to progress.log.
+        
+        Args:
+            event: Event type, e.g. 'lesson_started' or 'lesson_completed'
+            value: Event payload (usually a lesson or exercise identifier)
+            
+        Returns:
+            Names of badges awarded by this event
+        """
+        timestamp = datetime.now().isoformat()
+        with self._lock:
+            # Readers keep the previous document until the new one is published
+            progress = copy_document(self.progress)
+            if self.progress_store:
+                awarded = self._apply_event(progress, event, value, timestamp,
+                                            record_history=False)
+                self._advance_learning_path(progress, event, value)
+                # Only the sections this event touched are written back
+                changes = {section: data for section, data in progress.items()
+                           if self.progress.get(section) != data}
+                self.progress_store.record_event(self.student_id, event, value, timestamp,
+                                                 changes=changes)
+                for badge in awarded:
+                    self.progress_store.award(self.student_id, "badge", badge, awarded_at=timestamp)
+                self.progress = progress
+            elif self.event_log:
+                self.event_log.append(event, value, timestamp)
+                awarded = self._apply_event(progress, event, value, timestamp)
+                self._advance_learning_path(progress, event, value)
+                self.progress = progress
+            else:
+                awarded = self._apply_event(progress, event, value, timestamp)
+                self._advance_learning_path(progress, event, value)
+                self.progress = progress
+                self._mark_dirty("progress")
+        if awarded:
+            self.logger.info(f"Awarded badges: {', '.join(awarded)}")
+        return awarded
+
+    def recommended_topics(self, limit: Optional[int] = None) -> List[str]:
+        """Topics whose prerequisites the student has completed, in curriculum order.
+        
+        Args:
+            limit: Maximum number of topics returned (defaults to
+                DEFAULT_RECOMMENDATIONS in config.curriculum)
+            
+        Returns:
+            Topic ids such as 'lesson_1.loops' (empty without a curriculum)
+        """
+        path = self._get_learning_path()
+        if path is None:
+            return []
+        return path.recommended() if limit is None else path.recommended(limit)
+
+    def _load_curriculum(self) -> Optional["CurriculumGraph"]:
+        """Return the curriculum graph, or None if the lesson plan is missing."""
+        if self._curriculum_missing:
+            return None
+        from .curriculum import DEFAULT_CURRICULUM_PATH, load_curriculum
+        try:
+            return load_curriculum(self.curriculum_path or DEFAULT_CURRICULUM_PATH)
+        except OSError as e:
+            self.logger.warning(f"No curriculum for recommendations: {str(e)}")
+            self._curriculum_missing = True
+            return None
+
+    def _learning_path_for(self, progress: Dict) -> Optional["LearningPath"]:
+        """Build the frontier of a progress document in O(topics + edges)."""
+        graph = self._load_curriculum()
+        if graph is None:
+            return None
+        return graph.learning_path(
+            progress.get("learning_path", {}).get("completed_topics", ()),
+            progress.get("user_progress", {}).get("completed_lessons", ())
+        )
+
+    def _get_learning_path(self) -> Optional["LearningPath"]:
+        """Build the frontier from the loaded progress once per load."""
+        if self._learning_path is None:
+            self._learning_path = self._learning_path_for(self.progress)
+        return self._learning_path
+
+    def _advance_learning_path(self, progress: Dict, event: str, value: Any) -> None:
+        """Update next_recommended in progress for a completed topic or lesson."""
+        if event not in ("topic_completed", "lesson_completed"):
+            return
+        path = self._get_learning_path()
+        if path is None:
+            return
+        if event == "lesson_completed":
+            path.complete_lesson(value)
+        else:
+            path.complete(value)
+        progress.setdefault("learning_path", {})["next_recommended"] = path.recommended()
+
+    def _refresh_recommendations(self, progress: Dict) -> None:
+        """Recompute next_recommended for a document rebuilt by replaying events.
+        
+        Called by the event log after materialising or compacting, so snapshots
+        carry the same recommendations update_progress maintains incrementally.
+        """
+        path = self._learning_path_for(progress)
+        if path is not None:
+            progress.setdefault("learning_path", {})["next_recommended"] = path.recommended()
+
+    @contextmanager
+    def batch(self):
+        """Coalesce preference and progress writes until the outermost batch exits.
+        
+        Usage:
+            with config.batch():
+                config.update_progress('exercise_completed', 'ex_1')
+                config.update_progress('exercise_completed', 'ex_2')
+        
+        The SQLite and event log backends already append progress events
+        cheaply, so only the student configuration is deferred for them.
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self.flush()
+
+    def flush(self) -> None:
+        """Write pending changes to disk, one atomic write per file."""
+        with self._lock:
+            if self._flush_timer:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            _pending_flushes.discard(self)
+            if "student_config" in self._dirty:
+                self._save_yaml(self.student_config_path, self.student_config)
+            if "progress" in self._dirty:
+                self._save_json(self.progress_path, self.progress)
+            if self._watcher:
+                paths = self._written_paths()
+                for name in self._dirty:
+                    self._watcher.acknowledge(name)
+                    self._written[name] = file_signature(paths[name])
+            self._dirty.clear()
+            self._last_flush = time.monotonic()
+
+    def _mark_dirty(self, name: str) -> None:
+        """Record a pending write and flush unless it is being coalesced.
+        
+        With auto_flush_interval, a write made sooner than the interval after
+        the last flush starts a timer that flushes once the interval is up.
+        """
+        with self._lock:
+            self._dirty.add(name)
+            if self._batch_depth:
+                return
+            if self.auto_flush_interval:
+                delay = self.auto_flush_interval - (time.monotonic() - self._last_flush)
+                if delay > 0:
+                    self._schedule_flush(delay)
+                    return
+            self.flush()
+
+    def _schedule_flush(self, delay: float) -> None:
+        """Start the deferred flush timer unless one is already pending."""
+        if self._flush_timer:
+            return
+        self._flush_timer = threading.Timer(delay, self._flush_from_timer)
+        self._flush_timer.daemon = True
+        _pending_flushes.add(self)
+        self._flush_timer.start()
+
+    def _flush_from_timer(self) -> None:
+        """Run the deferred flush; a batch in progress flushes when it exits."""
+        try:
+            with self._lock:
+                if self._batch_depth:
+                    self._flush_timer = None
+                    return
+                self.flush()
+        except Exception as e:
+            self.logger.error(f"Error flushing {self.config_dir}: {str(e)}")
+
+    def _apply_event(self,
+                     progress: Dict,
+                     event: str,
+                     value: Any,
+                     timestamp: str,
+                     record_history: bool = True) -> List[str]:
+        """Apply an event with this manager's achievement rules."""
+        return self._apply_progress_event(progress, event, value, timestamp,
+                                          record_history, self.achievements)
+
+    @staticmethod
+    def _apply_progress_event(progress: Dict,
+                              event: str,
+                              value: Any,
+                              timestamp: str,
+                              record_history: bool = True,
+                              achievements: Optional["AchievementEngine"] = None) -> List[str]:
+        """Apply a single progress event to a progress document in place.
+        
+        Returns:
+            Names of badges awarded by the event (none without an engine)
+        """
+        user_progress = progress.setdefault("user_progress", {})
+        stats = progress.setdefault("practice_stats", {})
+        repeated = False
+        
+        if event == "lesson_started":
+            user_progress["current_lesson"] = {
+                **user_progress.get("current_lesson", {}),
+                "id": value,
+                "status": "in_progress",
+                "start_date": timestamp,
+                "last_accessed": timestamp,
+                "completion_percentage": 0
+            }
+        elif event == "lesson_completed":
+            completed = user_progress.setdefault("completed_lessons", [])
+            repeated = value in completed
+            if not repeated:
+                completed.append(value)
+            current = user_progress.get("current_lesson", {})
+            if current.get("id") == value:
+                current.update(status="completed", completion_percentage=100,
+                               last_accessed=timestamp)
+        elif event == "topic_completed":
+            topics = progress.setdefault("learning_path", {}).setdefault("completed_topics", [])
+            if value not in topics:
+                topics.append(value)
+        elif event == "exercise_attempted":
+            stats["exercises_attempted"] = stats.get("exercises_attempted", 0) + 1
+        elif event == "exercise_completed":
+            stats["exercises_attempted"] = stats.get("exercises_attempted", 0) + 1
+            stats["exercises_completed"] = stats.get("exercises_completed", 0) + 1
+        
+        if event in ("exercise_attempted", "exercise_completed"):
+            attempted = stats["exercises_attempted"]
+            stats["success_rate"] = round(stats.get("exercises_completed", 0) / attempted, 4)
+        
+        if record_history:
+            user_progress.setdefault("lesson_history", []).append(
+                {"event": event, "value": value, "timestamp": timestamp}
+            )
+        progress.setdefault("metadata", {})["last_updated"] = timestamp
+        if achievements is None:
+            return []
+        return achievements.apply(progress, event, timestamp, award_points=not repeated)
+
+    def _load_progress(self) -> Dict:
+        """Load progress from the configured backend.
+        
+        The first time the SQLite backend sees a student, any existing
+        progress.json is migrated into the database.
+        """
+        if self.event_log:
+            return self.event_log.materialise()
+        if not self.progress_store:
+            return self._load_json(self.progress_path) or self._default_progress()
+        
+        progress = self.progress_store.load_progress(self.student_id)
+        if progress is None:
+            progress = self._load_json(self.progress_path) or self._default_progress()
+            migrated = self.progress_store.migrate_from_json(progress, self.student_id)
+            self.logger.info(f"Migrated {migrated} progress events to {self.progress_store.db_path}")
+            progress = self.progress_store.load_progress(self.student_id)
+        return progress
+
+    def _save_progress(self) -> None:
+        """Persist the in-memory progress document to the configured backend.
+        
+        The SQLite and event log backends drop previously recorded events.
+        """
+        if self.progress_store:
+            self.progress_store.reset_progress(self.student_id, self.progress)
+        elif self.event_log:
+            self.event_log.reset(self.progress)
+        else:
+            self._mark_dirty("progress")
+
+    def _default_progress(self) -> Dict:
+        """Return a fresh progress document based on the bundled schema."""
+        return self._load_json(DEFAULT_PROGRESS_PATH)
+
+    def _load_yaml(self, path: Path) -> Dict:
+        """Load a YAML file, returning an empty dict if missing or invalid."""
+        try:
+            return load_yaml(path) or {}
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            self.logger.error(f"Error loading {path}: {str(e)}")
+            return {}
+
+    def _load_json(self, path: Path) -> Dict:
+        """Load a JSON file, returning an empty dict if missing or invalid."""
+        try:
+            if not path.exists():
+                return {}
+            with open(path, 'r') as f:
+                return json.load(f)
+        except Exception as e:
+            self.logger.error(f"Error loading {path}: {str(e)}")
+            return {}
+
+    def _save_yaml(self, path: Path, data: Dict) -> None:
+        """Atomically save data to a YAML file."""
+        atomic_write_text(path, dump_yaml(data))
+
+    def _save_json(self, path: Path, data: Dict) -> None:
+        """Atomically save data to a JSON file."""
+        atomic_write_text(path, json.dumps(data, indent=2))
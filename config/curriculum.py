@@ -0,0 +1,294 @@
+"""
+Curriculum prerequisite graph and incrementally maintained learning paths.
+
+The curriculum is parsed once from docs/LESSON_PLAN.md: every numbered item
+under a "Day"/"Week" section of a lesson becomes a topic. A section's topics
+require every topic of the section before it, and a lesson's first section
+requires the last section of the previous lesson, or of each lesson named on a
+"Prerequisites: Lesson 1, Lesson 3" line under the lesson heading. Sections
+also give the estimated time, shared equally by their topics.
+
+Topics are numbered in document order and the edges are stored as compact CSR
+arrays (an offsets array plus a flat index array) in both directions. A
+LearningPath keeps a per-topic count of unmet prerequisites, so completing a
+topic only touches its direct dependents and the recommended frontier is
+updated without walking the graph again.
+
+Usage:
+    from config.curriculum import load_curriculum
+    graph = load_curriculum("docs/LESSON_PLAN.md")
+    path = graph.learning_path(progress["learning_path"]["completed_topics"])
+    path.complete("lesson_1.loops")
+    print(path.recommended(3))
+"""
+
+import heapq
+import re
+import threading
+from array import array
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .fileio import Signature, file_signature
+
+# Bundled curriculum used when none is configured
+DEFAULT_CURRICULUM_PATH = Path(__file__).parent.parent / "docs" / "LESSON_PLAN.md"
+
+# Number of topics stored in learning_path.next_recommended
+DEFAULT_RECOMMENDATIONS = 3
+
+DAYS_PER_WEEK = 7
+
+_LESSON_RE = re.compile(r"^#{2,3}\s+.*?\bLesson\s+(\d+)\s*:\s*(.+?)\s*$")
+_SECTION_RE = re.compile(r"^###\s+(Day|Week)s?\s+(\d+)(?:\s*-\s*(\d+))?\s*:?\s*(.*?)\s*$", re.IGNORECASE)
+_TOPIC_RE = re.compile(r"^\s*\d+\.\s+(.+?)\s*$")
+_PREREQ_RE = re.compile(r"^[>\s*_]*Prerequisites?[*_]*\s*:[*_]*\s*(.+)$", re.IGNORECASE)
+_LESSON_REF_RE = re.compile(r"\bLesson\s+(\d+)|\blesson_(\d+)", re.IGNORECASE)
+
+def _slug(text: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "_", text.lower()).strip("_") or "topic"
+
+def _csr(lists: Sequence[Sequence[int]]) -> Tuple[array, array]:
+    """Pack adjacency lists into (offsets, indices) arrays."""
+    offsets = array("I", [0])
+    indices = array("I")
+    for items in lists:
+        indices.extend(items)
+        offsets.append(len(indices))
+    return offsets, indices
+
+class CurriculumGraph:
+    """Immutable prerequisite graph of curriculum topics."""
+
+    def __init__(self,
+                 topics: List[Tuple[str, str, str, float]],
+                 prerequisites: List[List[int]]):
+        """Index the topics and their prerequisite edges.
+
+        Args:
+            topics: (topic id, title, lesson id, estimated days) per topic, in
+                curriculum order
+            prerequisites: Indices of each topic's prerequisites
+        """
+        self.ids = [topic[0] for topic in topics]
+        self.titles = [topic[1] for topic in topics]
+        self.estimated_days = array("d", (topic[3] for topic in topics))
+        self.index: Dict[str, int] = {topic_id: i for i, topic_id in enumerate(self.ids)}
+
+        # Lessons own contiguous ranges of topics
+        self.lessons: Dict[str, Tuple[int, int]] = {}
+        for i, (_, _, lesson, _) in enumerate(topics):
+            start, _ = self.lessons.get(lesson, (i, i))
+            self.lessons[lesson] = (start, i + 1)
+
+        dependents: List[List[int]] = [[] for _ in topics]
+        for topic, required in enumerate(prerequisites):
+            for prerequisite in required:
+                dependents[prerequisite].append(topic)
+        self._prereq_ptr, self._prereq_idx = _csr(prerequisites)
+        self._dep_ptr, self._dep_idx = _csr(dependents)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def edge_count(self) -> int:
+        return len(self._dep_idx)
+
+    def prerequisites(self, topic_id: str) -> List[str]:
+        """Direct prerequisites of a topic."""
+        i = self.index[topic_id]
+        return [self.ids[j] for j in self._prereq_idx[self._prereq_ptr[i]:self._prereq_ptr[i + 1]]]
+
+    def dependents(self, topic_id: str) -> List[str]:
+        """Topics that directly require a topic."""
+        i = self.index[topic_id]
+        return [self.ids[j] for j in self._dep_idx[self._dep_ptr[i]:self._dep_ptr[i + 1]]]
+
+    def lesson_topics(self, lesson_id: str) -> List[str]:
+        """Topics of a lesson in curriculum order (empty for unknown lessons)."""
+        start, end = self.lessons.get(lesson_id, (0, 0))
+        return self.ids[start:end]
+
+    def learning_path(self, completed: Iterable[str] = (),
+                      completed_lessons: Iterable[str] = ()) -> "LearningPath":
+        """Start tracking a student's frontier from what they have completed."""
+        return LearningPath(self, completed, completed_lessons)
+
+    @classmethod
+    def from_markdown(cls, text: str) -> "CurriculumGraph":
+        """Parse a lesson plan written in the docs/LESSON_PLAN.md format."""
+        topics: List[Tuple[str, str, str, float]] = []
+        sections: List[Tuple[str, List[int]]] = []  # (lesson id, topic indices)
+        lesson_prereqs: Dict[str, List[str]] = {}
+        lesson_order: List[str] = []
+        seen_ids = set()
+
+        lesson = None
+        section_days = 0.0
+        section: Optional[List[int]] = None
+        for line in text.splitlines():
+            if line.startswith("#"):
+                match = _LESSON_RE.match(line)
+                if match:
+                    lesson = f"lesson_{match.group(1)}"
+                    lesson_order.append(lesson)
+                    section = None
+                    continue
+                match = _SECTION_RE.match(line)
+                if match and lesson:
+                    first = int(match.group(2))
+                    span = int(match.group(3) or first) - first + 1
+                    section_days = span * (DAYS_PER_WEEK if match.group(1).lower() == "week" else 1)
+                    section = []
+                    sections.append((lesson, section))
+                    continue
+                # Any other heading closes the section; a level-2 one closes the lesson
+                section = None
+                if line.startswith("## "):
+                    lesson = None
+                continue
+
+            if lesson is None:
+                continue
+            if section is None:
+                match = _PREREQ_RE.match(line)
+                if match:
+                    lesson_prereqs[lesson] = [
+                        f"lesson_{a or b}" for a, b in _LESSON_REF_RE.findall(match.group(1))
+                    ]
+                continue
+            match = _TOPIC_RE.match(line)
+            if match and not line.startswith((" ", "\t")):
+                title = match.group(1).strip("*_ ")
+                topic_id = f"{lesson}.{_slug(title)}"
+                suffix = 2
+                while topic_id in seen_ids:
+                    topic_id = f"{lesson}.{_slug(title)}_{suffix}"
+                    suffix += 1
+                seen_ids.add(topic_id)
+                section.append(len(topics))
+                topics.append((topic_id, title, lesson, section_days))
+
+        # Share each section's time between its topics
+        for _, members in sections:
+            for i in members:
+                topic_id, title, lesson_id, days = topics[i]
+                topics[i] = (topic_id, title, lesson_id, days / len(members))
+
+        sections = [(lesson_id, members) for lesson_id, members in sections if members]
+        last_section: Dict[str, List[int]] = {}
+        prerequisites: List[List[int]] = [[] for _ in topics]
+        previous_lesson = None
+        for position, (lesson_id, members) in enumerate(sections):
+            if position and sections[position - 1][0] == lesson_id:
+                required = sections[position - 1][1]
+            else:
+                names = lesson_prereqs.get(lesson_id)
+                if names is None:
+                    names = [previous_lesson] if previous_lesson else []
+                required = [i for name in names for i in last_section.get(name, ())]
+                previous_lesson = lesson_id
+            for i in members:
+                prerequisites[i] = list(required)
+            last_section[lesson_id] = members
+        return cls(topics, prerequisites)
+
+class LearningPath:
+    """A student's completed topics and the frontier of topics ready to study."""
+
+    def __init__(self, graph: CurriculumGraph, completed: Iterable[str] = (),
+                 completed_lessons: Iterable[str] = ()):
+        """Build the frontier once in O(topics + edges).
+
+        Args:
+            graph: Curriculum graph
+            completed: Completed topic ids (unknown ids are ignored)
+            completed_lessons: Completed lesson ids; all their topics count as done
+        """
+        self.graph = graph
+        self._done = bytearray(len(graph))
+        self._unmet = array("I", (graph._prereq_ptr[i + 1] - graph._prereq_ptr[i]
+                                  for i in range(len(graph))))
+        self.frontier = set()
+
+        done = [graph.index[t] for t in completed if t in graph.index]
+        for lesson in completed_lessons:
+            done.extend(range(*graph.lessons.get(lesson, (0, 0))))
+        for i in done:
+            self._mark(i)
+        self.frontier = {i for i in range(len(graph)) if not self._unmet[i] and not self._done[i]}
+
+    def _mark(self, i: int) -> bool:
+        if self._done[i]:
+            return False
+        self._done[i] = 1
+        graph = self.graph
+        for j in graph._dep_idx[graph._dep_ptr[i]:graph._dep_ptr[i + 1]]:
+            self._unmet[j] -= 1
+        return True
+
+    def complete(self, topic_id: str) -> bool:
+        """Mark a topic done, touching only its direct dependents.
+
+        Returns:
+            True if the topic was known and not yet completed
+        """
+        i = self.graph.index.get(topic_id)
+        if i is None or not self._mark(i):
+            return False
+        self.frontier.discard(i)
+        graph = self.graph
+        for j in graph._dep_idx[graph._dep_ptr[i]:graph._dep_ptr[i + 1]]:
+            if not self._unmet[j] and not self._done[j]:
+                self.frontier.add(j)
+        return True
+
+    def complete_lesson(self, lesson_id: str) -> List[str]:
+        """Mark every topic of a lesson done.
+
+        Returns:
+            Topics that were newly completed
+        """
+        topics = self.graph.lesson_topics(lesson_id)
+        return [topic for topic in topics if self.complete(topic)]
+
+    def is_completed(self, topic_id: str) -> bool:
+        i = self.graph.index.get(topic_id)
+        return i is not None and bool(self._done[i])
+
+    def recommended(self, limit: int = DEFAULT_RECOMMENDATIONS) -> List[str]:
+        """Topics whose prerequisites are all met, earliest in the curriculum first."""
+        return [self.graph.ids[i] for i in heapq.nsmallest(limit, self.frontier)]
+
+    def remaining_days(self) -> float:
+        """Estimated days of study left in the curriculum."""
+        return sum(days for days, done in zip(self.graph.estimated_days, self._done) if not done)
+
+# Parsed curricula keyed by resolved path, holding (signature, graph)
+_CURRICULUM_CACHE_LIMIT = 16
+_curricula: "OrderedDict[str, Tuple[Signature, CurriculumGraph]]" = OrderedDict()
+_curricula_lock = threading.Lock()
+
+def load_curriculum(path: Path = DEFAULT_CURRICULUM_PATH) -> CurriculumGraph:
+    """Return the graph for a lesson plan, parsing it only when the file changed.
+
+    Raises:
+        FileNotFoundError: If the lesson plan does not exist
+    """
+    key = str(Path(path).resolve())
+    signature = file_signature(path)
+    with _curricula_lock:
+        cached = _curricula.get(key)
+        if cached and signature is not None and cached[0] == signature:
+            _curricula.move_to_end(key)
+            return cached[1]
+
+    graph = CurriculumGraph.from_markdown(Path(path).read_text(encoding="utf-8"))
+    with _curricula_lock:
+        _curricula[key] = (signature, graph)
+        _curricula.move_to_end(key)
+        while len(_curricula) > _CURRICULUM_CACHE_LIMIT:
+            _curricula.popitem(last=False)
+    return graph
@@ -0,0 +1,210 @@
+"""
+Append-only event log for progress updates.
+
+Each progress mutation is appended to progress.log as one fsync'd JSON line
+instead of rewriting progress.json. The materialised view is the last snapshot
+(progress.json) with the logged events replayed on top. Once the log grows past
+a size threshold it is rotated and folded into a new snapshot by a background
+thread.
+
+Every event carries a sequence number and the snapshot records the last
+sequence it includes (metadata.compacted_through), so replay after a crash at
+any point of compaction never applies an event twice.
+"""
+
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from .fileio import atomic_write_text
+
+# Compact once the active log reaches 1 MiB
+DEFAULT_COMPACT_THRESHOLD = 1024 * 1024
+
+class ProgressEventLog:
+    """Crash-safe, constant-cost progress writes backed by a JSON-lines log."""
+
+    def __init__(self,
+                 log_path: Path,
+                 snapshot_path: Path,
+                 apply_event: Callable[[Dict, str, Any, str], List[str]],
+                 default_factory: Callable[[], Dict],
+                 compact_threshold: int = DEFAULT_COMPACT_THRESHOLD,
+                 fsync: bool = True,
+                 on_replayed: Optional[Callable[[Dict], None]] = None):
+        """Initialize the event log.
+
+        Args:
+            log_path: Path of the append-only log
+            snapshot_path: Path of the materialised progress.json snapshot
+            apply_event: Function applying (progress, event, value, timestamp) in
+                place and returning the badges it awarded
+            default_factory: Returns a fresh progress document when no snapshot exists
+            compact_threshold: Log size in bytes that triggers background compaction
+            fsync: Flush every appended event to disk
+            on_replayed: Called with a document after logged events were
+                replayed onto it, to update state derived from the whole
+                document (such as recommendations)
+        """
+        self.logger = logging.getLogger(__name__)
+        self.log_path = Path(log_path)
+        self.snapshot_path = Path(snapshot_path)
+        self.compacting_path = self.log_path.with_name(self.log_path.name + ".compacting")
+        self.apply_event = apply_event
+        self.default_factory = default_factory
+        self.compact_threshold = compact_threshold
+        self.fsync = fsync
+        self.on_replayed = on_replayed
+
+        self._lock = threading.Lock()
+        self._handle = None
+        self._next_seq: Optional[int] = None
+        self._compactor: Optional[threading.Thread] = None
+
+    def materialise(self) -> Dict:
+        """Rebuild the progress document from the snapshot and the log."""
+        with self._lock:
+            progress, last_seq = self._replay(include_active=True)
+            self._next_seq = last_seq + 1
+            return progress
+
+    def append(self, event: str, value: Any, timestamp: str) -> None:
+        """Durably append one event, compacting in the background when due."""
+        with self._lock:
+            if self._next_seq is None:
+                _, last_seq = self._replay(include_active=True)
+                self._next_seq = last_seq + 1
+            record = {"seq": self._next_seq, "event": event, "value": value, "timestamp": timestamp}
+            if self._handle is None:
+                self._handle = self._open_for_append()
+            self._handle.write(json.dumps(record) + "\n")
+            self._handle.flush()
+            if self.fsync:
+                os.fsync(self._handle.fileno())
+            self._next_seq += 1
+
+            if self._handle.tell() >= self.compact_threshold and not self._compactor_running():
+                # A leftover rotated log (from a crash) is compacted before rotating again
+                if not self.compacting_path.exists():
+                    self._rotate()
+                self._compactor = threading.Thread(
+                    target=self._compact_rotated, name="progress-compactor", daemon=True
+                )
+                self._compactor.start()
+
+    def compact(self) -> None:
+        """Fold the whole log into the snapshot synchronously."""
+        self.wait()
+        if self.compacting_path.exists():
+            self._compact_rotated()
+        with self._lock:
+            if self.log_path.exists():
+                self._rotate()
+        self._compact_rotated()
+
+    def reset(self, progress: Dict) -> None:
+        """Replace the snapshot with a new document and discard logged events."""
+        self.wait()
+        with self._lock:
+            self._close_handle()
+            seq = (self._next_seq or 1) - 1
+            progress.setdefault("metadata", {})["compacted_through"] = seq
+            atomic_write_text(self.snapshot_path, json.dumps(progress, indent=2), self.fsync)
+            for path in (self.log_path, self.compacting_path):
+                if path.exists():
+                    path.unlink()
+            self._next_seq = seq + 1
+
+    def wait(self) -> None:
+        """Wait for a running background compaction to finish."""
+        compactor = self._compactor
+        if compactor is not None:
+            compactor.join()
+
+    def close(self) -> None:
+        """Finish compaction and close the log file."""
+        self.wait()
+        with self._lock:
+            self._close_handle()
+
+    def _compactor_running(self) -> bool:
+        return self._compactor is not None and self._compactor.is_alive()
+
+    def _rotate(self) -> None:
+        """Move the active log aside so appends continue in a fresh file."""
+        self._close_handle()
+        os.replace(self.log_path, self.compacting_path)
+
+    def _compact_rotated(self) -> None:
+        """Write a snapshot including the rotated log, then drop it."""
+        try:
+            # Appends only touch the active log, so the replay can run unlocked;
+            # swapping the snapshot is locked so readers never see it half-applied
+            progress, last_seq = self._replay(include_active=False)
+            progress.setdefault("metadata", {})["compacted_through"] = last_seq
+            text = json.dumps(progress, indent=2)
+            with self._lock:
+                atomic_write_text(self.snapshot_path, text, self.fsync)
+                if self.compacting_path.exists():
+                    self.compacting_path.unlink()
+            self.logger.info(f"Compacted progress log into {self.snapshot_path}")
+        except Exception as e:
+            self.logger.error(f"Error compacting progress log: {str(e)}")
+
+    def _replay(self, include_active: bool) -> Tuple[Dict, int]:
+        """Return the snapshot with logged events applied, and the last sequence."""
+        progress = self._read_snapshot()
+        last_seq = progress.get("metadata", {}).get("compacted_through", 0)
+        snapshot_seq = last_seq
+        paths = [self.compacting_path, self.log_path] if include_active else [self.compacting_path]
+        for path in paths:
+            for record in self._read_events(path):
+                if record["seq"] <= snapshot_seq:
+                    continue
+                self.apply_event(progress, record["event"], record.get("value"),
+                                 record.get("timestamp", ""))
+                last_seq = max(last_seq, record["seq"])
+        if self.on_replayed is not None and last_seq > snapshot_seq:
+            self.on_replayed(progress)
+        return progress, last_seq
+
+    def _read_snapshot(self) -> Dict:
+        try:
+            with open(self.snapshot_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return self.default_factory()
+
+    def _read_events(self, path: Path) -> Iterator[Dict]:
+        """Yield logged events, skipping a torn final line left by a crash."""
+        try:
+            f = open(path, 'r', encoding='utf-8')
+        except FileNotFoundError:
+            return
+        with f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    self.logger.warning(f"Skipping incomplete event in {path}")
+                    continue
+                if isinstance(record, dict) and "seq" in record:
+                    yield record
+
+    def _open_for_append(self):
+        """Open the active log, terminating a torn final line so it stays isolated."""
+        handle = open(self.log_path, 'a+', encoding='utf-8')
+        if handle.tell() > 0:
+            with open(self.log_path, 'rb') as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    handle.write("\n")
+        return handle
+
+    def _close_handle(self) -> None:
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
@@ -0,0 +1,95 @@
+"""
+File helpers shared by the configuration modules.
+"""
+
+import os
+import stat
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional, TextIO, Tuple
+
+Signature = Optional[Tuple[int, int, int]]
+
+def user_cache_dir(name: str) -> Path:
+    """Per-user cache location: $XDG_CACHE_HOME (default ~/.cache)/coding-tutor/<name>."""
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "coding-tutor" / name
+
+def ensure_private_dir(path: Path) -> bool:
+    """Create a directory only the current user can access, or check an existing one.
+
+    Caches that are read back without re-validating their contents must not
+    live anywhere other users can write to.
+
+    Returns:
+        True if path is a real directory owned by the current user with no
+        group or other permissions, False otherwise
+    """
+    path = Path(path)
+    try:
+        path.mkdir(mode=0o700, parents=True, exist_ok=True)
+        info = os.lstat(path)
+    except OSError:
+        return False
+    if not stat.S_ISDIR(info.st_mode):
+        return False
+    if hasattr(os, "getuid"):
+        return info.st_uid == os.getuid() and not info.st_mode & 0o077
+    return True
+
+def file_signature(path: Path) -> Signature:
+    """Return (mtime_ns, size, inode) for a file, or None if it does not exist."""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+@contextmanager
+def atomic_open(path: Path, fsync: bool = True) -> Iterator[TextIO]:
+    """Open a temporary file that atomically replaces path on success.
+
+    Text written to the yielded handle goes to a temporary file in the same
+    directory, which is renamed over the target when the block exits cleanly.
+    If the block raises, the temporary file is removed and the target is left
+    untouched, so readers see either the old or the new contents.
+
+    Args:
+        path: File to write
+        fsync: Flush the temporary file to disk before renaming
+
+    Yields:
+        Text handle for the new contents
+    """
+    path = Path(path)
+    fd, tmp_path = tempfile.mkstemp(dir=str(path.parent), prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            yield f
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        try:
+            mode = os.stat(path).st_mode & 0o777
+        except FileNotFoundError:
+            mode = 0o644
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+def atomic_write_text(path: Path, text: str, fsync: bool = True) -> None:
+    """Replace a file's contents atomically.
+
+    Args:
+        path: File to write
+        text: New file contents
+        fsync: Flush the temporary file to disk before renaming
+    """
+    with atomic_open(path, fsync) as f:
+        f.write(text)
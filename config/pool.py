@@ -0,0 +1,336 @@
+"""
+Bounded pool of per-student configuration managers.
+
+A server handling a whole cohort keeps recently used students' managers in
+memory and evicts the least recently used ones once the pool exceeds a count
+or estimated-size budget. Evicted managers flush pending writes first, so
+eviction never loses data. Managers checked out with acquire() (or checkout())
+are pinned and never evicted until released, so a request that is still
+writing cannot have its manager flushed and replaced by a fresh copy from disk.
+Loading and flushing happen outside the pool lock, so one student's disk I/O
+never stalls lookups of the others; concurrent lookups of a student being
+loaded wait for that single load.
+Every manager reading the same settings.yaml shares one parsed copy (see
+load_shared_settings), which is not counted per student.
+
+Usage:
+    from config.pool import ConfigManagerPool
+    pool = ConfigManagerPool("students", max_managers=500)
+    with pool.checkout("ada") as config:
+        config.update_progress("lesson_completed", "lesson_1")
+    print(pool.stats())
+"""
+
+import logging
+import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .config_manager import ConfigManager
+
+# Default budgets: 1024 managers or 64 MiB of estimated per-student state
+DEFAULT_MAX_MANAGERS = 1024
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# Long lists are sized from this many evenly spaced items, scaled up
+ESTIMATE_SAMPLE = 32
+
+def estimate_size(obj: Any) -> int:
+    """Approximate the memory held by a tree of dicts, lists and scalars.
+    
+    Long sequences (such as lesson_history) are sized from a sample of their
+    items, so re-estimating a student after each request stays cheap.
+    """
+    seen = set()
+    stack = [(obj, 1.0)]
+    total = 0.0
+    while stack:
+        item, weight = stack.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        total += sys.getsizeof(item) * weight
+        if isinstance(item, dict):
+            stack.extend((key, weight) for key in item.keys())
+            stack.extend((value, weight) for value in item.values())
+        elif isinstance(item, (list, tuple)) and len(item) > ESTIMATE_SAMPLE:
+            step = len(item) / ESTIMATE_SAMPLE
+            stack.extend((item[int(i * step)], weight * step) for i in range(ESTIMATE_SAMPLE))
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            stack.extend((member, weight) for member in item)
+    return int(total)
+
+def validate_student_id(student_id: str) -> None:
+    """Reject ids that are not a plain directory name.
+
+    Raises:
+        ValueError: If student_id is empty, a relative reference or a path
+    """
+    if not student_id or student_id in (".", "..") or "/" in student_id or "\\" in student_id:
+        raise ValueError(f"Invalid student id: {student_id!r}")
+
+class ConfigManagerPool:
+    """LRU cache of ConfigManager instances keyed by student id."""
+
+    def __init__(self,
+                 root_dir: str = "students",
+                 max_managers: int = DEFAULT_MAX_MANAGERS,
+                 max_bytes: Optional[int] = DEFAULT_MAX_BYTES,
+                 create_missing: bool = True,
+                 **manager_options: Any):
+        """Initialize the pool.
+
+        Args:
+            root_dir: Directory containing one config directory per student
+            max_managers: Maximum number of managers kept in memory
+            max_bytes: Maximum estimated size of the pooled student state
+                (None for no size limit)
+            create_missing: Create the config directory of a student who has
+                none; when False such lookups raise FileNotFoundError without
+                writing anything
+            **manager_options: Passed to every ConfigManager (e.g.
+                progress_backend, progress_db, auto_flush_interval)
+        """
+        self.logger = logging.getLogger(__name__)
+        self.root_dir = Path(root_dir)
+        self.max_managers = max_managers
+        self.max_bytes = max_bytes
+        self.create_missing = create_missing
+        self.manager_options = manager_options
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bytes = 0
+
+        self._lock = threading.RLock()
+        self._managers: "OrderedDict[str, Tuple[ConfigManager, int]]" = OrderedDict()
+        self._pins: Dict[str, int] = {}
+        # Students being loaded or flushed out without the pool lock; lookups
+        # for them wait on the future instead of reading the disk themselves
+        self._in_flight: Dict[str, Future] = {}
+
+    def get(self, student_id: str) -> ConfigManager:
+        """Return the manager for a student, loading it on a miss.
+
+        The manager is not pinned; callers that keep using it while other
+        students are loaded should use acquire() or checkout() instead.
+
+        Args:
+            student_id: Name of the student's directory under root_dir
+
+        Returns:
+            The pooled ConfigManager
+
+        Raises:
+            ValueError: If student_id is not a plain directory name
+            FileNotFoundError: If the student has no config directory and
+                create_missing is False
+        """
+        return self._lookup(student_id, load=True, pin=False)
+
+    def acquire(self, student_id: str, load: bool = True) -> Optional[ConfigManager]:
+        """Return a student's manager pinned in the pool until release().
+
+        Args:
+            student_id: Name of the student's directory under root_dir
+            load: Whether to load the student on a miss; when False a miss
+                returns None without touching the disk
+
+        Returns:
+            The pooled ConfigManager, or None on a miss with load=False
+
+        Raises:
+            ValueError: If student_id is not a plain directory name
+            FileNotFoundError: If the student has no config directory and
+                create_missing is False
+        """
+        return self._lookup(student_id, load=load, pin=True)
+
+    def release(self, student_id: str) -> None:
+        """Unpin a manager returned by acquire().
+
+        Dropping the last pin re-estimates the student's size, since requests
+        grow its progress. A pool held over budget shrinks again on the next
+        load, so releasing never flushes on the caller's thread.
+        """
+        with self._lock:
+            pins = self._pins.get(student_id, 0) - 1
+            if pins > 0:
+                self._pins[student_id] = pins
+                return
+            self._pins.pop(student_id, None)
+            entry = self._managers.get(student_id)
+        if entry is None:
+            return
+        size = self._estimate(entry[0])
+        with self._lock:
+            current = self._managers.get(student_id)
+            if current is not None and current[0] is entry[0]:
+                self.bytes += size - current[1]
+                self._managers[student_id] = (current[0], size)
+
+    @contextmanager
+    def checkout(self, student_id: str) -> Iterator[ConfigManager]:
+        """Pin a student's manager for the duration of a with block."""
+        manager = self.acquire(student_id)
+        try:
+            yield manager
+        finally:
+            self.release(student_id)
+
+    def _lookup(self, student_id: str, load: bool, pin: bool) -> Optional[ConfigManager]:
+        """Return a pooled manager, loading it without holding the pool lock.
+
+        Concurrent lookups of a student being loaded (or flushed out by an
+        eviction) wait for that to finish, so each student is read once.
+        """
+        validate_student_id(student_id)
+        while True:
+            with self._lock:
+                entry = self._managers.get(student_id)
+                if entry is not None:
+                    self._managers.move_to_end(student_id)
+                    self.hits += 1
+                    if pin:
+                        self._pins[student_id] = self._pins.get(student_id, 0) + 1
+                    return entry[0]
+                if not load:
+                    return None
+                pending = self._in_flight.get(student_id)
+                if pending is None:
+                    pending = self._in_flight[student_id] = Future()
+                    self.misses += 1
+                    break
+            pending.result()
+
+        try:
+            student_dir = self.root_dir / student_id
+            if self.create_missing:
+                self.root_dir.mkdir(parents=True, exist_ok=True)
+            elif not student_dir.is_dir():
+                raise FileNotFoundError(f"No configuration for student {student_id!r}")
+            manager = ConfigManager(
+                str(student_dir),
+                student_id=student_id,
+                **self.manager_options
+            )
+            size = self._estimate(manager)
+        except BaseException as e:
+            with self._lock:
+                del self._in_flight[student_id]
+            pending.set_exception(e)
+            raise
+
+        with self._lock:
+            self._managers[student_id] = (manager, size)
+            self.bytes += size
+            if pin:
+                self._pins[student_id] = self._pins.get(student_id, 0) + 1
+            del self._in_flight[student_id]
+            victims = self._evict_over_budget(keep=student_id)
+        pending.set_result(manager)
+        self._release_all(victims)
+        return manager
+
+    def evict(self, student_id: str) -> bool:
+        """Flush and drop one student's manager, even if it is pinned.
+
+        Returns:
+            True if the student was pooled, False otherwise
+        """
+        with self._lock:
+            entry = self._managers.pop(student_id, None)
+            if entry is None:
+                return False
+            victims = [self._start_release(student_id, *entry)]
+        self._release_all(victims)
+        return True
+
+    def clear(self) -> None:
+        """Flush and drop every pooled manager (counted as evictions)."""
+        with self._lock:
+            victims = []
+            while self._managers:
+                student_id, entry = self._managers.popitem(last=False)
+                victims.append(self._start_release(student_id, *entry))
+        self._release_all(victims)
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for monitoring.
+
+        Returns:
+            Dictionary with hits, misses, evictions, hit_rate, size and bytes
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "size": len(self._managers),
+                "pinned": len(self._pins),
+                "bytes": self.bytes,
+                "max_managers": self.max_managers,
+                "max_bytes": self.max_bytes
+            }
+
+    def __len__(self) -> int:
+        return len(self._managers)
+
+    def __contains__(self, student_id: str) -> bool:
+        return student_id in self._managers
+
+    def _estimate(self, manager: ConfigManager) -> int:
+        """Estimated per-student state; the shared settings are not counted."""
+        return estimate_size(manager.student_config) + estimate_size(manager.progress)
+
+    def _evict_over_budget(self, keep: str) -> List[Tuple[str, ConfigManager, Future]]:
+        """Drop least recently used unpinned managers until both budgets are met.
+
+        Called with the pool lock held. The dropped managers are returned for
+        _release_all, which flushes them after the lock is released.
+        """
+        candidates = [student_id for student_id in self._managers
+                      if student_id != keep and student_id not in self._pins]
+        victims = []
+        for student_id in candidates:
+            if not (len(self._managers) > self.max_managers or
+                    (self.max_bytes is not None and self.bytes > self.max_bytes)):
+                break
+            victims.append(self._start_release(student_id, *self._managers.pop(student_id)))
+        return victims
+
+    def _start_release(self, student_id: str, manager: ConfigManager,
+                       size: int) -> Tuple[str, ConfigManager, Future]:
+        """Account for a manager leaving the pool (pool lock held).
+
+        The student stays in flight until its writes are flushed, so a lookup
+        in the meantime cannot load stale files from disk.
+        """
+        self.bytes -= size
+        self.evictions += 1
+        flushed = self._in_flight[student_id] = Future()
+        return student_id, manager, flushed
+
+    def _release_all(self, victims: List[Tuple[str, ConfigManager, Future]]) -> None:
+        """Persist and close evicted managers without holding the pool lock."""
+        for student_id, manager, flushed in victims:
+            try:
+                manager.stop_watching()
+                manager.flush()
+                if manager.event_log:
+                    manager.event_log.close()
+                if manager.progress_store:
+                    manager.progress_store.close()
+            except Exception as e:
+                self.logger.error(f"Error releasing config for {student_id}: {str(e)}")
+            finally:
+                with self._lock:
+                    self._in_flight.pop(student_id, None)
+                flushed.set_result(None)
@@ -0,0 +1,336 @@
+"""
+SQLite-backed progress storage.
+
+Progress events are appended to indexed tables instead of rewriting the whole
+progress.json document, so recording an event costs the same no matter how long
+a student's history is. Small aggregate state (current lesson, practice stats,
+streaks) is kept as one JSON row per student; an event only rewrites the
+sections of it that the event changed.
+
+A store may be shared by threads (for example a daemon's worker pool): one
+connection is used by every thread, serialised by a lock.
+
+Usage:
+    from config.progress_store import SQLiteProgressStore
+    store = SQLiteProgressStore('progress.db')
+    store.record_event('ada', 'lesson_completed', 'lesson_1', '2024-01-01T10:00:00')
+    streak = store.current_streak('ada')
+"""
+
+import json
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+# progress.json schema versions the migrator understands
+SUPPORTED_SCHEMA_VERSIONS = ("1.0.0",)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS lesson_events (
+    id INTEGER PRIMARY KEY,
+    student TEXT NOT NULL,
+    event TEXT NOT NULL,
+    value TEXT,
+    timestamp TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_lesson_events_student_time
+    ON lesson_events (student, timestamp);
+
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    student TEXT NOT NULL,
+    start_time TEXT NOT NULL,
+    end_time TEXT,
+    duration REAL DEFAULT 0,
+    topics TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_sessions_student_time
+    ON sessions (student, start_time);
+
+CREATE TABLE IF NOT EXISTS achievements (
+    student TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    name TEXT NOT NULL,
+    value TEXT,
+    awarded_at TEXT,
+    PRIMARY KEY (student, kind, name)
+);
+
+CREATE TABLE IF NOT EXISTS progress_state (
+    student TEXT PRIMARY KEY,
+    document TEXT NOT NULL,
+    schema_version TEXT
+);
+"""
+
+class SQLiteProgressStore:
+    """Stores progress events, sessions and achievements in SQLite."""
+
+    def __init__(self, db_path: str):
+        """Open (and create if needed) a progress database.
+
+        Args:
+            db_path: Path to the SQLite database file
+        """
+        self.db_path = Path(db_path)
+        self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._lock = threading.RLock()
+        with self._lock:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            self.conn.executescript(SCHEMA)
+            self._json_set = self._has_json_functions()
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self.conn.close()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """Hold the connection lock for one committed (or rolled back) transaction."""
+        with self._lock, self.conn:
+            yield self.conn
+
+    def load_progress(self, student: str) -> Optional[Dict]:
+        """Load the aggregate progress document for a student.
+
+        Returns:
+            Progress document (without lesson_history) or None if unknown
+        """
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT document FROM progress_state WHERE student = ?", (student,)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def save_progress(self, student: str, progress: Dict) -> None:
+        """Replace the aggregate progress document for a student."""
+        with self._transaction():
+            self._upsert_progress(student, progress)
+
+    def reset_progress(self, student: str, progress: Dict) -> None:
+        """Start a student over with a fresh aggregate document.
+
+        The student's events, sessions and achievements are deleted in the
+        same transaction, so no rows from the previous run survive.
+        """
+        with self._transaction() as conn:
+            for table in ("lesson_events", "sessions", "achievements"):
+                conn.execute(f"DELETE FROM {table} WHERE student = ?", (student,))
+            self._upsert_progress(student, progress)
+
+    def record_event(self,
+                     student: str,
+                     event: str,
+                     value: Any,
+                     timestamp: str,
+                     changes: Optional[Dict[str, Any]] = None) -> None:
+        """Append a progress event, optionally updating aggregate state atomically.
+
+        Args:
+            student: Student identifier
+            event: Event type, e.g. 'lesson_completed'
+            value: Event payload
+            timestamp: ISO-8601 timestamp
+            changes: Top-level sections of the aggregate document (such as
+                practice_stats) replaced in the same transaction
+        """
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT INTO lesson_events (student, event, value, timestamp) VALUES (?, ?, ?, ?)",
+                (student, event, self._encode(value), timestamp)
+            )
+            if changes:
+                self._update_sections(student, changes)
+
+    def record_session(self,
+                       student: str,
+                       start_time: str,
+                       end_time: str = "",
+                       duration: float = 0,
+                       topics: Optional[List[str]] = None) -> None:
+        """Append a learning session."""
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT INTO sessions (student, start_time, end_time, duration, topics) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (student, start_time, end_time, duration, json.dumps(topics or []))
+            )
+
+    def award(self, student: str, kind: str, name: str,
+              value: Any = None, awarded_at: str = "") -> None:
+        """Record (or replace) an achievement such as a badge."""
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO achievements (student, kind, name, value, awarded_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (student, kind, name, self._encode(value), awarded_at)
+            )
+
+    def lesson_history(self, student: str, limit: Optional[int] = None) -> List[Dict]:
+        """Return a student's events, most recent first."""
+        query = ("SELECT event, value, timestamp FROM lesson_events "
+                 "WHERE student = ? ORDER BY timestamp DESC, id DESC")
+        params: tuple = (student,)
+        if limit is not None:
+            query += " LIMIT ?"
+            params += (limit,)
+        with self._lock:
+            rows = self.conn.execute(query, params).fetchall()
+        return [
+            {"event": event, "value": self._decode(value), "timestamp": timestamp}
+            for event, value, timestamp in rows
+        ]
+
+    def achievements(self, student: str, kind: Optional[str] = None) -> List[Dict]:
+        """Return a student's achievements, optionally filtered by kind."""
+        query = "SELECT kind, name, value, awarded_at FROM achievements WHERE student = ?"
+        params: tuple = (student,)
+        if kind is not None:
+            query += " AND kind = ?"
+            params += (kind,)
+        with self._lock:
+            rows = self.conn.execute(query, params).fetchall()
+        return [
+            {"kind": k, "name": n, "value": self._decode(v), "awarded_at": a}
+            for k, n, v, a in rows
+        ]
+
+    def current_streak(self, student: str, today: Optional[date] = None) -> int:
+        """Count consecutive active days ending today (or yesterday).
+
+        Walks the (student, timestamp) index backwards and stops at the first
+        gap, so the cost depends on the streak length, not the history size.
+        """
+        today = today or date.today()
+        streak = 0
+        expected = None
+        with self._lock:
+            cursor = self.conn.execute(
+                "SELECT timestamp FROM lesson_events WHERE student = ? AND timestamp != '' "
+                "ORDER BY timestamp DESC",
+                (student,)
+            )
+            for (timestamp,) in cursor:
+                day = datetime.fromisoformat(timestamp).date()
+                if expected is None:
+                    if day < today - timedelta(days=1):
+                        break
+                    expected = day
+                if day == expected:
+                    streak += 1
+                    expected = day - timedelta(days=1)
+                elif day < expected:
+                    break
+            cursor.close()
+        return streak
+
+    def migrate_from_json(self, progress: Dict, student: str) -> int:
+        """Import a progress.json document for a student in one transaction.
+
+        Args:
+            progress: Parsed progress.json document
+            student: Student identifier
+
+        Returns:
+            Number of lesson events imported
+
+        Raises:
+            ValueError: If the document's data_schema_version is not supported
+        """
+        metadata = progress.get("metadata", {})
+        version = metadata.get("data_schema_version", "1.0.0")
+        if version not in SUPPORTED_SCHEMA_VERSIONS:
+            raise ValueError(f"Unsupported progress schema version: {version}")
+
+        user_progress = progress.get("user_progress", {})
+        history = user_progress.get("lesson_history", [])
+        fallback_time = metadata.get("last_updated", "")
+
+        events = []
+        recorded_completions = set()
+        for entry in history:
+            if not isinstance(entry, dict):
+                entry = {"event": "lesson_event", "value": entry}
+            event = entry.get("event", "lesson_event")
+            value = entry.get("value", entry.get("lesson"))
+            if event == "lesson_completed":
+                recorded_completions.add(value)
+            events.append((student, event, self._encode(value),
+                           entry.get("timestamp", fallback_time)))
+        for lesson in user_progress.get("completed_lessons", []):
+            if lesson not in recorded_completions:
+                events.append((student, "lesson_completed", self._encode(lesson), fallback_time))
+
+        state = json.loads(json.dumps(progress))
+        state.setdefault("user_progress", {})["lesson_history"] = []
+        achievements = progress.get("achievements", {})
+        last_session = progress.get("session_data", {}).get("last_session", {})
+
+        with self._transaction() as conn:
+            conn.executemany(
+                "INSERT INTO lesson_events (student, event, value, timestamp) VALUES (?, ?, ?, ?)",
+                events
+            )
+            for badge in achievements.get("badges", []):
+                conn.execute(
+                    "INSERT OR REPLACE INTO achievements (student, kind, name, value, awarded_at) "
+                    "VALUES (?, 'badge', ?, NULL, '')",
+                    (student, str(badge))
+                )
+            if last_session.get("start_time"):
+                conn.execute(
+                    "INSERT INTO sessions (student, start_time, end_time, duration, topics) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (student, last_session["start_time"], last_session.get("end_time", ""),
+                     last_session.get("duration", 0),
+                     json.dumps(last_session.get("topics_covered", [])))
+                )
+            self._upsert_progress(student, state)
+        return len(events)
+
+    def _upsert_progress(self, student: str, progress: Dict) -> None:
+        """Write the aggregate progress row (caller manages the transaction)."""
+        version = progress.get("metadata", {}).get("data_schema_version")
+        self.conn.execute(
+            "INSERT OR REPLACE INTO progress_state (student, document, schema_version) "
+            "VALUES (?, ?, ?)",
+            (student, json.dumps(progress), version)
+        )
+
+    def _update_sections(self, student: str, changes: Dict[str, Any]) -> None:
+        """Replace top-level sections of the aggregate row (caller manages the transaction)."""
+        if self._json_set:
+            paths = ", ".join("?, json(?)" for _ in changes)
+            params = []
+            for section, value in changes.items():
+                params += ['$."' + section.replace('"', '""') + '"', json.dumps(value)]
+            self.conn.execute(
+                f"UPDATE progress_state SET document = json_set(document, {paths}) "
+                "WHERE student = ?",
+                params + [student]
+            )
+            return
+        progress = self.load_progress(student) or {}
+        progress.update(changes)
+        self._upsert_progress(student, progress)
+
+    def _has_json_functions(self) -> bool:
+        """Whether this SQLite build has the JSON1 functions."""
+        try:
+            self.conn.execute("SELECT json_set('{}', '$.a', 1)").fetchone()
+            return True
+        except sqlite3.OperationalError:
+            return False
+
+    @staticmethod
+    def _encode(value: Any) -> Optional[str]:
+        return None if value is None else json.dumps(value)
+
+    @staticmethod
+    def _decode(value: Optional[str]) -> Any:
+        return None if value is None else json.loads(value)
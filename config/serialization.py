@@ -0,0 +1,101 @@
+"""
+YAML serialisation shared by the configuration and workspace modules.
+
+Uses libyaml's CSafeLoader/CSafeDumper when PyYAML was built with it and falls
+back to the pure-Python safe loader and dumper otherwise. Larger files can also
+be served from a parse cache keyed by the SHA-1 of their contents, so a file is
+only parsed again when its bytes change. Cache entries are stored with marshal,
+which only rebuilds plain data and never runs code, in a per-user directory
+with mode 0700; the cache is skipped if that directory is accessible to others.
+
+Usage:
+    from config.serialization import load_yaml, dump_yaml
+    settings = load_yaml('config/settings.yaml')
+    text = dump_yaml(settings)
+"""
+
+import hashlib
+import logging
+import marshal
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Optional
+
+import yaml
+
+from .fileio import ensure_private_dir, user_cache_dir
+
+try:
+    from yaml import CSafeLoader as SafeLoader, CSafeDumper as SafeDumper
+    LIBYAML_AVAILABLE = True
+except ImportError:
+    from yaml import SafeLoader, SafeDumper
+    LIBYAML_AVAILABLE = False
+
+# Default location of the parsed YAML cache
+YAML_CACHE_DIR = str(user_cache_dir("yaml"))
+
+# Files smaller than this parse faster than a cache round-trip is worth
+CACHE_MIN_BYTES = 4096
+
+logger = logging.getLogger(__name__)
+
+def parse_yaml(text: str) -> Any:
+    """Parse YAML text with the fastest available safe loader."""
+    return yaml.load(text, Loader=SafeLoader)
+
+def dump_yaml(data: Any) -> str:
+    """Serialise data to block-style YAML with the fastest available safe dumper."""
+    return yaml.dump(data, Dumper=SafeDumper, default_flow_style=False, allow_unicode=True)
+
+def load_yaml(path: Path, cache_dir: Optional[str] = YAML_CACHE_DIR) -> Any:
+    """Load a YAML file, reusing a cached parse when its contents are unchanged.
+
+    Args:
+        path: YAML file to load
+        cache_dir: Private directory for the parse cache (None disables it)
+
+    Returns:
+        Parsed document
+
+    Raises:
+        FileNotFoundError: If the file does not exist
+        yaml.YAMLError: If the file is not valid YAML
+    """
+    raw = Path(path).read_bytes()
+    if not cache_dir or len(raw) < CACHE_MIN_BYTES:
+        return parse_yaml(raw.decode("utf-8"))
+
+    if not ensure_private_dir(Path(cache_dir)):
+        logger.warning(f"Not using YAML cache {cache_dir}: not a private directory")
+        return parse_yaml(raw.decode("utf-8"))
+
+    cache_file = Path(cache_dir) / f"{hashlib.sha1(raw).hexdigest()}.{marshal.version}.marshal"
+    try:
+        return marshal.loads(cache_file.read_bytes())
+    except FileNotFoundError:
+        pass
+    except (OSError, EOFError, ValueError, TypeError) as e:
+        logger.warning(f"Ignoring unreadable YAML cache entry {cache_file}: {str(e)}")
+
+    data = parse_yaml(raw.decode("utf-8"))
+    try:
+        payload = marshal.dumps(data)
+    except ValueError:
+        return data  # holds values marshal cannot store, such as timestamps
+
+    tmp_path = None
+    try:
+        fd, tmp_path = tempfile.mkstemp(dir=str(cache_file.parent), suffix=".tmp")
+        with os.fdopen(fd, 'wb') as f:
+            f.write(payload)
+        os.replace(tmp_path, cache_file)
+    except OSError as e:
+        logger.warning(f"Could not write YAML cache entry {cache_file}: {str(e)}")
+        if tmp_path is not None:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+    return data
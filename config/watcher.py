@@ -0,0 +1,143 @@
+"""
+File watcher for configuration hot-reload.
+
+Tracks a (mtime, size, inode) signature per watched file and reports only the
+files whose signature changed. On Linux the watcher sleeps on inotify events
+for the containing directories; elsewhere (or if inotify is unavailable) it
+falls back to stat polling.
+"""
+
+import ctypes
+import ctypes.util
+import logging
+import os
+import select
+import sys
+import threading
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from .fileio import Signature, file_signature
+
+# inotify event mask: anything that can replace or rewrite a file in a directory
+_IN_MODIFY = 0x00000002
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_WATCH_MASK = _IN_MODIFY | _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE
+_IN_NONBLOCK = os.O_NONBLOCK
+_IN_CLOEXEC = getattr(os, "O_CLOEXEC", 0o2000000)
+
+def _open_inotify(directories: List[Path]) -> Optional[int]:
+    """Create an inotify descriptor watching the given directories, if supported."""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if fd < 0:
+            return None
+        for directory in directories:
+            if libc.inotify_add_watch(fd, str(directory).encode(), _IN_WATCH_MASK) < 0:
+                os.close(fd)
+                return None
+        return fd
+    except (OSError, AttributeError):
+        return None
+
+class ConfigWatcher:
+    """Reports changes to a set of named configuration files."""
+
+    def __init__(self,
+                 files: Dict[str, Path],
+                 on_change: Callable[[str], None],
+                 interval: float = 1.0,
+                 use_inotify: bool = True):
+        """Initialize the watcher.
+
+        Args:
+            files: Mapping of logical name to file path
+            on_change: Called with the name of each file whose signature changed
+            interval: Polling interval in seconds (also the inotify wake-up timeout)
+            use_inotify: Use inotify where available instead of polling
+        """
+        self.logger = logging.getLogger(__name__)
+        self.files = {name: Path(path) for name, path in files.items()}
+        self.on_change = on_change
+        self.interval = interval
+        self.use_inotify = use_inotify
+        self.signatures: Dict[str, Signature] = {
+            name: file_signature(path) for name, path in self.files.items()
+        }
+        self.mode = "stopped"
+
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._inotify_fd: Optional[int] = None
+
+    def check(self) -> List[str]:
+        """Stat every watched file once and dispatch callbacks for changed ones.
+
+        Returns:
+            Names of the files that changed
+        """
+        changed = []
+        for name, path in self.files.items():
+            signature = file_signature(path)
+            if signature != self.signatures.get(name):
+                self.signatures[name] = signature
+                changed.append(name)
+        for name in changed:
+            try:
+                self.on_change(name)
+            except Exception as e:
+                self.logger.error(f"Error handling change to {name}: {str(e)}")
+        return changed
+
+    def acknowledge(self, name: str) -> None:
+        """Record the current signature of a file written by its owner."""
+        if name in self.files:
+            self.signatures[name] = file_signature(self.files[name])
+
+    def start(self) -> None:
+        """Start watching in a background thread."""
+        if self._thread is not None:
+            return
+        if self.use_inotify:
+            directories = sorted({path.parent.resolve() for path in self.files.values()})
+            self._inotify_fd = _open_inotify(directories)
+        self.mode = "inotify" if self._inotify_fd is not None else "polling"
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="config-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._inotify_fd is not None:
+            os.close(self._inotify_fd)
+            self._inotify_fd = None
+        self.mode = "stopped"
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            if self._inotify_fd is not None:
+                ready, _, _ = select.select([self._inotify_fd], [], [], self.interval)
+                if not ready:
+                    continue
+                self._drain_inotify()
+            elif self._stop.wait(self.interval):
+                break
+            self.check()
+
+    def _drain_inotify(self) -> None:
+        """Discard queued inotify events; check() decides what actually changed."""
+        try:
+            while os.read(self._inotify_fd, 65536):
+                pass
+        except BlockingIOError:
+            pass
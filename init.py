@@ -20,42 +20,62 @@ The AI Learning Assistant then:
 Usage:
     python init.py         # First-time setup
     python init.py --update # Update existing configuration
+    python init.py --batch answers.jsonl [--output-dir students] [--report report.jsonl] [--workers N]
+                            # Provision a cohort from pre-filled assessments
+    python init.py --status [--json] # Show workspace, prompt, plan and progress state
+    python init.py --batch answers.jsonl --trace trace.json --trace-format chrome
+                            # Record per-stage timing spans (any command accepts --trace)
+    python init.py --serve /tmp/tutor.sock [--output-dir students]
+                            # Serve config, progress and prompt requests from a warm daemon
+    python init.py --analytics [--output-dir students] [--report cohort.json] [--csv cohort.csv]
+                            # Cohort distributions, lesson funnel and at-risk students
 """
 
-import argparse
-import logging
 import sys
-from pathlib import Path
 
-# Import setup modules
-from setup.assessment import UserAssessment
-from setup.workspace import WorkspaceManager
-from setup.lesson_plan import LessonPlanGenerator
-from setup.prompt_setup import PromptManager
-from config.config_manager import ConfigManager
+# Setup modules are imported inside each command so that every command only
+# pays for the dependencies (questionary, Jinja2, YAML) it actually uses.
+# argparse and logging are imported lazily too, so that the plain --status
+# forms, which shell prompts and editor status bars run repeatedly, skip them.
 
 # Constants
 TEMPLATE_FILE = "LESSON_PLAN_TEMPLATE.md"
 OUTPUT_FILE = "LESSON_PLAN_CUSTOM.md"
 PROMPT_FILE = "ai_agents/prompts/learning_assistant.md"
 
-# Setup Logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler("init.log"),
-        logging.StreamHandler(sys.stdout)
-    ]
-)
+LOG_FILE = "init.log"
 
-logger = logging.getLogger(__name__)
+def configure_logging(log_file: str = LOG_FILE):
+    """Log to stdout and, unless log_file is None, to log_file."""
+    import logging
+    
+    handlers = [logging.StreamHandler(sys.stdout)]
+    if log_file:
+        handlers.insert(0, logging.FileHandler(log_file))
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        handlers=handlers
+    )
+
+def get_logger():
+    """Return the logger used by the commands in this script."""
+    import logging
+    return logging.getLogger(__name__)
 
 def initial_setup():
     """Perform initial setup of the learning environment."""
+    logger = get_logger()
     try:
         logger.info("Starting initial setup")
         
+        from setup.assessment import UserAssessment
+        from setup.workspace import WorkspaceManager
+        from setup.lesson_plan import LessonPlanGenerator
+        from setup.prompt_setup import PromptManager
+        from setup.tracing import span
+        from config.config_manager import ConfigManager
+        
         # Initialize components
         assessment = UserAssessment()
         workspace = WorkspaceManager()
@@ -64,36 +84,55 @@ def initial_setup():
         config = ConfigManager()
         
         # Collect user preferences
-        user_data = assessment.assess_new_user()
-        if not assessment.validate_assessment(user_data):
-            logger.error("Invalid assessment data")
+        with span("assess"):
+            user_data = assessment.assess_new_user()
+        profile = None
+        with span("validate") as s:
+            try:
+                profile = assessment.build_profile(user_data)
+            except ValueError as e:
+                logger.error(f"Invalid assessment data: {str(e)}")
+            s.set(ok=profile is not None)
+        if profile is None:
             return False
             
         # Initialize student configuration
-        config.initialize_student(
-            name=user_data.get("name", "Student"),
-            skill_level=user_data.get("skill_level", "beginner")
-        )
+        with span("config_init", record_io=True):
+            config.initialize_student(
+                name=profile.name or "Student",
+                skill_level=profile.skill_level,
+                profile=profile
+            )
         
         # Configure workspace
-        if not workspace.configure_workspace(PROMPT_FILE):
+        with span("workspace", record_io=True) as s:
+            configured = workspace.configure_workspace(PROMPT_FILE)
+            s.set(ok=configured)
+        if not configured:
             logger.error("Failed to configure workspace")
             return False
             
         # Generate lesson plan
-        if not lesson_gen.generate_plan(TEMPLATE_FILE, OUTPUT_FILE, user_data):
+        with span("plan_generation", record_io=True, template=TEMPLATE_FILE) as s:
+            generated = lesson_gen.generate_plan(TEMPLATE_FILE, OUTPUT_FILE, profile)
+            s.set(ok=generated is not None, status=generated)
+        if not generated:
             logger.error("Failed to generate lesson plan")
             return False
             
         # Setup Learning Assistant prompt
-        prompt_content = prompt_mgr.customize_prompt(user_data)
-        if not prompt_content or not prompt_mgr.validate_prompt(prompt_content):
+        with span("prompt_customisation", record_io=True) as s:
+            prompt_content = prompt_mgr.customize_prompt(profile)
+            prompt_ok = bool(prompt_content) and prompt_mgr.validate_prompt(prompt_content)
+            s.set(ok=prompt_ok)
+        if not prompt_ok:
             logger.error("Failed to setup Learning Assistant prompt")
             return False
             
         # Display setup instructions
-        prompt_mgr.display_prompt()
-        prompt_mgr.open_in_browser()
+        with span("display"):
+            prompt_mgr.display_prompt()
+            prompt_mgr.open_in_browser()
         
         logger.info("Initial setup completed successfully")
         return True
@@ -104,39 +143,62 @@ def initial_setup():
 
 def update_configuration():
     """Update existing configuration."""
+    logger = get_logger()
     try:
         logger.info("Updating existing configuration")
         
+        from setup.assessment import UserAssessment
+        from setup.workspace import WorkspaceManager
+        from setup.lesson_plan import LessonPlanGenerator
+        from setup.tracing import span
+        from config.config_manager import ConfigManager
+        
         # Initialize components
         assessment = UserAssessment()
         workspace = WorkspaceManager()
         lesson_gen = LessonPlanGenerator()
-        config = ConfigManager()
+        with span("config_load"):
+            config = ConfigManager()
         
         # Load current configuration
         current_data = config.get_student_preference("")  # Get all preferences
         
         # Update assessment
-        user_data = assessment.update_assessment(current_data)
-        if not assessment.validate_assessment(user_data):
-            logger.error("Invalid assessment data")
+        with span("assess"):
+            user_data = assessment.update_assessment(current_data)
+        profile = None
+        with span("validate") as s:
+            try:
+                profile = assessment.build_profile(user_data)
+            except ValueError as e:
+                logger.error(f"Invalid assessment data: {str(e)}")
+            s.set(ok=profile is not None)
+        if profile is None:
             return False
             
         # Update workspace configuration
         workspace_updates = {
             "settings": {
-                "theme": user_data.get("theme"),
-                "skill_level": user_data.get("skill_level")
+                "theme": profile.theme,
+                "skill_level": profile.skill_level
             }
         }
-        if not workspace.update_workspace_config(workspace_updates):
+        with span("workspace", record_io=True) as s:
+            updated = workspace.update_workspace_config(workspace_updates)
+            s.set(ok=updated)
+        if not updated:
             logger.error("Failed to update workspace configuration")
             return False
             
         # Regenerate lesson plan
-        if not lesson_gen.generate_plan(TEMPLATE_FILE, OUTPUT_FILE, user_data):
+        with span("plan_generation", record_io=True, template=TEMPLATE_FILE) as s:
+            generated = lesson_gen.generate_plan(TEMPLATE_FILE, OUTPUT_FILE, profile)
+            s.set(ok=generated is not None, status=generated)
+        if not generated:
             logger.error("Failed to regenerate lesson plan")
             return False
+        if generated == "unchanged":
+            logger.info("Lesson plan already up to date")
             
         logger.info("Configuration update completed successfully")
         return True
@@ -145,13 +207,146 @@ def update_configuration():
         logger.error(f"Error during configuration update: {str(e)}")
         return False
 
+def batch_setup(answers_file: str, output_dir: str, report_file: str = None, workers: int = 1):
+    """Provision one workspace per record in a JSON-lines answers file."""
+    logger = get_logger()
+    try:
+        logger.info(f"Starting batch setup from {answers_file}")
+        
+        from setup.batch import BatchProvisioner
+        
+        provisioner = BatchProvisioner(
+            output_dir=output_dir,
+            template_file=TEMPLATE_FILE,
+            output_file=OUTPUT_FILE,
+            prompt_file=PROMPT_FILE,
+            workers=workers
+        )
+        summary = provisioner.run(answers_file, report_file)
+        
+        return summary["total"] > 0 and summary["failed"] == 0
+        
+    except Exception as e:
+        logger.error(f"Error during batch setup: {str(e)}")
+        return False
+
+def show_status(as_json: bool = False):
+    """Print workspace, prompt, lesson plan and progress state."""
+    import json
+    from setup.status import collect_status, format_status
+    
+    status = collect_status(prompt_file=PROMPT_FILE, plan_file=OUTPUT_FILE)
+    print(json.dumps(status, indent=2) if as_json else format_status(status))
+    return True
+
+def serve_daemon(address: str, output_dir: str):
+    """Run the tutor daemon until interrupted."""
+    logger = get_logger()
+    try:
+        from setup.daemon import serve
+        
+        serve(
+            address,
+            output_dir=output_dir,
+            template_file=TEMPLATE_FILE,
+            output_file=OUTPUT_FILE
+        )
+        return True
+        
+    except Exception as e:
+        logger.error(f"Error running tutor daemon: {str(e)}")
+        return False
+
+def cohort_analytics(output_dir: str, report_file: str = None, csv_file: str = None,
+                     workers: int = 1):
+    """Report on every student's progress under output_dir."""
+    logger = get_logger()
+    try:
+        import json
+        from config.analytics import load_cohort
+        from setup.tracing import span
+        
+        with span("load_cohort", root=output_dir) as s:
+            cohort = load_cohort(output_dir, workers=workers)
+            s.set(students=len(cohort))
+        with span("cohort_report"):
+            report = cohort.report()
+        logger.info(
+            f"Analysed {report['students']} students: "
+            f"{len(report['at_risk'])} at risk, {report['unreadable']} unreadable"
+        )
+        
+        text = json.dumps(report, indent=2)
+        if report_file:
+            with open(report_file, 'w', encoding='utf-8') as f:
+                f.write(text + "\n")
+        else:
+            print(text)
+        if csv_file:
+            cohort.write_csv(csv_file)
+        return report["students"] > 0
+        
+    except Exception as e:
+        logger.error(f"Error during cohort analytics: {str(e)}")
+        return False
+
+# Argument lists answered without argparse or logging
+STATUS_ARGS = (["--status"], ["--status", "--json"], ["--json", "--status"])
+
 def main():
     """Main entry point for the initialization script."""
+    if sys.argv[1:] in STATUS_ARGS:
+        sys.exit(0 if show_status("--json" in sys.argv) else 1)
+    
+    import argparse
+    
     parser = argparse.ArgumentParser(description="Initialize the Interactive Coding Tutor.")
     parser.add_argument('--update', action='store_true', help='Update existing configuration')
+    parser.add_argument('--status', action='store_true', help='Show current environment status')
+    parser.add_argument('--json', action='store_true', help='Print --status output as JSON')
+    parser.add_argument('--batch', metavar='ANSWERS', help='Provision students from a JSON-lines answers file')
+    parser.add_argument('--serve', metavar='ADDRESS',
+                        help='Run the tutor daemon on a Unix socket path or HOST:PORT')
+    parser.add_argument('--analytics', action='store_true',
+                        help='Report cohort statistics from the progress files in --output-dir')
+    parser.add_argument('--output-dir', default='students',
+                        help='Directory for student workspaces (--batch, --serve, --analytics)')
+    parser.add_argument('--report', metavar='FILE',
+                        help='Write the per-record batch report (JSON lines) or the --analytics report')
+    parser.add_argument('--csv', metavar='FILE', help='Write per-student --analytics columns as CSV')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Processes used to render batch lesson plans or read progress files')
+    parser.add_argument('--trace', metavar='FILE', help='Write per-stage timing spans to FILE')
+    parser.add_argument('--trace-format', choices=['jsonl', 'chrome'], default='jsonl',
+                        help='Trace file format (JSON lines or Chrome trace events)')
     args = parser.parse_args()
+    if args.json and not args.status:
+        parser.error("--json can only be used with --status")
+    
+    # --status is read-only, so it never creates or appends to the log file
+    configure_logging(None if args.status else LOG_FILE)
 
-    success = update_configuration() if args.update else initial_setup()
+    if args.trace:
+        from setup.tracing import start_tracing
+        start_tracing(args.trace, args.trace_format)
+
+    try:
+        if args.status:
+            success = show_status(args.json)
+        elif args.serve:
+            success = serve_daemon(args.serve, args.output_dir)
+        elif args.analytics:
+            success = cohort_analytics(args.output_dir, args.report, args.csv, args.workers)
+        elif args.batch:
+            success = batch_setup(args.batch, args.output_dir, args.report, args.workers)
+        elif args.update:
+            success = update_configuration()
+        else:
+            success = initial_setup()
+    finally:
+        if args.trace:
+            from setup.tracing import stop_tracing
+            stop_tracing()
     sys.exit(0 if success else 1)
 
 if __name__ == "__main__":
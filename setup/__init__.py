@@ -1,11 +1,33 @@
 """
 Setup package for the Interactive Learning Environment.
 Handles initial configuration, workspace setup, and user assessment.
+
+Modules are imported on first attribute access, so importing the package (or
+one of its submodules) does not pull in questionary, Jinja2 or YAML for
+commands that never use them.
 """
 
-from .assessment import UserAssessment
-from .workspace import WorkspaceManager
-from .lesson_plan import LessonPlanGenerator
-from .prompt_setup import PromptManager
+from importlib import import_module
+
+# Public name -> submodule that defines it
+_EXPORTS = {
+    'UserAssessment': '.assessment',
+    'WorkspaceManager': '.workspace',
+    'LessonPlanGenerator': '.lesson_plan',
+    'PromptManager': '.prompt_setup',
+    'BatchProvisioner': '.batch',
+    'UserProfile': '.profile',
+}
+
+__all__ = ['UserAssessment', 'WorkspaceManager', 'LessonPlanGenerator', 'PromptManager',
+           'BatchProvisioner', 'UserProfile']
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        value = getattr(import_module(_EXPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-__all__ = ['UserAssessment', 'WorkspaceManager', 'LessonPlanGenerator', 'PromptManager'] 
\ No newline at end of file
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -3,22 +3,17 @@ User assessment module for collecting initial preferences and skill levels.
 """
 
 import logging
-import questionary
-from typing import Dict, List
+from typing import Dict, List, Union
 from pathlib import Path
 
+from .profile import PACES, PRACTICE_FREQUENCIES, SKILL_LEVELS, THEMES, UserProfile
+
 class UserAssessment:
     """Handles user assessment and preference collection."""
 
-    THEMES = [
-        "Space Exploration 🚀",
-        "Fantasy Quest 🗡️",
-        "Robotics Lab 🤖",
-        "Nature Discovery 🌿",
-        "Ocean Adventure 🌊"
-    ]
+    THEMES = list(THEMES)
 
-    SKILL_LEVELS = ["Beginner", "Intermediate", "Advanced"]
+    SKILL_LEVELS = list(SKILL_LEVELS)
 
     def __init__(self):
         self.logger = logging.getLogger(__name__)
@@ -66,6 +61,7 @@ class UserAssessment:
 
     def _get_skill_level(self, default: str = None) -> str:
         """Get user's skill level."""
+        import questionary  # deferred: only interactive runs need it
         return questionary.select(
             "Select your programming skill level:",
             choices=self.SKILL_LEVELS,
@@ -74,6 +70,7 @@ class UserAssessment:
 
     def _get_theme(self, default: str = None) -> str:
         """Get user's preferred learning theme."""
+        import questionary
         return questionary.select(
             "Choose a learning theme:",
             choices=self.THEMES,
@@ -82,6 +79,7 @@ class UserAssessment:
 
     def _get_interests(self, default: List[str] = None) -> List[str]:
         """Get user's programming interests."""
+        import questionary
         interests = questionary.text(
             "Enter your programming interests (comma-separated):",
             default=",".join(default) if default else ""
@@ -90,6 +88,7 @@ class UserAssessment:
 
     def _get_goals(self, default: str = None) -> str:
         """Get user's learning goals."""
+        import questionary
         return questionary.text(
             "Describe your learning goals:",
             default=default or ""
@@ -99,15 +98,16 @@ class UserAssessment:
         """Get user's learning preferences."""
         default = default or {}
         
+        import questionary
         pace = questionary.select(
             "Select your preferred learning pace:",
-            choices=["Quick", "Standard", "Thorough"],
+            choices=list(PACES),
             default=default.get("pace", "Standard")
         ).ask()
 
         practice_frequency = questionary.select(
             "How often would you like practice exercises?",
-            choices=["After each concept", "End of each lesson", "Custom schedule"],
+            choices=list(PRACTICE_FREQUENCIES),
             default=default.get("practice_frequency", "After each concept")
         ).ask()
 
@@ -118,30 +118,41 @@ class UserAssessment:
             "notifications_enabled": default.get("notifications_enabled", True)
         }
 
-    def validate_assessment(self, data: Dict) -> bool:
-        """Validate assessment data.
+    def build_profile(self, data: Union[Dict, UserProfile]) -> UserProfile:
+        """Validate assessment data into a UserProfile.
+
+        The rules are those of UserProfile.from_dict, so interactive setup,
+        batch provisioning and validate_assessment accept the same records.
 
         Args:
-            data: Assessment data to validate
+            data: Assessment data (a UserProfile is returned unchanged)
 
         Returns:
-            True if valid, False otherwise
+            The validated profile
+
+        Raises:
+            ValueError: If a required field is missing or a value is invalid
         """
-        try:
-            required_fields = ["skill_level", "theme", "interests", "goals", "preferences"]
-            if not all(field in data for field in required_fields):
-                self.logger.error("Missing required fields in assessment data")
-                return False
+        if isinstance(data, UserProfile):
+            return data
+        return UserProfile.from_dict(data)
 
-            if data["skill_level"] not in self.SKILL_LEVELS:
-                self.logger.error(f"Invalid skill level: {data['skill_level']}")
-                return False
+    def validate_assessment(self, data: Union[Dict, UserProfile]) -> bool:
+        """Validate assessment data.
 
-            if data["theme"] not in self.THEMES:
-                self.logger.error(f"Invalid theme: {data['theme']}")
-                return False
+        Args:
+            data: Assessment data to validate (a UserProfile was validated
+                when it was built)
 
+        Returns:
+            True if valid, False otherwise
+        """
+        try:
+            self.build_profile(data)
             return True
+        except ValueError as e:
+            self.logger.error(f"Invalid assessment data: {str(e)}")
+            return False
         except Exception as e:
             self.logger.error(f"Error validating assessment data: {str(e)}")
-            return False 
\ No newline at end of file
+            return False
@@ -0,0 +1,254 @@
+"""
+Batch provisioning module for onboarding a cohort of students in one run.
+"""
+
+import json
+import logging
+import re
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple
+
+from .assessment import UserAssessment
+from .workspace import WorkspaceManager
+from .lesson_plan import LessonPlanGenerator
+from .profile import UserProfile
+from .prompt_setup import PromptManager
+from .tracing import span
+from config.config_manager import ConfigManager
+
+class BatchProvisioner:
+    """Provisions student environments from pre-filled assessment records."""
+
+    def __init__(self,
+                 output_dir: str = "students",
+                 template_file: str = "LESSON_PLAN_TEMPLATE.md",
+                 output_file: str = "LESSON_PLAN_CUSTOM.md",
+                 prompt_file: str = "ai_agents/prompts/learning_assistant.md",
+                 template_dir: str = "docs",
+                 workers: int = 1):
+        """Initialize batch provisioner.
+
+        Args:
+            output_dir: Directory under which one workspace per student is created
+            template_file: Name of the lesson plan template
+            output_file: File name of the generated lesson plan in each workspace
+            prompt_file: Path to the base Learning Assistant prompt
+            template_dir: Directory containing lesson plan templates
+            workers: Processes used to render lesson plans (1 renders inline)
+        """
+        self.logger = logging.getLogger(__name__)
+        self.output_dir = Path(output_dir)
+        self.template_file = template_file
+        self.output_file = output_file
+        self.workers = workers
+
+        # Shared across all records so templates and prompts are loaded once
+        self.assessment = UserAssessment()
+        self.lesson_gen = LessonPlanGenerator(template_dir=template_dir)
+        self.prompt_mgr = PromptManager(prompt_file=prompt_file)
+
+    def read_records(self, answers_file: str) -> Iterator[Tuple[int, Optional[Dict], Optional[str]]]:
+        """Stream assessment records from a JSON-lines file.
+
+        Args:
+            answers_file: Path to a file with one JSON assessment record per line
+
+        Yields:
+            Tuples of (line number, record or None, parse error or None)
+        """
+        with open(answers_file, 'r', encoding='utf-8') as f:
+            for line_no, line in enumerate(f, start=1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError as e:
+                    yield line_no, None, f"Invalid JSON: {str(e)}"
+                    continue
+                if not isinstance(record, dict):
+                    yield line_no, None, "Record is not a JSON object"
+                    continue
+                yield line_no, record, None
+
+    def student_id(self, record: Dict, line_no: int) -> str:
+        """Derive a filesystem-safe workspace name for a record."""
+        raw = str(record.get("id") or record.get("name") or f"student_{line_no}")
+        slug = re.sub(r"[^A-Za-z0-9_.-]+", "_", raw).strip("._")
+        return slug or f"student_{line_no}"
+
+    def provision(self, record: Dict, line_no: int, render_plan: bool = True) -> Dict:
+        """Provision a single student workspace.
+
+        Args:
+            record: Assessment record
+            line_no: Line number of the record in the answers file
+            render_plan: Whether to render the lesson plan inline
+
+        Returns:
+            Per-record result with status and error message (if any)
+        """
+        return self._provision_record(record, line_no, render_plan)[0]
+
+    def _provision_record(self, record: Dict, line_no: int,
+                          render_plan: bool) -> Tuple[Dict, Optional[UserProfile]]:
+        """Provision one record, returning its result and validated profile."""
+        student = self.student_id(record, line_no)
+        result = {"line": line_no, "student": student, "status": "failed", "error": None}
+        with span("provision", record_io=True, student=student, line=line_no) as s:
+            profile = self._provision(record, student, result, render_plan)
+            s.set(status=result["status"])
+        return result, profile
+
+    def _provision(self, record: Dict, student: str, result: Dict,
+                   render_plan: bool) -> Optional[UserProfile]:
+        """Run the provisioning stages for one record, filling in result.
+
+        The record is validated once into a UserProfile, which every later
+        stage (and parallel plan rendering) receives instead of the dict.
+
+        Returns:
+            The profile if the record was provisioned, None otherwise
+        """
+        try:
+            with span("validate"):
+                try:
+                    profile = self.assessment.build_profile(record)
+                except ValueError as e:
+                    self.logger.error(f"Invalid assessment data for {student}: {str(e)}")
+                    result["error"] = f"Invalid assessment data: {str(e)}"
+                    return None
+
+            student_dir = self.output_dir / student
+            student_dir.mkdir(parents=True, exist_ok=True)
+
+            # Initialize student configuration
+            with span("config_init", record_io=True):
+                config = ConfigManager(str(student_dir))
+                config.initialize_student(
+                    name=profile.name or "Student",
+                    skill_level=profile.skill_level,
+                    profile=profile
+                )
+
+            # Configure workspace
+            prompt_dir = student_dir / "prompts"
+            prompt_path = prompt_dir / self.prompt_mgr.prompt_file.name
+            with span("workspace", record_io=True):
+                workspace = WorkspaceManager(cursor_config_dir=str(student_dir / ".cursor"))
+                configured = workspace.configure_workspace(str(prompt_path))
+            if not configured:
+                result["error"] = "Failed to configure workspace"
+                return None
+
+            # Generate lesson plan
+            if render_plan:
+                plan_path = student_dir / self.output_file
+                with span("plan_generation", record_io=True) as s:
+                    generated = self.lesson_gen.generate_plan(
+                        self.template_file, str(plan_path), profile)
+                    s.set(status=generated)
+                if not generated:
+                    result["error"] = "Failed to generate lesson plan"
+                    return None
+
+            # Write the customized agent prompt bundle
+            with span("prompt_customisation", record_io=True):
+                bundle = self.prompt_mgr.customize_all(profile, str(prompt_dir))
+            if not bundle:
+                result["error"] = "Failed to setup agent prompts"
+                return None
+
+            result["status"] = "ok"
+            return profile
+
+        except Exception as e:
+            result["error"] = str(e)
+            return None
+
+    def run(self, answers_file: str, report_file: Optional[str] = None) -> Dict:
+        """Provision every record in an answers file.
+
+        Records that map to a workspace already used earlier in the file
+        (the same id, or the same name when there is no id) are reported as
+        failed rather than overwriting that workspace. With more than one
+        worker, results are held until the lesson plans are rendered and then
+        reported in line order.
+
+        Args:
+            answers_file: Path to a JSON-lines file of assessment records
+            report_file: Optional path for a JSON-lines per-record report
+
+        Returns:
+            Summary with total, succeeded and failed counts
+        """
+        summary = {"total": 0, "succeeded": 0, "failed": 0}
+        parallel_plans = self.workers > 1
+        pending = []  # (result, profile) pairs awaiting parallel plan rendering
+        held = []  # results held back so a parallel run still reports in line order
+        claimed: Dict[str, int] = {}  # workspace name -> line that first used it
+        report = open(report_file, 'w', encoding='utf-8') if report_file else None
+        try:
+            for line_no, record, error in self.read_records(answers_file):
+                student = None
+                if record is not None:
+                    student = self.student_id(record, line_no)
+                    if student in claimed:
+                        error = f"Duplicate student {student} (first used on line {claimed[student]})"
+                        record = None
+                    else:
+                        claimed[student] = line_no
+
+                if record is None:
+                    result = {"line": line_no, "student": student, "status": "failed", "error": error}
+                else:
+                    result, profile = self._provision_record(
+                        record, line_no, render_plan=not parallel_plans)
+                    if parallel_plans and result["status"] == "ok":
+                        pending.append((result, profile))
+                if parallel_plans:
+                    held.append(result)
+                else:
+                    self._record_result(result, summary, report)
+
+            if pending:
+                with span("plan_generation", record_io=True,
+                          students=len(pending), workers=self.workers) as s:
+                    plan_results = self.lesson_gen.generate_plans(
+                        [(result["student"], profile) for result, profile in pending],
+                        str(self.output_dir),
+                        template_file=self.template_file,
+                        output_name=self.output_file,
+                        workers=self.workers
+                    )
+                    # bytes_written only counts this process; add what the workers wrote
+                    worker_bytes = [plan["bytes_written"] for plan in plan_results]
+                    if worker_bytes and None not in worker_bytes:
+                        s.set(worker_bytes_written=sum(worker_bytes))
+                for (result, _), plan in zip(pending, plan_results):
+                    if not plan["success"]:
+                        result["status"] = "failed"
+                        result["error"] = plan["error"]
+            for result in sorted(held, key=lambda r: r["line"]):
+                self._record_result(result, summary, report)
+        finally:
+            if report:
+                report.close()
+
+        self.logger.info(
+            f"Batch provisioning finished: {summary['succeeded']}/{summary['total']} succeeded, "
+            f"{summary['failed']} failed"
+        )
+        return summary
+
+    def _record_result(self, result: Dict, summary: Dict, report) -> None:
+        """Count a per-record result and append it to the report."""
+        summary["total"] += 1
+        if result["status"] == "ok":
+            summary["succeeded"] += 1
+        else:
+            summary["failed"] += 1
+            self.logger.error(f"Line {result['line']} ({result['student']}): {result['error']}")
+
+        if report:
+            report.write(json.dumps(result) + "\n")
@@ -0,0 +1,363 @@
+"""
+Long-running tutor daemon serving configuration, progress and prompt requests.
+
+Slash-command integrations otherwise start a fresh interpreter, import the
+setup and config packages and re-read every file for each request. The daemon
+keeps student configurations (in a ConfigManagerPool), compiled templates and
+compiled prompts warm in memory and answers newline-delimited JSON requests on
+a Unix socket (or a localhost TCP port where Unix sockets are unavailable).
+
+Protocol (one JSON object per line in each direction):
+    {"id": 1, "method": "get_setting", "params": {"student": "ada", "path": "editor.tab_size"}}
+    {"id": 1, "result": 4}
+
+Methods: ping, get_setting, get_preference, update_progress,
+recommended_topics, customize_prompt, generate_plan and stats. Each request for
+a student holds that student's lock and keeps their manager pinned in the pool
+until it finishes, so requests for one student run one at a time and eviction
+never replaces a manager that is still in use. Reads of pooled students are
+answered on the event loop; loading a student from disk and writes run in a
+thread pool. Only students already provisioned under the output directory are
+served; requests for any other id fail without creating files.
+
+Usage:
+    python init.py --serve /tmp/tutor.sock --output-dir students
+"""
+
+import asyncio
+import errno
+import inspect
+import json
+import logging
+import math
+import os
+import socket
+import stat
+import time
+import weakref
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+
+from config.config_manager import DEFAULT_SETTINGS_PATH, load_shared_settings
+from config.pool import ConfigManagerPool, validate_student_id
+from .lesson_plan import LessonPlanGenerator
+from .prompt_setup import list_prompt_files, load_compiled_prompt, prompt_values
+
+# Latency histogram buckets: upper bounds in microseconds, doubling from 8 us
+_BUCKET_BOUNDS_US = [8 * 2 ** i for i in range(22)]  # up to ~16.8 s
+
+class LatencyHistogram:
+    """Log-scale histogram of request latencies."""
+
+    def __init__(self):
+        self.counts = [0] * (len(_BUCKET_BOUNDS_US) + 1)
+        self.count = 0
+        self.total_us = 0.0
+        self.max_us = 0.0
+
+    def record(self, latency_us: float) -> None:
+        """Add one observation."""
+        index = 0 if latency_us <= _BUCKET_BOUNDS_US[0] else \
+            min(math.ceil(math.log2(latency_us / _BUCKET_BOUNDS_US[0])), len(_BUCKET_BOUNDS_US))
+        self.counts[index] += 1
+        self.count += 1
+        self.total_us += latency_us
+        self.max_us = max(self.max_us, latency_us)
+
+    def percentile(self, pct: float) -> float:
+        """Upper bound of the bucket holding the given percentile."""
+        if not self.count:
+            return 0.0
+        target = math.ceil(self.count * pct / 100)
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                bound = _BUCKET_BOUNDS_US[index] if index < len(_BUCKET_BOUNDS_US) else self.max_us
+                return min(bound, self.max_us)
+        return self.max_us
+
+    def as_dict(self) -> Dict:
+        return {
+            "count": self.count,
+            "mean_us": self.total_us / self.count if self.count else 0.0,
+            "p50_us": self.percentile(50),
+            "p90_us": self.percentile(90),
+            "p99_us": self.percentile(99),
+            "max_us": self.max_us,
+            "buckets": {
+                f"le_{bound}us": count
+                for bound, count in zip(_BUCKET_BOUNDS_US, self.counts) if count
+            }
+        }
+
+class RequestError(Exception):
+    """A request that cannot be served; reported back to the client."""
+
+def remove_stale_socket(path: Path) -> None:
+    """Remove a Unix socket left behind by a daemon that is no longer running.
+
+    Raises:
+        FileExistsError: If path exists and is not a socket
+        OSError: If a daemon is still accepting connections on the socket
+    """
+    try:
+        mode = os.lstat(path).st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise FileExistsError(errno.EEXIST, "Not a socket, refusing to replace it", str(path))
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(str(path))
+    except ConnectionRefusedError:
+        path.unlink(missing_ok=True)
+        return
+    except FileNotFoundError:
+        return
+    finally:
+        probe.close()
+    raise OSError(errno.EADDRINUSE, "A daemon is already listening on this socket", str(path))
+
+class TutorDaemon:
+    """Serves tutor requests from warm in-memory state."""
+
+    def __init__(self,
+                 output_dir: str = "students",
+                 template_dir: str = "docs",
+                 template_file: str = "LESSON_PLAN_TEMPLATE.md",
+                 output_file: str = "LESSON_PLAN_CUSTOM.md",
+                 prompt_dir: str = "ai_agents/prompts",
+                 max_managers: int = 1024,
+                 workers: Optional[int] = None):
+        """Initialize the daemon.
+
+        Args:
+            output_dir: Directory with one workspace per student (as created by --batch)
+            template_dir: Directory containing lesson plan templates
+            template_file: Name of the lesson plan template
+            output_file: File name of each student's generated plan
+            prompt_dir: Directory holding the agent prompts
+            max_managers: Student configurations kept in memory
+            workers: Threads used for writes (defaults to the asyncio default)
+        """
+        self.logger = logging.getLogger(__name__)
+        self.output_dir = Path(output_dir)
+        self.template_file = template_file
+        self.output_file = output_file
+        self.prompt_dir = Path(prompt_dir)
+        self.workers = workers
+        # Only students provisioned on disk are served; unknown ids create nothing
+        self.pool = ConfigManagerPool(output_dir, max_managers=max_managers, create_missing=False)
+        self.lesson_gen = LessonPlanGenerator(template_dir=template_dir)
+        self.histograms: Dict[str, LatencyHistogram] = {}
+        self.started = time.time()
+
+        # Held only by requests in progress, so idle students' locks are dropped
+        self._student_locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = \
+            weakref.WeakValueDictionary()
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._methods: Dict[str, Callable] = {
+            "ping": self._ping,
+            "get_setting": self._get_setting,
+            "get_preference": self._get_preference,
+            "update_progress": self._update_progress,
+            "recommended_topics": self._recommended_topics,
+            "customize_prompt": self._customize_prompt,
+            "generate_plan": self._generate_plan,
+            "stats": self._stats
+        }
+        self._signatures = {name: inspect.signature(handler) for name, handler in self._methods.items()}
+
+    async def start(self, socket_path: Optional[str] = None,
+                    host: str = "127.0.0.1", port: Optional[int] = None) -> None:
+        """Start listening on a Unix socket, or on host:port if no path is given."""
+        # Warm the lesson plan template and prompt bundle before the first request
+        self.lesson_gen._load_template(self.template_file)
+        for path in list_prompt_files(self.prompt_dir):
+            load_compiled_prompt(path)
+
+        if self.workers:
+            from concurrent.futures import ThreadPoolExecutor
+            asyncio.get_running_loop().set_default_executor(
+                ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="tutor")
+            )
+        if socket_path:
+            remove_stale_socket(Path(socket_path))
+            self._server = await asyncio.start_unix_server(self._handle_client, path=socket_path)
+            self.logger.info(f"Tutor daemon listening on {socket_path}")
+        else:
+            self._server = await asyncio.start_server(self._handle_client, host, port or 0)
+            address = self._server.sockets[0].getsockname()
+            self.logger.info(f"Tutor daemon listening on {address[0]}:{address[1]}")
+
+    async def serve_forever(self) -> None:
+        """Serve until cancelled, then flush every pooled student."""
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.stop()
+
+    async def stop(self) -> None:
+        """Stop listening and persist pending student changes."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        self.pool.clear()
+
+    async def handle_request(self, request: Dict) -> Dict:
+        """Dispatch one decoded request and record its latency.
+
+        Returns:
+            Response with the request id and either result or error
+        """
+        start = time.perf_counter_ns()
+        method = request.get("method") if isinstance(request, dict) else None
+        response: Dict[str, Any] = {"id": request.get("id") if isinstance(request, dict) else None}
+        try:
+            handler = self._methods.get(method)
+            if handler is None:
+                raise RequestError(f"Unknown method: {method}")
+            params = request.get("params") or {}
+            if not isinstance(params, dict):
+                raise RequestError("params must be an object")
+            try:
+                self._signatures[method].bind(**params)
+            except TypeError as e:
+                raise RequestError(f"Invalid parameters: {str(e)}")
+            response["result"] = await handler(**params)
+        except RequestError as e:
+            response["error"] = str(e)
+        except Exception as e:
+            self.logger.exception(f"Error handling {method}: {str(e)}")
+            response["error"] = f"Internal error: {str(e)}"
+        latency_us = (time.perf_counter_ns() - start) / 1000
+        self.histograms.setdefault(str(method), LatencyHistogram()).record(latency_us)
+        return response
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve requests from one connection until it closes."""
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                except json.JSONDecodeError as e:
+                    response = {"id": None, "error": f"Invalid JSON: {str(e)}"}
+                else:
+                    response = await self.handle_request(request)
+                writer.write(json.dumps(response, default=str).encode("utf-8") + b"\n")
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    def _student_lock(self, student: str) -> asyncio.Lock:
+        lock = self._student_locks.get(student)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._student_locks[student] = lock
+        return lock
+
+    @asynccontextmanager
+    async def _student(self, student: str) -> AsyncIterator[Any]:
+        """Hold a student's lock and pooled manager for the rest of a request."""
+        if not isinstance(student, str):
+            raise RequestError("student must be a string")
+        try:
+            validate_student_id(student)  # before the id becomes a lock key
+        except ValueError as e:
+            raise RequestError(str(e))
+
+        async with self._student_lock(student):
+            config = self.pool.acquire(student, load=False)
+            if config is None:
+                # A miss reads the student's YAML and JSON files
+                try:
+                    config = await self._in_thread(self.pool.acquire, student)
+                except FileNotFoundError:
+                    raise RequestError(f"Unknown student: {student}")
+            try:
+                yield config
+            finally:
+                self.pool.release(student)
+
+    async def _in_thread(self, func: Callable, *args: Any) -> Any:
+        """Run a blocking call off the event loop."""
+        return await asyncio.get_running_loop().run_in_executor(None, func, *args)
+
+    async def _ping(self) -> str:
+        return "pong"
+
+    async def _get_setting(self, path: str, student: Optional[str] = None, default: Any = None) -> Any:
+        if student is None:
+            _, index = load_shared_settings(DEFAULT_SETTINGS_PATH)
+            return index.get(path, default)
+        async with self._student(student) as config:
+            return config.get_setting(path, default)
+
+    async def _get_preference(self, student: str, path: str = "", default: Any = None) -> Any:
+        async with self._student(student) as config:
+            return config.get_student_preference(path, default)
+
+    async def _update_progress(self, student: str, event: str, value: Any = None) -> Dict:
+        async with self._student(student) as config:
+            await self._in_thread(config.update_progress, event, value)
+            return dict(config.progress.get("practice_stats", {}))
+
+    async def _recommended_topics(self, student: str, limit: int = 3) -> List[str]:
+        async with self._student(student) as config:
+            return config.recommended_topics(limit)
+
+    async def _customize_prompt(self, student: str, prompt: str = "learning_assistant.md") -> str:
+        path = self.prompt_dir / prompt
+        if path not in list_prompt_files(self.prompt_dir):
+            raise RequestError(f"Unknown prompt: {prompt}")
+        async with self._student(student) as config:
+            return load_compiled_prompt(path).render(prompt_values(config.student_config))
+
+    async def _generate_plan(self, student: str, force: bool = False) -> Dict:
+        async with self._student(student) as config:
+            output = config.config_dir / self.output_file
+            status = await self._in_thread(
+                self.lesson_gen.generate_plan,
+                self.template_file, str(output), config.student_config, force
+            )
+        if status is None:
+            raise RequestError("Failed to generate lesson plan")
+        return {"output": str(output), "status": status}
+
+    async def _stats(self) -> Dict:
+        return {
+            "uptime_s": time.time() - self.started,
+            "pool": self.pool.stats(),
+            "latency": {name: h.as_dict() for name, h in sorted(self.histograms.items())}
+        }
+
+def serve(address: str, **options: Any) -> None:
+    """Run a daemon until interrupted.
+
+    Args:
+        address: Unix socket path, or HOST:PORT for localhost TCP
+        **options: Passed to TutorDaemon
+    """
+    daemon = TutorDaemon(**options)
+    host, _, port = address.rpartition(":")
+    tcp = bool(host) and port.isdigit() and "/" not in address
+
+    async def main() -> None:
+        if tcp:
+            await daemon.start(host=host, port=int(port))
+        else:
+            await daemon.start(socket_path=address)
+        await daemon.serve_forever()
+
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,70 @@
+"""
+Minimal client for the tutor daemon.
+
+Only imports json and socket, so a slash-command integration starts quickly
+and leaves configuration parsing, templates and prompts to the daemon.
+
+Usage:
+    from setup.daemon_client import TutorClient
+    with TutorClient("/tmp/tutor.sock") as client:
+        tab_size = client.call("get_setting", student="ada", path="editor.tab_size")
+"""
+
+import json
+import socket
+from typing import Any, Optional
+
+class DaemonError(Exception):
+    """Error returned by the daemon for a request."""
+
+class TutorClient:
+    """Sends newline-delimited JSON requests over one persistent connection."""
+
+    def __init__(self, address: str, timeout: Optional[float] = 10.0):
+        """Connect to a daemon.
+
+        Args:
+            address: Unix socket path, or HOST:PORT for localhost TCP
+            timeout: Socket timeout in seconds
+        """
+        host, _, port = address.rpartition(":")
+        if host and port.isdigit() and "/" not in address:
+            self.sock = socket.create_connection((host, int(port)), timeout=timeout)
+        else:
+            self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.sock.settimeout(timeout)
+            self.sock.connect(address)
+        self._reader = self.sock.makefile('rb')
+        self._next_id = 1
+
+    def call(self, method: str, **params: Any) -> Any:
+        """Send one request and wait for its response.
+
+        Returns:
+            The result of the request
+
+        Raises:
+            DaemonError: If the daemon reports an error
+            ConnectionError: If the daemon closed the connection
+        """
+        request_id = self._next_id
+        self._next_id += 1
+        payload = {"id": request_id, "method": method, "params": params}
+        self.sock.sendall(json.dumps(payload).encode("utf-8") + b"\n")
+        line = self._reader.readline()
+        if not line:
+            raise ConnectionError("Tutor daemon closed the connection")
+        response = json.loads(line)
+        if "error" in response:
+            raise DaemonError(response["error"])
+        return response.get("result")
+
+    def close(self) -> None:
+        self._reader.close()
+        self.sock.close()
+
+    def __enter__(self) -> "TutorClient":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
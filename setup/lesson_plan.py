@@ -2,37 +2,152 @@
 Lesson plan generation module for creating personalized learning paths.
 """
 
+import hashlib
+import json
 import logging
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Optional
-from jinja2 import Environment, FileSystemLoader, Template
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+import jinja2
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, Template
+
+from config.fileio import atomic_open, atomic_write_text, ensure_private_dir, user_cache_dir
+from .profile import UserData, UserProfile
+from .tracing import bytes_written
+from .validation import LESSON_PLAN_VALIDATOR
+
+# Default location of the on-disk compiled template cache. Cached bytecode is
+# executed when loaded, so the directory must be private to the current user.
+BYTECODE_CACHE_DIR = str(user_cache_dir("jinja"))
+
+# Rendered output is written and validated in blocks of roughly this many characters
+STREAM_BLOCK_CHARS = 64 * 1024
+
+# Appended to a stored plan fingerprint when the plan passed validation
+VALIDATED_MARK = "validated"
+
+class TemplateBytecodeCache(FileSystemBytecodeCache):
+    """Bytecode cache keyed by template path, modification time and Jinja2 version."""
+
+    def get_cache_key(self, name: str, filename: Optional[str] = None) -> str:
+        mtime = os.stat(filename).st_mtime_ns if filename else 0
+        key = f"{name}|{filename}|{mtime}|{jinja2.__version__}"
+        return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+@lru_cache(maxsize=16)
+def _get_environment(template_dir: str, cache_dir: Optional[str]) -> Environment:
+    """Return the Jinja2 environment shared by all generators for a template directory.
+    
+    The environment keeps its own LRU of compiled templates (reloaded when the
+    source mtime changes), so templates are compiled at most once per process,
+    and not at all when a matching bytecode cache entry exists on disk.
+    """
+    bytecode_cache = None
+    if cache_dir:
+        if ensure_private_dir(Path(cache_dir)):
+            bytecode_cache = TemplateBytecodeCache(cache_dir)
+        else:
+            logging.getLogger(__name__).warning(
+                f"Not using template cache {cache_dir}: not a private directory"
+            )
+    return Environment(loader=FileSystemLoader(template_dir), bytecode_cache=bytecode_cache)
+
+# Source digest of each loaded template as (mtime, size, digest), keyed by
+# filename so an edited template replaces its entry instead of adding one
+_template_digests: Dict[str, Tuple[int, int, str]] = {}
+
+def _template_digest(template: Template) -> str:
+    """Return the SHA-256 of a template's source, re-hashed only when it changes."""
+    stat = os.stat(template.filename)
+    cached = _template_digests.get(template.filename)
+    if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+        return cached[2]
+    digest = hashlib.sha256(Path(template.filename).read_bytes()).hexdigest()
+    _template_digests[template.filename] = (stat.st_mtime_ns, stat.st_size, digest)
+    return digest
+
+def _blocks(chunks: Iterable[str], block_chars: int = STREAM_BLOCK_CHARS) -> Iterator[str]:
+    """Join the many small chunks of Template.generate() into larger blocks."""
+    pending, size = [], 0
+    for chunk in chunks:
+        pending.append(chunk)
+        size += len(chunk)
+        if size >= block_chars:
+            yield "".join(pending)
+            pending, size = [], 0
+    if pending:
+        yield "".join(pending)
+
+class PlanValidationError(Exception):
+    """Raised while streaming a plan that fails validation."""
+
+# Per-worker state for generate_plans, populated once by _init_plan_worker
+_worker_generator = None
+_worker_template = None
+
+def _init_plan_worker(template_dir: str, cache_dir: Optional[str], template_file: str) -> None:
+    """Load and compile the lesson plan template once per worker process."""
+    global _worker_generator, _worker_template
+    _worker_generator = LessonPlanGenerator(template_dir=template_dir, cache_dir=cache_dir)
+    _worker_template = _worker_generator._load_template(template_file)
+
+def _render_plan_chunk(chunk: List[Tuple[str, Dict, str]]) -> List[Dict]:
+    """Render and write a chunk of lesson plans inside a worker process.
+
+    The parent's I/O counters do not see what workers write, so each result
+    carries the bytes its worker wrote for it (workers are single-threaded).
+    """
+    results = []
+    for student, user_data, output_file in chunk:
+        before = bytes_written()
+        result = _worker_generator._write_plan_result(_worker_template, student, user_data, output_file)
+        after = bytes_written()
+        if before is not None and after is not None:
+            result["bytes_written"] = after - before
+        results.append(result)
+    return results
 
 class LessonPlanGenerator:
     """Generates personalized lesson plans based on user preferences."""
 
-    def __init__(self, template_dir: str = "docs"):
+    def __init__(self, template_dir: str = "docs", cache_dir: Optional[str] = BYTECODE_CACHE_DIR):
         """Initialize lesson plan generator.
         
         Args:
             template_dir: Directory containing lesson plan templates
+            cache_dir: Directory for compiled template bytecode (None disables it)
         """
         self.logger = logging.getLogger(__name__)
         self.template_dir = Path(template_dir)
-        self.env = Environment(loader=FileSystemLoader(template_dir))
+        self.cache_dir = cache_dir
+        self.env = _get_environment(str(self.template_dir), cache_dir)
 
     def generate_plan(self, 
                      template_file: str,
                      output_file: str,
-                     user_data: Dict) -> bool:
+                     user_data: UserData,
+                     force: bool = False,
+                     validate: bool = False) -> Optional[str]:
         """Generate a personalized lesson plan.
         
+        Rendering is skipped when the existing plan was produced from the same
+        template and render inputs (see _plan_fingerprint). Otherwise the plan
+        is streamed block by block into a temporary file that replaces the
+        output only once rendering (and validation) succeeded.
+        
         Args:
             template_file: Name of the template file
             output_file: Path to save the generated plan
             user_data: User preferences and assessment data
+            force: Regenerate even if the plan is unchanged
+            validate: Check the streamed plan with the validate_lesson_plan rules
             
         Returns:
-            True if generation successful, False otherwise
+            "written" or "unchanged" on success (as reported by generate_plans),
+            None otherwise
         """
         try:
             self.logger.info(f"Generating lesson plan from template: {template_file}")
@@ -40,25 +155,187 @@ class LessonPlanGenerator:
             # Load and validate template
             template = self._load_template(template_file)
             if not template:
-                return False
-                
-            # Generate content
-            content = self._render_template(template, user_data)
-            if not content:
-                return False
+                return None
                 
-            # Save generated plan
-            output_path = Path(output_file)
-            output_path.parent.mkdir(exist_ok=True)
-            output_path.write_text(content)
-            
-            self.logger.info(f"Lesson plan generated at {output_file}")
-            return True
+            return self._write_plan(template, output_file, user_data, force, validate)
             
         except Exception as e:
             self.logger.error(f"Error generating lesson plan: {str(e)}")
+            return None
+
+    def generate_plans(self,
+                       records: Iterable[Tuple[str, UserData]],
+                       output_dir: str,
+                       template_file: str = "LESSON_PLAN_TEMPLATE.md",
+                       output_name: str = "LESSON_PLAN_CUSTOM.md",
+                       workers: Optional[int] = None,
+                       chunksize: Optional[int] = None) -> List[Dict]:
+        """Generate lesson plans for a cohort using a pool of worker processes.
+        
+        Each worker compiles the template once; records are sent in chunks and
+        rendered plans are written by the workers themselves.
+        
+        Args:
+            records: Iterable of (student_id, user_data) pairs
+            output_dir: Directory receiving one sub-directory per student
+            template_file: Name of the template file
+            output_name: File name of each generated plan
+            workers: Number of worker processes (defaults to the CPU count)
+            chunksize: Records per task (defaults to ~4 tasks per worker)
+            
+        Returns:
+            Per-student results in input order, each with student, output,
+            success, status ("written" or "unchanged"), error and
+            bytes_written (measured in worker processes only, else None) keys
+        """
+        jobs = [
+            (student, user_data, str(Path(output_dir) / student / output_name))
+            for student, user_data in records
+        ]
+        if not jobs:
+            return []
+            
+        workers = max(1, min(workers or os.cpu_count() or 1, len(jobs)))
+        chunksize = chunksize or max(1, math.ceil(len(jobs) / (workers * 4)))
+        chunks = [jobs[i:i + chunksize] for i in range(0, len(jobs), chunksize)]
+        self.logger.info(
+            f"Generating {len(jobs)} lesson plans with {workers} workers "
+            f"in {len(chunks)} chunks"
+        )
+        
+        if workers == 1:
+            template = self._load_template(template_file)
+            return [
+                self._write_plan_result(template, student, user_data, output_file)
+                for student, user_data, output_file in jobs
+            ]
+            
+        results = []
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_plan_worker,
+            initargs=(str(self.template_dir), self.cache_dir, template_file)
+        ) as executor:
+            for chunk_results in executor.map(_render_plan_chunk, chunks):
+                results.extend(chunk_results)
+        return results
+
+    def _write_plan(self,
+                    template: Template,
+                    output_file: str,
+                    user_data: UserData,
+                    force: bool = False,
+                    validate: bool = False) -> Optional[str]:
+        """Render a loaded template and save the generated plan.
+        
+        Args:
+            template: Loaded template
+            output_file: Path to save the generated plan
+            user_data: User preferences and assessment data
+            force: Regenerate even if the plan is unchanged
+            validate: Check the streamed plan with the validate_lesson_plan rules
+            
+        Returns:
+            "written" or "unchanged" on success, None otherwise
+        """
+        output_path = Path(output_file)
+        fingerprint_path = self._fingerprint_path(output_path)
+        fingerprint = self._plan_fingerprint(template, user_data)
+        
+        # Skip rendering when the stored fingerprint still matches. A plan
+        # written without validation is rendered again when validation is asked for.
+        if not force and output_path.exists():
+            try:
+                stored = fingerprint_path.read_text().split()
+            except FileNotFoundError:
+                stored = []
+            if stored[:1] == [fingerprint] and (not validate or VALIDATED_MARK in stored[1:]):
+                self.logger.info(f"Lesson plan unchanged at {output_file}")
+                return "unchanged"
+        
+        # Stream generated content into place
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        if not self._stream_plan(template, output_path, user_data, validate):
+            return None
+        atomic_write_text(
+            fingerprint_path,
+            f"{fingerprint} {VALIDATED_MARK}" if validate else fingerprint,
+            fsync=False
+        )
+        
+        self.logger.info(f"Lesson plan generated at {output_file}")
+        return "written"
+
+    def _stream_plan(self,
+                     template: Template,
+                     output_path: Path,
+                     user_data: UserData,
+                     validate: bool) -> bool:
+        """Render a template straight into an atomically replaced file.
+        
+        Args:
+            template: Loaded template
+            output_path: Path to save the generated plan
+            user_data: User data for template rendering
+            validate: Validate each block as it is written
+            
+        Returns:
+            True if the plan was written, False if rendering or validation
+            failed (the previous plan, if any, is left in place)
+        """
+        scanner = LESSON_PLAN_VALIDATOR.scanner() if validate else None
+        try:
+            # Plans are reproducible from their inputs, so skip the fsync
+            with atomic_open(output_path, fsync=False) as f:
+                chunks = template.generate(**self._render_context(user_data))
+                for block in _blocks(chunks):
+                    f.write(block)
+                    if scanner:
+                        scanner.feed(block)
+                if scanner:
+                    report = scanner.report()
+                    if not report.ok:
+                        raise PlanValidationError("; ".join(report.errors()))
+            return True
+        except PlanValidationError as e:
+            self.logger.error(f"Generated lesson plan failed validation: {str(e)}")
+            return False
+        except Exception as e:
+            self.logger.error(f"Error rendering template: {str(e)}")
             return False
 
+    def _plan_fingerprint(self, template: Template, user_data: UserData) -> str:
+        """Fingerprint the render inputs together with the template source."""
+        context = json.dumps(self._render_context(user_data), sort_keys=True, default=str)
+        payload = f"{_template_digest(template)}\n{context}"
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _fingerprint_path(output_path: Path) -> Path:
+        """Location of the fingerprint stored alongside a generated plan."""
+        return output_path.with_name(f".{output_path.name}.fingerprint")
+
+    def _write_plan_result(self,
+                           template: Optional[Template],
+                           student: str,
+                           user_data: UserData,
+                           output_file: str) -> Dict:
+        """Write one plan and describe the outcome for generate_plans."""
+        result = {"student": student, "output": output_file, "success": False,
+                  "status": None, "error": None, "bytes_written": None}
+        try:
+            if template is None:
+                result["error"] = "Failed to load template"
+                return result
+            result["status"] = self._write_plan(template, output_file, user_data)
+            if result["status"] is None:
+                result["error"] = "Failed to render template"
+            else:
+                result["success"] = True
+        except Exception as e:
+            result["error"] = str(e)
+        return result
+
     def _load_template(self, template_file: str) -> Optional[Template]:
         """Load a template file.
         
@@ -74,7 +351,7 @@ class LessonPlanGenerator:
             self.logger.error(f"Error loading template {template_file}: {str(e)}")
             return None
 
-    def _render_template(self, template: Template, user_data: Dict) -> Optional[str]:
+    def _render_template(self, template: Template, user_data: UserData) -> Optional[str]:
         """Render a template with user data.
         
         Args:
@@ -85,18 +362,30 @@ class LessonPlanGenerator:
             Rendered content or None if error
         """
         try:
-            return template.render(
-                student_name=user_data.get("name", "Student"),
-                skill_level=user_data.get("skill_level", "beginner"),
-                theme=user_data.get("theme", "General"),
-                interests=user_data.get("interests", []),
-                pace=user_data.get("preferences", {}).get("pace", "Standard")
-            )
+            return template.render(**self._render_context(user_data))
         except Exception as e:
             self.logger.error(f"Error rendering template: {str(e)}")
             return None
 
-    def customize_lessons(self, user_data: Dict) -> Dict:
+    def _render_context(self, user_data: UserData) -> Dict:
+        """Build the template variables derived from user data."""
+        if isinstance(user_data, UserProfile):
+            return {
+                "student_name": user_data.name or "Student",
+                "skill_level": user_data.skill_level,
+                "theme": user_data.theme,
+                "interests": list(user_data.interests),
+                "pace": user_data.pace
+            }
+        return {
+            "student_name": user_data.get("name", "Student"),
+            "skill_level": user_data.get("skill_level", "beginner"),
+            "theme": user_data.get("theme", "General"),
+            "interests": user_data.get("interests", []),
+            "pace": user_data.get("preferences", {}).get("pace", "Standard")
+        }
+
+    def customize_lessons(self, user_data: UserData) -> Dict:
         """Customize lesson content based on user preferences.
         
         Args:
@@ -105,9 +394,14 @@ class LessonPlanGenerator:
         Returns:
             Dictionary of customized lesson parameters
         """
-        skill_level = user_data.get("skill_level", "beginner").lower()
-        theme = user_data.get("theme", "General")
-        pace = user_data.get("preferences", {}).get("pace", "Standard").lower()
+        if isinstance(user_data, UserProfile):
+            skill_level = user_data.skill_level.lower()
+            theme = user_data.theme
+            pace = user_data.pace.lower()
+        else:
+            skill_level = user_data.get("skill_level", "beginner").lower()
+            theme = user_data.get("theme", "General")
+            pace = user_data.get("preferences", {}).get("pace", "Standard").lower()
         
         # Adjust content based on skill level
         content_depth = {
@@ -152,23 +446,9 @@ class LessonPlanGenerator:
             True if content is valid, False otherwise
         """
         try:
-            # Check for required sections
-            required_sections = [
-                "# Learning Objectives",
-                "## Prerequisites",
-                "## Content",
-                "## Exercises",
-                "## Additional Resources"
-            ]
-            
-            for section in required_sections:
-                if section not in content:
-                    self.logger.error(f"Missing required section: {section}")
-                    return False
-            
-            # Check minimum content length
-            if len(content.split('\n')) < 20:
-                self.logger.error("Lesson plan content is too short")
+            report = LESSON_PLAN_VALIDATOR.check(content)
+            if not report.ok:
+                self.logger.error(report.errors()[0])
                 return False
             
             return True
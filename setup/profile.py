@@ -0,0 +1,203 @@
+"""
+Compact, immutable user profile passed through the setup pipeline.
+
+Assessment answers arrive as nested dictionaries, and every stage used to
+re-read them with chained .get() calls and defaults. A UserProfile is
+validated and defaulted once when it is built. It stores its fields in
+__slots__, and its enum-like values (skill level, theme, pace, practice
+frequency) are the shared constant strings below rather than per-record
+copies, so large batches hold far less memory.
+
+UserAssessment.validate_assessment, ConfigManager.initialize_student,
+LessonPlanGenerator.generate_plan/customize_lessons and
+PromptManager.customize_prompt/customize_all accept either form.
+
+Usage:
+    from setup.profile import UserProfile
+    profile = UserProfile.from_dict(record)  # raises ValueError if invalid
+    data = profile.to_dict()                 # the original dictionary format
+"""
+
+import sys
+from typing import Any, Dict, Iterable, Optional, Tuple, Union
+
+SKILL_LEVELS = ("Beginner", "Intermediate", "Advanced")
+
+THEMES = (
+    "Space Exploration 🚀",
+    "Fantasy Quest 🗡️",
+    "Robotics Lab 🤖",
+    "Nature Discovery 🌿",
+    "Ocean Adventure 🌊"
+)
+
+PACES = ("Quick", "Standard", "Thorough")
+
+PRACTICE_FREQUENCIES = ("After each concept", "End of each lesson", "Custom schedule")
+
+# Fields validate_assessment has always required in the dictionary format
+REQUIRED_FIELDS = ("skill_level", "theme", "interests", "goals", "preferences")
+
+# Known values map to the module constants, so profiles share one string each
+_CANONICAL = {value: value for value in SKILL_LEVELS + THEMES + PACES + PRACTICE_FREQUENCIES}
+
+def _intern(value: str) -> str:
+    return _CANONICAL.get(value) or sys.intern(value)
+
+def _text(field: str, value: Any) -> str:
+    if not isinstance(value, str):
+        raise ValueError(f"{field} must be a string, got {type(value).__name__}")
+    return value
+
+class UserProfile:
+    """Validated assessment results for one student."""
+
+    __slots__ = ("name", "skill_level", "theme", "interests", "goals",
+                 "pace", "practice_frequency", "show_hints", "notifications_enabled")
+
+    def __init__(self,
+                 skill_level: str,
+                 theme: str,
+                 interests: Iterable[str] = (),
+                 goals: str = "",
+                 pace: str = "Standard",
+                 practice_frequency: str = "After each concept",
+                 show_hints: bool = True,
+                 notifications_enabled: bool = True,
+                 name: Optional[str] = None):
+        """Validate and store a profile.
+
+        Args:
+            skill_level: One of SKILL_LEVELS
+            theme: One of THEMES
+            interests: Programming interests
+            goals: Free-text learning goals
+            pace: Preferred learning pace (usually one of PACES)
+            practice_frequency: How often to offer practice exercises
+            show_hints: Whether hints are shown
+            notifications_enabled: Whether notifications are enabled
+            name: Student display name
+
+        Raises:
+            ValueError: If a value is missing, of the wrong type or not allowed
+        """
+        if skill_level not in SKILL_LEVELS:
+            raise ValueError(f"Invalid skill level: {skill_level}")
+        if theme not in THEMES:
+            raise ValueError(f"Invalid theme: {theme}")
+        if isinstance(interests, str):
+            raise ValueError("interests must be a list of strings")
+        goals = goals or ""
+        for field, value in (("goals", goals), ("pace", pace),
+                             ("practice_frequency", practice_frequency)):
+            if not isinstance(value, str):
+                raise ValueError(f"{field} must be a string, got {type(value).__name__}")
+        if name is not None and not isinstance(name, str):
+            raise ValueError(f"name must be a string, got {type(name).__name__}")
+        interests = tuple(_intern(_text("interests", interest)) for interest in interests or ())
+
+        set_field = object.__setattr__
+        set_field(self, "name", name)
+        set_field(self, "skill_level", _CANONICAL[skill_level])
+        set_field(self, "theme", _CANONICAL[theme])
+        set_field(self, "interests", interests)
+        set_field(self, "goals", goals)
+        set_field(self, "pace", _intern(pace))
+        set_field(self, "practice_frequency", _intern(practice_frequency))
+        set_field(self, "show_hints", bool(show_hints))
+        set_field(self, "notifications_enabled", bool(notifications_enabled))
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "UserProfile":
+        """Build a profile from the dictionary returned by assess_new_user().
+
+        Keys other than the assessment fields and "name" (such as a batch
+        record's "id") are not kept.
+
+        Raises:
+            ValueError: If a required field is missing or a value is invalid
+        """
+        if not isinstance(data, dict):
+            raise ValueError("Profile data must be a dictionary")
+        missing = [field for field in REQUIRED_FIELDS if field not in data]
+        if missing:
+            raise ValueError(f"Missing required fields: {', '.join(missing)}")
+        preferences = data["preferences"]
+        if not isinstance(preferences, dict):
+            raise ValueError("preferences must be a dictionary")
+        return cls(
+            skill_level=data["skill_level"],
+            theme=data["theme"],
+            interests=data["interests"],
+            goals=data["goals"],
+            pace=preferences.get("pace", "Standard"),
+            practice_frequency=preferences.get("practice_frequency", "After each concept"),
+            show_hints=preferences.get("show_hints", True),
+            notifications_enabled=preferences.get("notifications_enabled", True),
+            name=data.get("name")
+        )
+
+    def to_dict(self) -> Dict:
+        """Return the profile in the dictionary format used by assess_new_user()."""
+        data = {
+            "skill_level": self.skill_level,
+            "theme": self.theme,
+            "interests": list(self.interests),
+            "goals": self.goals,
+            "preferences": {
+                "pace": self.pace,
+                "practice_frequency": self.practice_frequency,
+                "show_hints": self.show_hints,
+                "notifications_enabled": self.notifications_enabled
+            }
+        }
+        if self.name is not None:
+            data["name"] = self.name
+        return data
+
+    def replace(self, **changes: Any) -> "UserProfile":
+        """Return a copy with some fields changed (validated again)."""
+        fields = {field: getattr(self, field) for field in self.__slots__}
+        fields.update(changes)
+        return UserProfile(**fields)
+
+    def _values(self) -> Tuple:
+        return tuple(getattr(self, field) for field in self.__slots__)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("UserProfile is immutable; use replace()")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError("UserProfile is immutable")
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, UserProfile):
+            return NotImplemented
+        return self._values() == other._values()
+
+    def __hash__(self) -> int:
+        return hash(self._values())
+
+    def __repr__(self) -> str:
+        return (f"UserProfile(name={self.name!r}, skill_level={self.skill_level!r}, "
+                f"theme={self.theme!r}, pace={self.pace!r})")
+
+    def __reduce__(self):
+        # Worker processes receive profiles without validating them again
+        return _restore_profile, self._values()
+
+# Fields whose values are shared constants or interned strings
+_INTERNED_FIELDS = frozenset(("skill_level", "theme", "pace", "practice_frequency"))
+
+# Either form of user data accepted by the setup managers
+UserData = Union[Dict, UserProfile]
+
+def _restore_profile(*values: Any) -> UserProfile:
+    profile = object.__new__(UserProfile)
+    for field, value in zip(UserProfile.__slots__, values):
+        if field in _INTERNED_FIELDS:
+            value = _intern(value)
+        elif field == "interests":
+            value = tuple(_intern(interest) for interest in value)
+        object.__setattr__(profile, field, value)
+    return profile
@@ -3,21 +3,146 @@ Prompt management module for handling Learning Assistant prompts.
 """
 
 import logging
-import webbrowser
+import os
+import re
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Tuple
+
+from config.fileio import atomic_write_text
+from .profile import UserData, UserProfile
+from .status import file_status
+from .validation import PROMPT_VALIDATOR
+
+# Placeholders look like {{SKILL_LEVEL}}
+PLACEHOLDER_PATTERN = re.compile(r"\{\{([A-Z][A-Z0-9_]*)\}\}")
+
+class CompiledPrompt:
+    """A prompt tokenised once into literal and placeholder segments."""
+
+    __slots__ = ("segments", "slots", "_always_valid")
+
+    def __init__(self, text: str):
+        """Tokenise prompt text.
+        
+        Args:
+            text: Raw prompt content containing {{PLACEHOLDER}} markers
+        """
+        self.segments: List[str] = []
+        self.slots: List[Tuple[int, str]] = []
+        position = 0
+        for match in PLACEHOLDER_PATTERN.finditer(text):
+            self.segments.append(text[position:match.start()])
+            self.slots.append((len(self.segments), match.group(1)))
+            self.segments.append(match.group(0))
+            position = match.end()
+        self.segments.append(text[position:])
+        self._always_valid: Optional[bool] = None
+
+    @property
+    def placeholders(self) -> List[str]:
+        """Names of the placeholders in document order."""
+        return [name for _, name in self.slots]
+
+    def always_valid(self) -> bool:
+        """Whether every rendering of this prompt passes PROMPT_VALIDATOR.
+        
+        Literal segments survive rendering unchanged and substitution only adds
+        text, so if the literals alone (joined with a separator that cannot be
+        part of a heading) contain every required section and enough lines,
+        any rendered prompt does too. Checked once per compiled prompt.
+        """
+        if self._always_valid is None:
+            literals = "\0".join(self.segments[0::2])
+            self._always_valid = PROMPT_VALIDATOR.check(literals).ok
+        return self._always_valid
+
+    def render(self, values: Dict[str, str]) -> str:
+        """Substitute placeholders in a single join; unknown ones are kept verbatim."""
+        segments = self.segments.copy()
+        for index, name in self.slots:
+            value = values.get(name)
+            if value is not None:
+                segments[index] = value
+        return "".join(segments)
+
+# Compiled prompts keyed by path, invalidated when mtime or size changes
+_compiled_prompts: Dict[str, Tuple[Tuple[int, int], CompiledPrompt]] = {}
+
+def load_compiled_prompt(path: Path) -> CompiledPrompt:
+    """Return the compiled form of a prompt file, re-reading it only when it changes.
+    
+    Raises:
+        FileNotFoundError: If the prompt file does not exist
+    """
+    stat = os.stat(path)
+    signature = (stat.st_mtime_ns, stat.st_size)
+    key = str(path)
+    cached = _compiled_prompts.get(key)
+    if cached and cached[0] == signature:
+        return cached[1]
+    compiled = CompiledPrompt(Path(path).read_text())
+    _compiled_prompts[key] = (signature, compiled)
+    return compiled
+
+# Prompt directory listings keyed by path, invalidated when the directory mtime changes
+_prompt_listings: Dict[str, Tuple[int, List[Path]]] = {}
+
+def list_prompt_files(prompt_dir: Path) -> List[Path]:
+    """Return the markdown prompts in a directory, re-listing it only when it changes."""
+    mtime = os.stat(prompt_dir).st_mtime_ns
+    key = str(prompt_dir)
+    cached = _prompt_listings.get(key)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    paths = sorted(Path(prompt_dir).glob("*.md"))
+    _prompt_listings[key] = (mtime, paths)
+    return paths
+
+def prompt_values(user_data: UserData) -> Dict[str, str]:
+    """Build the placeholder vocabulary for a user profile.
+    
+    Every profile field becomes an upper-case placeholder, with nested keys
+    joined by underscores (e.g. preferences.pace -> PREFERENCES_PACE) and
+    lists joined with commas. The original SKILL_LEVEL, THEME and
+    LEARNING_PACE placeholders keep their defaults.
+    """
+    if isinstance(user_data, UserProfile):
+        user_data = user_data.to_dict()
+    values = {
+        "SKILL_LEVEL": "beginner",
+        "THEME": "General",
+        "LEARNING_PACE": user_data.get("preferences", {}).get("pace", "Standard")
+    }
+    
+    def flatten(data: Dict, prefix: str) -> None:
+        for key, value in data.items():
+            name = f"{prefix}{str(key).upper()}"
+            if isinstance(value, dict):
+                flatten(value, f"{name}_")
+            elif isinstance(value, (list, tuple)):
+                values[name] = ", ".join(str(item) for item in value)
+            elif value is not None:
+                values[name] = str(value)
+    
+    flatten(user_data, "")
+    return values
 
 class PromptManager:
     """Manages Learning Assistant prompts and setup."""
 
-    def __init__(self, prompt_file: str = "ai_agents/prompts/learning_assistant.md"):
+    def __init__(self,
+                 prompt_file: str = "ai_agents/prompts/learning_assistant.md",
+                 prompt_dir: Optional[str] = None):
         """Initialize prompt manager.
         
         Args:
             prompt_file: Path to the Learning Assistant prompt file
+            prompt_dir: Directory holding all agent prompts (defaults to the
+                directory of prompt_file)
         """
         self.logger = logging.getLogger(__name__)
         self.prompt_file = Path(prompt_file)
+        self.prompt_dir = Path(prompt_dir) if prompt_dir else self.prompt_file.parent
 
     def display_prompt(self) -> Optional[str]:
         """Display the Learning Assistant prompt.
@@ -53,6 +178,8 @@ class PromptManager:
                 self.logger.error(f"Prompt file not found: {self.prompt_file}")
                 return False
                 
+            import webbrowser
+            
             prompt_path = self.prompt_file.resolve()
             webbrowser.open(f"file://{prompt_path}")
             return True
@@ -61,7 +188,7 @@ class PromptManager:
             self.logger.error(f"Error opening prompt in browser: {str(e)}")
             return False
 
-    def customize_prompt(self, user_data: Dict) -> Optional[str]:
+    def customize_prompt(self, user_data: UserData) -> Optional[str]:
         """Customize the Learning Assistant prompt based on user preferences.
         
         Args:
@@ -71,27 +198,60 @@ class PromptManager:
             Customized prompt content if successful, None otherwise
         """
         try:
-            if not self.prompt_file.exists():
+            # Load base prompt (tokenised once per file version)
+            try:
+                compiled = load_compiled_prompt(self.prompt_file)
+            except FileNotFoundError:
                 self.logger.error(f"Prompt file not found: {self.prompt_file}")
                 return None
-                
-            # Load base prompt
-            content = self.prompt_file.read_text()
             
             # Customize based on user preferences
-            replacements = {
-                "{{SKILL_LEVEL}}": user_data.get("skill_level", "beginner"),
-                "{{THEME}}": user_data.get("theme", "General"),
-                "{{LEARNING_PACE}}": user_data.get("preferences", {}).get("pace", "Standard")
-            }
+            return compiled.render(prompt_values(user_data))
+            
+        except Exception as e:
+            self.logger.error(f"Error customizing prompt: {str(e)}")
+            return None
+
+    def customize_all(self,
+                      user_data: UserData,
+                      output_dir: Optional[str] = None) -> Optional[Dict[str, str]]:
+        """Customize every agent prompt in the prompt directory for one student.
+        
+        Args:
+            user_data: User preferences and assessment data
+            output_dir: Directory to write the customized prompt bundle to
             
-            for key, value in replacements.items():
-                content = content.replace(key, value)
+        Returns:
+            Mapping of prompt file name to customized content, None if any
+            prompt is missing or fails validation
+        """
+        try:
+            values = prompt_values(user_data)
+            bundle = {}
+            for path in list_prompt_files(self.prompt_dir):
+                compiled = load_compiled_prompt(path)
+                content = compiled.render(values)
+                if not compiled.always_valid() and not self.validate_prompt(content):
+                    self.logger.error(f"Customized prompt failed validation: {path.name}")
+                    return None
+                bundle[path.name] = content
                 
-            return content
+            if not bundle:
+                self.logger.error(f"No prompts found in {self.prompt_dir}")
+                return None
+                
+            if output_dir:
+                output_path = Path(output_dir)
+                output_path.mkdir(parents=True, exist_ok=True)
+                # Readers (the daemon, --status) see whole prompts only; like
+                # lesson plans they are reproducible, so the fsync is skipped
+                for name, content in bundle.items():
+                    atomic_write_text(output_path / name, content, fsync=False)
+                    
+            return bundle
             
         except Exception as e:
-            self.logger.error(f"Error customizing prompt: {str(e)}")
+            self.logger.error(f"Error customizing prompts: {str(e)}")
             return None
 
     def _display_setup_instructions(self) -> None:
@@ -114,23 +274,9 @@ class PromptManager:
             True if content is valid, False otherwise
         """
         try:
-            # Check for required sections
-            required_sections = [
-                "## Purpose",
-                "## Usage",
-                "## Parameters",
-                "## Example Interactions",
-                "## Response Format"
-            ]
-            
-            for section in required_sections:
-                if section not in content:
-                    self.logger.error(f"Missing required section: {section}")
-                    return False
-            
-            # Check minimum content length
-            if len(content.split('\n')) < 50:
-                self.logger.error("Prompt content is too short")
+            report = PROMPT_VALIDATOR.check(content)
+            if not report.ok:
+                self.logger.error(report.errors()[0])
                 return False
             
             return True
@@ -145,9 +291,4 @@ class PromptManager:
         Returns:
             Dictionary containing prompt status information
         """
-        return {
-            "exists": self.prompt_file.exists(),
-            "path": str(self.prompt_file),
-            "size": self.prompt_file.stat().st_size if self.prompt_file.exists() else 0,
-            "last_modified": self.prompt_file.stat().st_mtime if self.prompt_file.exists() else None
-        } 
\ No newline at end of file
+        return file_status(self.prompt_file) 
\ No newline at end of file
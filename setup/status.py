@@ -0,0 +1,108 @@
+"""
+Read-only status reporting for the learning environment.
+
+Designed to be cheap enough for shell prompts and editor status bars: every
+file is stat'ed exactly once, only progress.json is parsed (with json), and no
+template, YAML or questionary modules are imported. For the same reason this
+module sticks to os.path and builtin annotations instead of pathlib/typing.
+"""
+
+import json
+import os
+
+def file_status(path) -> dict:
+    """Describe a file using a single stat call.
+
+    Args:
+        path: File to describe
+
+    Returns:
+        Dictionary with exists, path, size and last_modified keys
+    """
+    try:
+        stat = os.stat(path)
+    except (FileNotFoundError, NotADirectoryError):
+        return {"exists": False, "path": str(path), "size": 0, "last_modified": None}
+    return {"exists": True, "path": str(path), "size": stat.st_size, "last_modified": stat.st_mtime}
+
+def progress_summary(progress_path: str) -> dict:
+    """Summarise progress.json without loading any configuration modules."""
+    summary = file_status(progress_path)
+    if not summary["exists"]:
+        return summary
+    try:
+        with open(progress_path, 'r', encoding='utf-8') as f:
+            progress = json.load(f)
+    except (OSError, ValueError) as e:
+        summary["error"] = str(e)
+        return summary
+
+    user_progress = progress.get("user_progress", {})
+    stats = progress.get("practice_stats", {})
+    current = user_progress.get("current_lesson", {})
+    summary.update({
+        "current_lesson": current.get("id"),
+        "current_lesson_status": current.get("status"),
+        "completed_lessons": len(user_progress.get("completed_lessons", [])),
+        "exercises_completed": stats.get("exercises_completed", 0),
+        "success_rate": stats.get("success_rate", 0),
+        "current_streak": progress.get("achievements", {}).get("streaks", {}).get("current_streak", 0),
+        "last_updated": progress.get("metadata", {}).get("last_updated")
+    })
+    return summary
+
+def collect_status(cursor_config_dir: str = ".cursor",
+                   prompt_file: str = "ai_agents/prompts/learning_assistant.md",
+                   plan_file: str = "LESSON_PLAN_CUSTOM.md",
+                   config_dir: str = ".") -> dict:
+    """Gather workspace, prompt, lesson plan and progress state.
+
+    Args:
+        cursor_config_dir: Directory for Cursor IDE configuration
+        prompt_file: Path to the Learning Assistant prompt file
+        plan_file: Path to the generated lesson plan
+        config_dir: Directory containing student_config.yaml and progress.json
+
+    Returns:
+        Status dictionary with workspace, prompt, lesson_plan, student_config
+        and progress sections
+    """
+    workspace = file_status(os.path.join(cursor_config_dir, "workspace_config.yaml"))
+    workspace["configured"] = workspace["exists"]
+
+    lesson_plan = file_status(plan_file)
+    plan_dir, plan_name = os.path.split(plan_file)
+    fingerprint = file_status(os.path.join(plan_dir, f".{plan_name}.fingerprint"))
+    lesson_plan["fingerprinted"] = fingerprint["exists"]
+
+    return {
+        "workspace": workspace,
+        "prompt": file_status(prompt_file),
+        "lesson_plan": lesson_plan,
+        "student_config": file_status(os.path.join(config_dir, "student_config.yaml")),
+        "progress": progress_summary(os.path.join(config_dir, "progress.json"))
+    }
+
+def format_status(status: dict) -> str:
+    """Render a status dictionary as short human-readable lines."""
+    def describe(section: dict) -> str:
+        if not section["exists"]:
+            return f"missing ({section['path']})"
+        return f"{section['path']} ({section['size']} bytes)"
+
+    lines = [
+        f"Workspace:      {describe(status['workspace'])}",
+        f"Prompt:         {describe(status['prompt'])}",
+        f"Lesson plan:    {describe(status['lesson_plan'])}",
+        f"Student config: {describe(status['student_config'])}",
+        f"Progress:       {describe(status['progress'])}"
+    ]
+    progress = status["progress"]
+    if progress["exists"] and "error" not in progress:
+        lines.append(
+            f"  Lesson {progress['current_lesson']} ({progress['current_lesson_status']}), "
+            f"{progress['completed_lessons']} completed, "
+            f"{progress['exercises_completed']} exercises, "
+            f"streak {progress['current_streak']}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,231 @@
+"""
+Lightweight span tracing for the setup pipeline.
+
+Spans record wall time and CPU time of the calling thread, and are streamed to
+a trace file either as JSON lines or in Chrome trace-event format (open it in
+chrome://tracing or Perfetto). Spans opened with record_io=True also record the
+bytes the process wrote while they were open; reading the I/O counters costs a
+file read at each end, so other spans skip it and report bytes_written as null.
+The counters are per process: writes made by worker processes are not
+included (batch plan_generation reports them as worker_bytes_written), and
+spans open at the same time on different threads each count both threads'
+writes.
+Tracing is off unless start_tracing() was called; span() then returns a shared
+no-op span, so instrumented code pays almost nothing.
+
+Usage:
+    from setup.tracing import span, start_tracing, stop_tracing
+    start_tracing("trace.json", "chrome")
+    with span("plan_generation", record_io=True, student="ada") as s:
+        s.set(status="written")
+    stop_tracing()
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+TRACE_FORMATS = ("jsonl", "chrome")
+
+# Per-process I/O counters; wchar counts bytes passed to write() calls
+_PROC_IO = "/proc/self/io"
+
+def bytes_written() -> Optional[int]:
+    """Bytes written by this process so far, or None where unsupported."""
+    try:
+        with open(_PROC_IO, 'rb') as f:
+            for line in f:
+                if line.startswith(b"wchar:"):
+                    return int(line.split()[1])
+    except (OSError, ValueError):
+        pass
+    return None
+
+class Span:
+    """An open span; attributes set on it are stored with the record."""
+
+    __slots__ = ("tracer", "name", "attrs", "record_io", "span_id", "parent_id",
+                 "_start_wall", "_start_cpu", "_start_io", "_start_emitted")
+
+    def __init__(self, tracer: "Tracer", name: str, attrs: Dict[str, Any], record_io: bool = False):
+        self.tracer = tracer
+        self.name = name
+        self.attrs = attrs
+        self.record_io = record_io
+        self.span_id = 0
+        self.parent_id = None
+
+    def set(self, **attrs: Any) -> None:
+        """Attach attributes (e.g. status or sizes) to the span."""
+        self.attrs.update(attrs)
+
+    def __enter__(self) -> "Span":
+        self.tracer._open(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        if exc_type is not None:
+            self.attrs["error"] = f"{exc_type.__name__}: {exc}"
+        self.tracer._close(self)
+        return False
+
+class _NullSpan:
+    """Span used while tracing is disabled."""
+
+    __slots__ = ()
+
+    def set(self, **attrs: Any) -> None:
+        pass
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        return False
+
+NULL_SPAN = _NullSpan()
+
+class Tracer:
+    """Streams finished spans to a trace file."""
+
+    def __init__(self, trace_file: str, trace_format: str = "jsonl"):
+        """Initialize the tracer.
+
+        Args:
+            trace_file: Path of the trace file (overwritten)
+            trace_format: "jsonl" for one span per line or "chrome" for a
+                Chrome trace-event array
+
+        Raises:
+            ValueError: If the format is not supported
+        """
+        if trace_format not in TRACE_FORMATS:
+            raise ValueError(f"Unsupported trace format: {trace_format}")
+        self.logger = logging.getLogger(__name__)
+        self.trace_file = trace_file
+        self.trace_format = trace_format
+        self.pid = os.getpid()
+
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._next_id = 1
+        self._origin_ns = time.perf_counter_ns()
+        self._emitted = 0  # bytes this tracer wrote, excluded from span I/O
+        self._first_event = True
+        self._handle = open(trace_file, 'w', encoding='utf-8')
+        if trace_format == "chrome":
+            self._write("[\n")
+
+    def span(self, name: str, record_io: bool = False, **attrs: Any) -> Span:
+        """Create a span to be used as a context manager.
+
+        Args:
+            name: Span name
+            record_io: Record the bytes the process wrote while the span was open
+            **attrs: Attributes stored with the span
+        """
+        return Span(self, name, attrs, record_io)
+
+    def close(self) -> None:
+        """Finish the trace file."""
+        with self._lock:
+            if self._handle is None:
+                return
+            if self.trace_format == "chrome":
+                self._handle.write("\n]\n")
+            self._handle.close()
+            self._handle = None
+
+    def _stack(self) -> List[Span]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _open(self, span: Span) -> None:
+        stack = self._stack()
+        with self._lock:
+            span.span_id = self._next_id
+            self._next_id += 1
+            span._start_emitted = self._emitted
+        span.parent_id = stack[-1].span_id if stack else None
+        stack.append(span)
+        span._start_io = bytes_written() if span.record_io else None
+        span._start_cpu = time.thread_time_ns()
+        span._start_wall = time.perf_counter_ns()
+
+    def _close(self, span: Span) -> None:
+        end_wall = time.perf_counter_ns()
+        end_cpu = time.thread_time_ns()
+        end_io = bytes_written() if span._start_io is not None else None
+        stack = self._stack()
+        if stack and stack[-1] is span:
+            stack.pop()
+
+        with self._lock:
+            if self._handle is None:
+                return  # the tracer was closed while this span was open
+            written = None
+            if span._start_io is not None and end_io is not None:
+                written = max(0, end_io - span._start_io - (self._emitted - span._start_emitted))
+            record = self._format(span, end_wall, end_cpu, written)
+            try:
+                self._write(record)
+            except (OSError, ValueError) as e:
+                self.logger.error(f"Error writing trace event: {str(e)}")
+
+    def _format(self, span: Span, end_wall: int, end_cpu: int, written: Optional[int]) -> str:
+        start_us = (span._start_wall - self._origin_ns) / 1000
+        wall_us = (end_wall - span._start_wall) / 1000
+        cpu_us = (end_cpu - span._start_cpu) / 1000
+        tid = threading.get_ident()
+        if self.trace_format == "chrome":
+            event = {
+                "name": span.name, "cat": "setup", "ph": "X",
+                "ts": start_us, "dur": wall_us, "pid": self.pid, "tid": tid,
+                "args": dict(span.attrs, cpu_us=cpu_us, bytes_written=written,
+                             span_id=span.span_id, parent_id=span.parent_id)
+            }
+            text = json.dumps(event, default=str)
+            if self._first_event:
+                self._first_event = False
+                return text
+            return ",\n" + text
+        record = {
+            "name": span.name, "span_id": span.span_id, "parent_id": span.parent_id,
+            "start_us": start_us, "wall_us": wall_us, "cpu_us": cpu_us,
+            "bytes_written": written, "pid": self.pid, "tid": tid, "attrs": span.attrs
+        }
+        return json.dumps(record, default=str) + "\n"
+
+    def _write(self, text: str) -> None:
+        # Flushed immediately so the bytes land inside the span that emits them
+        self._handle.write(text)
+        self._handle.flush()
+        self._emitted += len(text.encode("utf-8"))
+
+_tracer: Optional[Tracer] = None
+
+def start_tracing(trace_file: str, trace_format: str = "jsonl") -> Tracer:
+    """Enable tracing for the process, replacing any active tracer."""
+    global _tracer
+    stop_tracing()
+    _tracer = Tracer(trace_file, trace_format)
+    return _tracer
+
+def stop_tracing() -> None:
+    """Disable tracing and finish the trace file."""
+    global _tracer
+    if _tracer is not None:
+        _tracer.close()
+        _tracer = None
+
+def span(name: str, record_io: bool = False, **attrs: Any):
+    """Open a span on the active tracer (a no-op span when tracing is off)."""
+    tracer = _tracer
+    if tracer is None:
+        return NULL_SPAN
+    return tracer.span(name, record_io, **attrs)
@@ -0,0 +1,171 @@
+"""
+Single-pass section validation for lesson plans and prompts.
+
+All required headings of a document type are folded into one compiled regular
+expression, so a document (or a stream of blocks) is scanned once no matter
+how many sections are required. Lines are counted with str.count instead of
+splitting the text. The result is a SectionReport listing missing, duplicated
+and out-of-order sections.
+
+Usage:
+    from setup.validation import PROMPT_VALIDATOR
+    report = PROMPT_VALIDATOR.check(content)
+    if not report.ok:
+        print(report.errors())
+"""
+
+import re
+from typing import Dict, List, Sequence
+
+# Headings every generated lesson plan must contain, and its minimum length
+LESSON_PLAN_SECTIONS = [
+    "# Learning Objectives",
+    "## Prerequisites",
+    "## Content",
+    "## Exercises",
+    "## Additional Resources"
+]
+LESSON_PLAN_MIN_LINES = 20
+
+# Headings every agent prompt must contain, and its minimum length
+PROMPT_SECTIONS = [
+    "## Purpose",
+    "## Usage",
+    "## Parameters",
+    "## Example Interactions",
+    "## Response Format"
+]
+PROMPT_MIN_LINES = 50
+
+class SectionReport:
+    """Outcome of validating one document."""
+
+    def __init__(self,
+                 kind: str,
+                 sections: Sequence[str],
+                 positions: Dict[str, List[int]],
+                 line_count: int,
+                 min_lines: int):
+        """Build the report from the offsets at which each section was found.
+
+        Args:
+            kind: Document type used in messages (e.g. "Prompt")
+            sections: Required sections in their expected order
+            positions: Section -> character offsets of its occurrences
+            line_count: Number of lines in the document
+            min_lines: Minimum number of lines required
+        """
+        self.kind = kind
+        self.line_count = line_count
+        self.min_lines = min_lines
+        self.missing = [s for s in sections if not positions.get(s)]
+        self.duplicated = [s for s in sections if len(positions.get(s, ())) > 1]
+
+        # A section is out of order if it first appears before a section that
+        # is required to precede it
+        self.out_of_order = []
+        latest = -1
+        for section in sections:
+            found = positions.get(section)
+            if not found:
+                continue
+            if found[0] < latest:
+                self.out_of_order.append(section)
+            latest = max(latest, found[0])
+
+    @property
+    def too_short(self) -> bool:
+        return self.line_count < self.min_lines
+
+    @property
+    def ok(self) -> bool:
+        """Whether the document passes validation (all sections, long enough)."""
+        return not self.missing and not self.too_short
+
+    def errors(self) -> List[str]:
+        """Messages for the problems that make the document invalid."""
+        errors = [f"Missing required section: {section}" for section in self.missing]
+        if self.too_short:
+            errors.append(f"{self.kind} content is too short")
+        return errors
+
+    def warnings(self) -> List[str]:
+        """Messages for structural issues that do not invalidate the document."""
+        return ([f"Duplicated section: {section}" for section in self.duplicated] +
+                [f"Section out of order: {section}" for section in self.out_of_order])
+
+    def as_dict(self) -> Dict:
+        return {
+            "ok": self.ok,
+            "missing": self.missing,
+            "duplicated": self.duplicated,
+            "out_of_order": self.out_of_order,
+            "line_count": self.line_count
+        }
+
+class SectionScanner:
+    """Incremental scan of one document fed in blocks.
+
+    The last few characters of each block are carried over, so a heading split
+    across two blocks is still matched, and matched only once.
+    """
+
+    def __init__(self, validator: "SectionValidator"):
+        self.validator = validator
+        self.positions: Dict[str, List[int]] = {}
+        self.line_count = 1
+        self._offset = 0  # characters consumed before the current tail
+        self._tail = ""
+
+    def feed(self, text: str) -> "SectionScanner":
+        """Scan the next block of the document."""
+        self.line_count += text.count("\n")
+        window = self._tail + text
+        carried = len(self._tail)
+        for match in self.validator.pattern.finditer(window):
+            # Matches lying entirely in the carried tail were counted last time
+            if match.end() > carried:
+                self.positions.setdefault(match.group(), []).append(self._offset + match.start())
+        keep = self.validator.overlap
+        self._offset += len(window) - min(keep, len(window))
+        self._tail = window[-keep:] if keep else ""
+        return self
+
+    def report(self) -> SectionReport:
+        """Report on everything fed so far."""
+        v = self.validator
+        return SectionReport(v.kind, v.sections, self.positions, self.line_count, v.min_lines)
+
+class SectionValidator:
+    """Validates documents against an ordered list of required sections."""
+
+    def __init__(self, sections: Sequence[str], min_lines: int = 0, kind: str = "Document"):
+        """Compile the matcher for a document type.
+
+        Args:
+            sections: Required section headings, in their expected order
+            min_lines: Minimum number of lines a valid document has
+            kind: Document type used in messages
+        """
+        self.sections = list(sections)
+        self.min_lines = min_lines
+        self.kind = kind
+        # Longest first, so a heading is never cut short by a shorter one it starts with
+        alternatives = sorted(set(self.sections), key=len, reverse=True)
+        self.pattern = re.compile("|".join(re.escape(s) for s in alternatives))
+        self.overlap = max((len(s) for s in self.sections), default=1) - 1
+
+    def scanner(self) -> SectionScanner:
+        """Start an incremental scan for streamed content."""
+        return SectionScanner(self)
+
+    def check(self, text: str) -> SectionReport:
+        """Validate a complete document in one pass."""
+        positions: Dict[str, List[int]] = {}
+        for match in self.pattern.finditer(text):
+            positions.setdefault(match.group(), []).append(match.start())
+        return SectionReport(self.kind, self.sections, positions, text.count("\n") + 1,
+                             self.min_lines)
+
+LESSON_PLAN_VALIDATOR = SectionValidator(LESSON_PLAN_SECTIONS, LESSON_PLAN_MIN_LINES, "Lesson plan")
+PROMPT_VALIDATOR = SectionValidator(PROMPT_SECTIONS, PROMPT_MIN_LINES, "Prompt")
@@ -2,10 +2,41 @@
 Workspace management module for configuring the learning environment.
 """
 
+import errno
 import logging
-import yaml
+import os
+import random
+import time
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, Iterator, Optional
+
+from config.fileio import atomic_write_text, file_signature
+from config.serialization import dump_yaml, load_yaml
+from .status import file_status
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+class WorkspaceConflictError(Exception):
+    """Raised when a workspace update keeps losing to concurrent writers."""
+
+def deep_merge(base: Dict, updates: Dict) -> Dict:
+    """Recursively merge updates into a copy of base.
+    
+    Nested dictionaries are merged key by key; any other value in updates
+    replaces the value in base.
+    """
+    merged = dict(base)
+    for key, value in updates.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = deep_merge(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
 
 class WorkspaceManager:
     """Manages workspace configuration and setup."""
@@ -19,6 +50,7 @@ class WorkspaceManager:
         self.logger = logging.getLogger(__name__)
         self.cursor_config_dir = Path(cursor_config_dir)
         self.workspace_config_file = self.cursor_config_dir / "workspace_config.yaml"
+        self.lock_file = self.cursor_config_dir / "workspace_config.yaml.lock"
 
     def configure_workspace(self, prompt_file: str) -> bool:
         """Configure the workspace for Cursor IDE.
@@ -55,30 +87,41 @@ class WorkspaceManager:
             self.logger.error(f"Error configuring workspace: {str(e)}")
             return False
 
-    def update_workspace_config(self, updates: Dict) -> bool:
+    def update_workspace_config(self, updates: Dict, max_retries: int = 20) -> bool:
         """Update existing workspace configuration.
         
+        Updates are deep-merged into the current configuration and written
+        with an optimistic compare-and-swap: the file's (mtime, size, inode)
+        signature is recorded before reading, and the merged result is only
+        written if the signature is unchanged while holding the lock. A
+        concurrent writer causes a retry rather than a lost update.
+        
         Args:
             updates: Dictionary of configuration updates
+            max_retries: Attempts before giving up on a contended file
             
         Returns:
             True if update successful, False otherwise
         """
         try:
-            current_config = self._load_workspace_config()
-            
-            # Update configuration
-            for key, value in updates.items():
-                if isinstance(value, dict) and key in current_config:
-                    current_config[key].update(value)
-                else:
-                    current_config[key] = value
-            
-            # Save updated configuration
-            self._save_workspace_config(current_config)
+            for attempt in range(max_retries):
+                # Stat before reading so a concurrent replace is always detected
+                version = file_signature(self.workspace_config_file)
+                current_config = self._load_workspace_config()
+                merged = deep_merge(current_config, updates)
+                
+                with self._locked(blocking=False) as acquired:
+                    if acquired and file_signature(self.workspace_config_file) == version:
+                        self._write_workspace_config(merged)
+                        self.logger.info("Workspace configuration updated")
+                        return True
+                
+                # Lost the race: back off briefly and retry against the new version
+                time.sleep(random.uniform(0, 0.005 * (attempt + 1)))
             
-            self.logger.info("Workspace configuration updated")
-            return True
+            raise WorkspaceConflictError(
+                f"Workspace configuration changed concurrently {max_retries} times"
+            )
             
         except Exception as e:
             self.logger.error(f"Error updating workspace configuration: {str(e)}")
@@ -86,15 +129,63 @@ class WorkspaceManager:
 
     def _load_workspace_config(self) -> Dict:
         """Load current workspace configuration."""
-        if not self.workspace_config_file.exists():
+        try:
+            return load_yaml(self.workspace_config_file) or {}
+        except FileNotFoundError:
             return {}
-        with open(self.workspace_config_file, 'r') as f:
-            return yaml.safe_load(f) or {}
 
     def _save_workspace_config(self, config: Dict) -> None:
-        """Save workspace configuration to file."""
-        with open(self.workspace_config_file, 'w') as f:
-            yaml.dump(config, f, default_flow_style=False)
+        """Save workspace configuration to file, replacing it atomically."""
+        with self._locked(blocking=True):
+            self._write_workspace_config(config)
+
+    def _write_workspace_config(self, config: Dict) -> None:
+        """Atomically replace the configuration file (caller holds the lock)."""
+        atomic_write_text(self.workspace_config_file, dump_yaml(config))
+
+    @contextmanager
+    def _locked(self, blocking: bool) -> Iterator[bool]:
+        """Hold the workspace lock file, yielding whether it was acquired.
+
+        With blocking=True this waits until the lock is acquired (or raises),
+        so the yielded value is always True.
+        """
+        self.cursor_config_dir.mkdir(parents=True, exist_ok=True)
+        fd = os.open(str(self.lock_file), os.O_RDWR | os.O_CREAT, 0o644)
+        acquired = False
+        try:
+            if fcntl:
+                flags = fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB
+                try:
+                    fcntl.flock(fd, flags)
+                    acquired = True
+                except BlockingIOError:
+                    pass
+            elif blocking:
+                # LK_LOCK gives up after ~10 attempts one second apart; keep
+                # waiting rather than letting the save go ahead unlocked
+                while not acquired:
+                    try:
+                        msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+                        acquired = True
+                    except OSError as e:
+                        if e.errno not in (errno.EDEADLOCK, errno.EACCES):
+                            raise
+            else:
+                try:
+                    msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+                    acquired = True
+                except OSError:
+                    pass
+            yield acquired
+        finally:
+            if acquired:
+                if fcntl:
+                    fcntl.flock(fd, fcntl.LOCK_UN)
+                else:
+                    os.lseek(fd, 0, os.SEEK_SET)
+                    msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+            os.close(fd)
 
     def validate_workspace(self) -> bool:
         """Validate workspace configuration and structure.
@@ -132,8 +223,9 @@ class WorkspaceManager:
         Returns:
             Dictionary containing workspace status information
         """
+        config_file = file_status(self.workspace_config_file)
         return {
-            "configured": self.workspace_config_file.exists(),
-            "config_dir_exists": self.cursor_config_dir.exists(),
-            "config": self._load_workspace_config()
+            "configured": config_file["exists"],
+            "config_dir_exists": config_file["exists"] or self.cursor_config_dir.exists(),
+            "config": self._load_workspace_config() if config_file["exists"] else {}
         } 
\ No newline at end of file
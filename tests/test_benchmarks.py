@@ -0,0 +1,52 @@
+"""
+Test suite for the benchmark harness.
+"""
+
+import tempfile
+import unittest
+from pathlib import Path
+from benchmarks.runner import (BenchmarkRunner, compare_results, load_results, percentile,
+                               save_results, synthetic_students)
+from setup.assessment import UserAssessment
+
+class TestBenchmarks(unittest.TestCase):
+    """Test cases for the benchmark harness."""
+
+    def test_synthetic_students(self):
+        """Test synthetic cohorts are deterministic and valid."""
+        students = synthetic_students(20, seed=3)
+        self.assertEqual(students, synthetic_students(20, seed=3))
+        assessment = UserAssessment()
+        self.assertTrue(all(assessment.validate_assessment(s) for s in students))
+
+    def test_percentile(self):
+        """Test nearest-rank percentiles."""
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 50), 50)
+        self.assertEqual(percentile(values, 99), 99)
+        self.assertEqual(percentile([7], 90), 7)
+        self.assertEqual(percentile([], 50), 0.0)
+
+    def test_run_and_compare(self):
+        """Test a small run reports every stage and round-trips through JSON."""
+        with tempfile.TemporaryDirectory() as tmp:
+            runner = BenchmarkRunner(sizes=[2], stages=["config.lookup", "prompt.customize"],
+                                     workdir=tmp)
+            results = runner.run()
+            self.assertEqual(
+                [(r["stage"], r["students"]) for r in results["results"]],
+                [("config.lookup", 2), ("prompt.customize", 2)]
+            )
+            entry = results["results"][0]
+            self.assertEqual(entry["timings"]["count"], 2)
+            self.assertGreaterEqual(entry["timings"]["p99_us"], entry["timings"]["p50_us"])
+            self.assertIn("peak_bytes", entry["memory"])
+
+            results_file = Path(tmp) / "results.json"
+            save_results(results, str(results_file))
+            rows = compare_results(load_results(str(results_file)), results)
+            self.assertEqual(len(rows), 2)
+            self.assertEqual(rows[0]["change"], 0.0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,482 @@
+"""
+Test suite for configuration modules.
+"""
+
+import json
+import tempfile
+import threading
+import unittest
+from datetime import date, datetime
+from pathlib import Path
+from config.achievements import AchievementEngine
+from config.analytics import load_cohort
+from config.curriculum import CurriculumGraph
+from config.config_manager import ConfigManager
+from config.event_log import DEFAULT_COMPACT_THRESHOLD
+from config.pool import ConfigManagerPool
+from config.progress_store import SQLiteProgressStore
+from config.serialization import dump_yaml, load_yaml
+
+class TestConfig(unittest.TestCase):
+    """Test cases for configuration modules."""
+
+    def setUp(self):
+        """Set up test environment."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.config_dir = Path(self.tmp.name) / "student"
+
+    def tearDown(self):
+        """Clean up test environment."""
+        self.tmp.cleanup()
+
+    def test_progress_updates(self):
+        """Test progress events are applied and persisted to progress.json."""
+        config = ConfigManager(str(self.config_dir))
+        config.initialize_student("Ada", "Beginner", {"preferences": {"pace": "Quick"}})
+        config.update_progress("lesson_completed", "lesson_0")
+        config.update_progress("exercise_attempted", "ex_1")
+        config.update_progress("exercise_completed", "ex_1")
+
+        progress = json.loads((self.config_dir / "progress.json").read_text())
+        self.assertEqual(progress["user_progress"]["completed_lessons"], ["lesson_0"])
+        self.assertEqual(progress["practice_stats"]["exercises_attempted"], 2)
+        self.assertEqual(progress["practice_stats"]["success_rate"], 0.5)
+        self.assertEqual(len(progress["user_progress"]["lesson_history"]), 3)
+        self.assertEqual(config.get_student_preference("preferences.pace"), "Quick")
+        self.assertTrue(config.get_setting("ai_assistants.specialized_agents.debug.enabled"))
+
+        # Updates publish a new document; a reader's snapshot never changes
+        snapshot, preferences = config.progress, config.student_config
+        config.update_progress("exercise_completed", "ex_2")
+        config.set_student_preference("preferences.pace", "Thorough")
+        self.assertEqual(snapshot["practice_stats"]["exercises_attempted"], 2)
+        self.assertEqual(len(snapshot["user_progress"]["lesson_history"]), 3)
+        self.assertEqual(preferences["preferences"]["pace"], "Quick")
+        self.assertEqual(config.progress["practice_stats"]["exercises_attempted"], 3)
+
+    def test_setting_lookups(self):
+        """Test indexed setting lookups match walking the settings tree."""
+        config = ConfigManager(str(self.config_dir))
+        self.assertIs(config.get_setting(""), config.settings)
+        self.assertEqual(
+            config.get_setting("ai_assistants.specialized_agents.debug"),
+            {"enabled": True, "auto_suggest": True}
+        )
+        self.assertEqual(config.get_setting("editor.tab_size"), 4)
+        self.assertEqual(config.get_setting("editor.tab_size.missing", "x"), "x")
+        self.assertIsNone(config.get_student_preference("preferences.pace"))
+
+    def test_watch_reloads_changed_file(self):
+        """Test the watcher reloads only the changed file and notifies subscribers."""
+        config = ConfigManager(str(self.config_dir))
+        config.initialize_student("Ada", "Beginner")
+        changed = []
+        reloaded = threading.Event()
+
+        def on_change(name, manager):
+            changed.append(name)
+            reloaded.set()
+
+        config.subscribe(on_change)
+        config.watch(interval=0.05)
+        try:
+            # Our own writes are not reported back as changes
+            config.set_student_preference("preferences.pace", "Quick")
+
+            other = ConfigManager(str(self.config_dir))
+            other.set_student_preference("theme", "Ocean Adventure 🌊")
+            self.assertTrue(reloaded.wait(5))
+        finally:
+            config.stop_watching()
+
+        self.assertEqual(changed, ["student_config"])
+        self.assertEqual(config.get_student_preference("theme"), "Ocean Adventure 🌊")
+
+        # A reload waits for an update in progress instead of overwriting it
+        with config._lock:
+            reload = threading.Thread(target=config.reload_file, args=("progress",))
+            reload.start()
+            reload.join(0.1)
+            self.assertTrue(reload.is_alive())
+            config.update_progress("exercise_completed", "ex_1")
+        reload.join()
+        self.assertEqual(config.progress["practice_stats"]["exercises_completed"], 1)
+
+    def test_yaml_parse_cache(self):
+        """Test large YAML files are served from the parse cache until they change."""
+        cache_dir = Path(self.tmp.name) / "cache"
+        settings_file = Path(self.tmp.name) / "settings.yaml"
+        data = {f"section_{i}": {"enabled": True, "value": i} for i in range(200)}
+        settings_file.write_text(dump_yaml(data))
+
+        self.assertEqual(load_yaml(settings_file, cache_dir=str(cache_dir)), data)
+        self.assertEqual(len(list(cache_dir.glob("*.marshal"))), 1)
+        self.assertEqual(cache_dir.stat().st_mode & 0o777, 0o700)
+        self.assertEqual(load_yaml(settings_file, cache_dir=str(cache_dir)), data)
+
+        data["section_0"]["enabled"] = False
+        settings_file.write_text(dump_yaml(data))
+        self.assertEqual(load_yaml(settings_file, cache_dir=str(cache_dir)), data)
+        self.assertEqual(len(list(cache_dir.glob("*.marshal"))), 2)
+
+        # A directory other users can write to is never read from
+        cache_dir.chmod(0o777)
+        self.assertEqual(load_yaml(settings_file, cache_dir=str(cache_dir)), data)
+        self.assertEqual(len(list(cache_dir.glob("*.marshal"))), 2)
+        cache_dir.chmod(0o700)
+
+    def test_batch_coalesces_writes(self):
+        """Test writes inside batch() are flushed once when the batch exits."""
+        config = ConfigManager(str(self.config_dir))
+        config.initialize_student("Ada", "Beginner")
+        progress_file = self.config_dir / "progress.json"
+
+        with config.batch():
+            for i in range(5):
+                config.update_progress("exercise_completed", f"ex_{i}")
+            with config.batch():
+                config.set_student_preference("preferences.pace", "Thorough")
+            on_disk = json.loads(progress_file.read_text())
+            self.assertEqual(on_disk["practice_stats"]["exercises_completed"], 0)
+
+        on_disk = json.loads(progress_file.read_text())
+        self.assertEqual(on_disk["practice_stats"]["exercises_completed"], 5)
+        reloaded = ConfigManager(str(self.config_dir))
+        self.assertEqual(reloaded.get_student_preference("preferences.pace"), "Thorough")
+
+    def test_auto_flush_timer(self):
+        """Test a write deferred by auto_flush_interval is flushed by its timer."""
+        import gc
+        import time
+        import weakref
+        from config.config_manager import _pending_flushes
+
+        config = ConfigManager(str(self.config_dir), auto_flush_interval=0.2)
+        config.initialize_student("Ada", "Beginner")
+        config.flush()
+        progress_file = self.config_dir / "progress.json"
+        config.update_progress("exercise_completed", "ex_1")
+        self.assertEqual(json.loads(progress_file.read_text())["practice_stats"]["exercises_completed"], 0)
+        self.assertIn(config, _pending_flushes)
+
+        deadline = time.monotonic() + 5
+        while config._dirty and time.monotonic() < deadline:
+            time.sleep(0.02)
+        self.assertEqual(json.loads(progress_file.read_text())["practice_stats"]["exercises_completed"], 1)
+        self.assertNotIn(config, _pending_flushes)
+
+        # An explicit flush cancels the timer; nothing else keeps the manager alive
+        config.update_progress("exercise_completed", "ex_2")
+        config.flush()
+        self.assertIsNone(config._flush_timer)
+        ref = weakref.ref(config)
+        del config
+        gc.collect()
+        self.assertIsNone(ref())
+
+    def test_sqlite_backend_migrates_json(self):
+        """Test the SQLite backend imports progress.json and appends events."""
+        config = ConfigManager(str(self.config_dir))
+        config.initialize_student("Ada", "Beginner")
+        config.update_progress("lesson_completed", "lesson_0")
+
+        config = ConfigManager(str(self.config_dir), progress_backend="sqlite")
+        config.update_progress("lesson_completed", "lesson_1")
+        self.assertEqual(
+            config.progress["user_progress"]["completed_lessons"],
+            ["lesson_0", "lesson_1"]
+        )
+
+        store = config.progress_store
+        history = store.lesson_history(config.student_id)
+        self.assertEqual([h["value"] for h in history], ["lesson_1", "lesson_0"])
+        self.assertEqual(store.current_streak(config.student_id), 1)
+
+        # Reloading reads the database rather than migrating again
+        config.reload_configs()
+        self.assertEqual(len(store.lesson_history(config.student_id)), 2)
+
+        # Events only rewrite the aggregate sections they change
+        config.update_progress("exercise_completed", "ex_1")
+        stored = store.load_progress(config.student_id)
+        self.assertEqual(stored["practice_stats"]["exercises_completed"], 1)
+        self.assertEqual(stored, config.progress)
+        store._json_set = False
+        config.update_progress("exercise_completed", "ex_2")
+        self.assertEqual(store.load_progress(config.student_id), config.progress)
+
+        # The store can be used from other threads, and starting over drops old rows
+        worker = threading.Thread(target=config.update_progress, args=("lesson_started", "lesson_2"))
+        worker.start()
+        worker.join()
+        self.assertEqual(len(store.lesson_history(config.student_id)), 5)
+        config.initialize_student("Ada", "Beginner")
+        self.assertEqual(store.lesson_history(config.student_id), [])
+        self.assertEqual(store.load_progress(config.student_id)["practice_stats"]["exercises_completed"], 0)
+
+    def test_sqlite_current_streak(self):
+        """Test streaks stop at the first missing day."""
+        store = SQLiteProgressStore(str(Path(self.tmp.name) / "progress.db"))
+        for day in ("2024-03-01", "2024-03-03", "2024-03-04", "2024-03-04", "2024-03-05"):
+            store.record_event("ada", "lesson_completed", day, f"{day}T10:00:00")
+
+        self.assertEqual(store.current_streak("ada", today=date(2024, 3, 5)), 3)
+        self.assertEqual(store.current_streak("ada", today=date(2024, 3, 6)), 3)
+        self.assertEqual(store.current_streak("ada", today=date(2024, 3, 8)), 0)
+        store.close()
+
+    def test_event_log_backend(self):
+        """Test events are appended to the log and compacted into progress.json."""
+        config = ConfigManager(str(self.config_dir), progress_backend="eventlog")
+        config.initialize_student("Ada", "Beginner")
+        config.event_log.compact_threshold = 400
+        for i in range(10):
+            config.update_progress("exercise_completed", f"ex_{i}")
+        config.event_log.wait()
+        snapshot = json.loads((self.config_dir / "progress.json").read_text())
+        self.assertGreater(snapshot["metadata"]["compacted_through"], 0)
+
+        # Whether the last append rotated the log depends on when compaction
+        # finished, so append once more below the threshold
+        config.event_log.compact_threshold = DEFAULT_COMPACT_THRESHOLD
+        config.update_progress("exercise_completed", "ex_10")
+        self.assertTrue((self.config_dir / "progress.log").exists())
+
+        # A fresh manager rebuilds the same view from snapshot + log
+        reloaded = ConfigManager(str(self.config_dir), progress_backend="eventlog")
+        self.assertEqual(reloaded.progress["practice_stats"]["exercises_completed"], 11)
+        self.assertEqual(
+            reloaded.progress["user_progress"]["lesson_history"],
+            config.progress["user_progress"]["lesson_history"]
+        )
+
+        # A torn final line left by a crash is ignored
+        with open(self.config_dir / "progress.log", "a") as f:
+            f.write('{"seq": 99, "event": "exerc')
+        reloaded.reload_configs()
+        self.assertEqual(reloaded.progress["practice_stats"]["exercises_completed"], 11)
+        reloaded.update_progress("exercise_completed", "ex_11")
+        reloaded.event_log.close()
+        reloaded.reload_configs()
+        self.assertEqual(reloaded.progress["practice_stats"]["exercises_completed"], 12)
+        config.event_log.close()
+
+    def test_manager_pool(self):
+        """Test the pool shares settings, evicts LRU managers and persists on eviction."""
+        pool = ConfigManagerPool(self.tmp.name, max_managers=2)
+        ada = pool.get("ada")
+        ada.initialize_student("Ada", "Beginner")
+        with ada.batch():
+            ada.update_progress("lesson_completed", "lesson_0")
+            self.assertIs(pool.get("ada"), ada)
+            self.assertIs(pool.get("bob").settings, ada.settings)
+            pool.get("cy")  # evicts ada, flushing the open batch's writes
+
+        self.assertNotIn("ada", pool)
+        self.assertEqual(
+            pool.get("ada").progress["user_progress"]["completed_lessons"], ["lesson_0"]
+        )
+        stats = pool.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["evictions"]), (1, 4, 2))
+        self.assertEqual(stats["size"], 2)
+
+        # A byte budget smaller than one manager keeps only the latest
+        small = ConfigManagerPool(self.tmp.name, max_bytes=1)
+        small.get("ada")
+        small.get("bob")
+        self.assertEqual(len(small), 1)
+        self.assertEqual(small.stats()["evictions"], 1)
+        small.clear()
+        self.assertEqual(small.stats()["bytes"], 0)
+
+        # Pinned managers survive loads that would otherwise evict them
+        with pool.checkout("ada") as ada:
+            pool.get("bob")
+            pool.get("cy")
+            self.assertIs(pool.acquire("ada", load=False), ada)
+            pool.release("ada")
+        self.assertIn("ada", pool)
+        self.assertIsNone(pool.acquire("dan", load=False))
+        pool.get("dan")
+        self.assertEqual(len(pool), 2)
+
+        with self.assertRaises(ValueError):
+            pool.get("../escape")
+
+        # Releasing the last pin re-estimates the student's growing state
+        with pool.checkout("dan") as dan:
+            before = pool.stats()["bytes"]
+            with dan.batch():
+                for i in range(200):
+                    dan.update_progress("exercise_completed", f"ex_{i}")
+        self.assertGreater(pool.stats()["bytes"], before)
+
+        # Concurrent lookups of one student load it once, outside the pool lock
+        fresh = ConfigManagerPool(self.tmp.name)
+        barrier = threading.Barrier(8)
+        found = []
+        def lookup():
+            barrier.wait()
+            found.append(fresh.get("eve"))
+        threads = [threading.Thread(target=lookup) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len({id(manager) for manager in found}), 1)
+        self.assertEqual(fresh.stats()["misses"], 1)
+
+    def test_achievement_engine(self):
+        """Test streaks, points and badges are maintained event by event."""
+        engine = AchievementEngine({
+            "points": {"lesson_completed": 100, "exercise_completed": 10, "active_day": 5},
+            "badges": {
+                "first_lesson": {"when": {"lessons_completed": 1}},
+                "three_days": {"when": {"current_streak": 3}},
+                "rich": {"when": {"points": 200}},
+                "broken": {"when": {"no_such_metric": 1}}
+            }
+        })
+        self.assertEqual([r.name for r in engine.rules], ["first_lesson", "three_days", "rich"])
+        # Daily points mean any event can change the points total
+        self.assertEqual([r.name for r in engine.rules_for("exercise_attempted")],
+                         ["three_days", "rich"])
+        self.assertEqual([r.name for r in engine.rules_for("lesson_completed")],
+                         ["first_lesson", "three_days", "rich"])
+
+        progress = {"user_progress": {"completed_lessons": ["lesson_0"]}}
+        self.assertEqual(engine.apply(progress, "lesson_completed", "2024-01-01T10:00:00"),
+                         ["first_lesson"])
+        engine.apply(progress, "exercise_completed", "2024-01-01T11:00:00")
+        engine.apply(progress, "lesson_completed", "2024-01-02T09:00:00", award_points=False)
+        self.assertEqual(engine.apply(progress, "exercise_attempted", "2024-01-03T09:00:00"),
+                         ["three_days"])
+        achievements = progress["achievements"]
+        self.assertEqual(achievements["points"], 100 + 10 + 3 * 5)
+        self.assertEqual(achievements["streaks"], {
+            "current_streak": 3, "longest_streak": 3, "last_activity_date": "2024-01-03"
+        })
+
+        # A gap restarts the current streak; older events do not move it
+        engine.apply(progress, "exercise_attempted", "2024-01-06T09:00:00")
+        engine.apply(progress, "exercise_attempted", "2024-01-04T09:00:00")
+        self.assertEqual(achievements["streaks"]["current_streak"], 1)
+        self.assertEqual(achievements["streaks"]["longest_streak"], 3)
+
+        # Managers apply the rules from settings.yaml for every backend
+        for backend in ("json", "eventlog"):
+            config = ConfigManager(str(Path(self.tmp.name) / backend), progress_backend=backend)
+            config.initialize_student("Ada", "Beginner")
+            self.assertEqual(config.update_progress("lesson_completed", "lesson_0"), ["first_lesson"])
+            self.assertEqual(config.update_progress("lesson_completed", "lesson_0"), [])
+            self.assertEqual(config.progress["achievements"]["points"], 105)
+            config.reload_configs()
+            self.assertEqual(config.progress["achievements"]["badges"], ["first_lesson"])
+            self.assertEqual(config.progress["achievements"]["streaks"]["current_streak"], 1)
+            if config.event_log:
+                config.event_log.close()
+
+    def test_curriculum_recommendations(self):
+        """Test the prerequisite graph and the incrementally updated frontier."""
+        plan = Path(self.tmp.name) / "plan.md"
+        plan.write_text(
+            "## Lesson 0: Basics\n### Day 1: Start\n1. Shell\n   - cd, ls\n2. Editor\n"
+            "### Day 2-3: More\n1. Scripts\n"
+            "## Lesson 1: Python\n### Day 1: Intro\n1. Variables\n"
+            "## Lesson 2: Testing\n**Prerequisites:** Lesson 0\n### Week 1: Tests\n1. Unit tests\n"
+            "### Checkpoints\n1. Not a topic\n## References\n1. Not a topic either\n"
+        )
+        graph = CurriculumGraph.from_markdown(plan.read_text())
+        self.assertEqual(graph.ids, ["lesson_0.shell", "lesson_0.editor", "lesson_0.scripts",
+                                     "lesson_1.variables", "lesson_2.unit_tests"])
+        self.assertEqual(graph.prerequisites("lesson_0.scripts"), ["lesson_0.shell", "lesson_0.editor"])
+        self.assertEqual(graph.dependents("lesson_0.scripts"),
+                         ["lesson_1.variables", "lesson_2.unit_tests"])
+        self.assertEqual(graph.estimated_days[0], 0.5)
+        self.assertEqual(graph.estimated_days[4], 7)
+
+        path = graph.learning_path(["lesson_0.shell"])
+        self.assertEqual(path.recommended(), ["lesson_0.editor"])
+        self.assertTrue(path.complete("lesson_0.editor"))
+        self.assertFalse(path.complete("lesson_0.editor"))
+        self.assertEqual(path.recommended(), ["lesson_0.scripts"])
+        path.complete_lesson("lesson_0")
+        self.assertEqual(path.recommended(), ["lesson_1.variables", "lesson_2.unit_tests"])
+
+        config = ConfigManager(str(self.config_dir), curriculum_path=str(plan))
+        config.initialize_student("Ada", "Beginner")
+        self.assertEqual(config.recommended_topics(), ["lesson_0.shell", "lesson_0.editor"])
+        config.update_progress("topic_completed", "lesson_0.shell")
+        config.update_progress("topic_completed", "lesson_0.editor")
+        self.assertEqual(config.progress["learning_path"]["next_recommended"], ["lesson_0.scripts"])
+        config.update_progress("lesson_completed", "lesson_0")
+        reloaded = ConfigManager(str(self.config_dir), curriculum_path=str(plan))
+        self.assertEqual(reloaded.progress["learning_path"]["next_recommended"],
+                         ["lesson_1.variables", "lesson_2.unit_tests"])
+        self.assertEqual(reloaded.recommended_topics(limit=1), ["lesson_1.variables"])
+
+        # Events replayed from the log, and the compacted snapshot, are kept current too
+        logged = ConfigManager(str(Path(self.tmp.name) / "logged"), progress_backend="eventlog",
+                               curriculum_path=str(plan))
+        logged.initialize_student("Ada", "Beginner")
+        logged.event_log.append("lesson_completed", "lesson_0", "2024-01-01T10:00:00")
+        logged.reload_configs()
+        self.assertEqual(logged.progress["learning_path"]["next_recommended"],
+                         ["lesson_1.variables", "lesson_2.unit_tests"])
+        logged.event_log.compact()
+        snapshot = json.loads((logged.config_dir / "progress.json").read_text())
+        self.assertEqual(snapshot["learning_path"]["next_recommended"],
+                         ["lesson_1.variables", "lesson_2.unit_tests"])
+        logged.event_log.close()
+
+    def test_cohort_analytics(self):
+        """Test progress files are aggregated into distributions, funnels and risks."""
+        root = Path(self.tmp.name) / "students"
+        pool = ConfigManagerPool(str(root))
+        for name, completed, attempts in [("ada", 2, (10, 9)), ("bob", 0, (10, 2)), ("cy", 10, (0, 0))]:
+            config = pool.get(name)
+            config.initialize_student(name.title(), "Beginner")
+            for i in range(completed):
+                config.update_progress("lesson_completed", f"lesson_{i}")
+            if completed:
+                config.update_progress("lesson_started", f"lesson_{completed}")
+            for i in range(attempts[0]):
+                config.update_progress("exercise_completed" if i < attempts[1] else "exercise_attempted")
+        pool.get("dan").initialize_student("Dan", "Beginner")  # provisioned, never started
+        pool.clear()
+        (root / "broken").mkdir()
+        (root / "broken" / "progress.json").write_text("{not json")
+        (root / "empty").mkdir()
+
+        cohort = load_cohort(str(root))
+        self.assertEqual(cohort.students.tolist(), ["ada", "bob", "cy", "dan"])
+        self.assertEqual([student for student, _ in cohort.errors], ["broken"])
+        self.assertEqual(cohort.lessons[:3], ["lesson_0", "lesson_1", "lesson_2"])
+        self.assertEqual(cohort.lessons[-1], "lesson_10")
+
+        funnel = {entry["lesson"]: entry for entry in cohort.lesson_funnel()}
+        self.assertEqual((funnel["lesson_0"]["started"], funnel["lesson_0"]["completed"]), (4, 2))
+        self.assertEqual((funnel["lesson_2"]["started"], funnel["lesson_2"]["completed"]), (2, 1))
+
+        rates = cohort.distribution("success_rate")
+        self.assertEqual(rates["count"], 4)
+        self.assertAlmostEqual(rates["p50"], 0.1)
+        self.assertEqual(cohort.distribution("completed_lessons")["max"], 10)
+
+        at_risk = {entry["student"]: entry for entry in cohort.at_risk(now=datetime.now())}
+        self.assertEqual(sorted(at_risk), ["bob", "dan"])
+        self.assertEqual(at_risk["bob"]["reasons"], ["low_success_rate"])
+        self.assertEqual(at_risk["dan"]["reasons"], ["never_active"])
+        self.assertIsNone(at_risk["dan"]["days_inactive"])
+        later = cohort.at_risk(inactive_days=1, now=datetime(2100, 1, 1))
+        self.assertEqual(len(later), 4)
+
+        csv_path = Path(self.tmp.name) / "cohort.csv"
+        cohort.write_csv(str(csv_path))
+        lines = csv_path.read_text().splitlines()
+        self.assertEqual(len(lines), 5)
+        self.assertTrue(lines[0].startswith("student,exercises_completed"))
+        json.dumps(cohort.report())
+
+if __name__ == '__main__':
+    unittest.main()
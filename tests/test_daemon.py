@@ -0,0 +1,141 @@
+"""
+Test suite for the tutor daemon.
+"""
+
+import asyncio
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from setup.batch import BatchProvisioner
+from setup.daemon import LatencyHistogram, TutorDaemon
+from setup.daemon_client import DaemonError, TutorClient
+
+class TestDaemon(unittest.TestCase):
+    """Test cases for the tutor daemon."""
+
+    def setUp(self):
+        """Provision one student and start a daemon on a Unix socket."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.students = Path(self.tmp.name) / "students"
+        BatchProvisioner(output_dir=str(self.students)).provision({
+            "id": "ada", "name": "Ada", "skill_level": "Beginner",
+            "theme": "Space Exploration 🚀", "interests": ["web"],
+            "goals": "Build a website", "preferences": {"pace": "Quick"}
+        }, 1)
+
+        self.socket_path = str(Path(self.tmp.name) / "tutor.sock")
+        self.daemon = TutorDaemon(output_dir=str(self.students))
+        self.loop = asyncio.new_event_loop()
+        started = threading.Event()
+
+        def run():
+            asyncio.set_event_loop(self.loop)
+            self.loop.run_until_complete(self.daemon.start(socket_path=self.socket_path))
+            started.set()
+            self.loop.run_forever()
+
+        self.thread = threading.Thread(target=run, daemon=True)
+        self.thread.start()
+        self.assertTrue(started.wait(10))
+
+    def tearDown(self):
+        """Stop the daemon and clean up."""
+        asyncio.run_coroutine_threadsafe(self.daemon.stop(), self.loop).result(10)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(10)
+        self.loop.close()
+        self.tmp.cleanup()
+
+    def test_requests(self):
+        """Test settings, progress, prompts, plans and stats over the socket."""
+        with TutorClient(self.socket_path) as client:
+            self.assertEqual(client.call("ping"), "pong")
+            self.assertEqual(client.call("get_setting", path="editor.tab_size"), 4)
+            self.assertEqual(
+                client.call("get_preference", student="ada", path="preferences.pace"), "Quick"
+            )
+
+            stats = client.call("update_progress", student="ada",
+                                event="exercise_completed", value="ex_1")
+            self.assertEqual(stats["exercises_completed"], 1)
+            client.call("update_progress", student="ada", event="lesson_completed", value="lesson_0")
+            self.assertEqual(client.call("recommended_topics", student="ada", limit=1),
+                             ["lesson_1.environment_setup_using_terminal"])
+
+            prompt = client.call("customize_prompt", student="ada")
+            self.assertIn("## Purpose", prompt)
+            with self.assertRaises(DaemonError):
+                client.call("customize_prompt", student="ada", prompt="../../init.py")
+
+            result = client.call("generate_plan", student="ada", force=True)
+            self.assertTrue(Path(result["output"]).exists())
+            self.assertEqual(result["status"], "written")
+            self.assertEqual(client.call("generate_plan", student="ada")["status"], "unchanged")
+
+            with self.assertRaises(DaemonError):
+                client.call("get_preference", student="../ada")
+            with self.assertRaises(DaemonError):
+                client.call("no_such_method")
+            with self.assertRaisesRegex(DaemonError, "Invalid parameters"):
+                client.call("recommended_topics", student="ada", colour="red")
+            with self.assertRaisesRegex(DaemonError, "Internal error"):
+                client.call("recommended_topics", student="ada", limit="3")
+
+            stats = client.call("stats")
+            self.assertEqual(stats["latency"]["ping"]["count"], 1)
+            self.assertEqual(stats["pool"]["misses"], 1)
+
+        # Progress is flushed to disk when the daemon stops
+        asyncio.run_coroutine_threadsafe(self.daemon.stop(), self.loop).result(10)
+        progress = (self.students / "ada" / "progress.json").read_text()
+        self.assertIn('"exercises_completed": 1', progress)
+
+    def test_unknown_students_and_socket_reuse(self):
+        """Test unknown students touch no files and a live socket is never replaced."""
+        with TutorClient(self.socket_path) as client:
+            with self.assertRaisesRegex(DaemonError, "Unknown student: bob"):
+                client.call("get_preference", student="bob")
+            with self.assertRaisesRegex(DaemonError, "Unknown student: bob"):
+                client.call("update_progress", student="bob", event="lesson_started")
+            client.call("get_preference", student="ada")
+        self.assertFalse((self.students / "bob").exists())
+        self.assertEqual(len(self.daemon._student_locks), 0)
+
+        async def start_second(path):
+            await TutorDaemon(output_dir=str(self.students)).start(socket_path=path)
+
+        with self.assertRaises(OSError):
+            asyncio.run(start_second(self.socket_path))
+        not_a_socket = Path(self.tmp.name) / "notes.txt"
+        not_a_socket.write_text("keep me")
+        with self.assertRaises(FileExistsError):
+            asyncio.run(start_second(str(not_a_socket)))
+        self.assertEqual(not_a_socket.read_text(), "keep me")
+
+        # A socket nobody listens on any more is replaced
+        import socket
+        stale = Path(self.tmp.name) / "stale.sock"
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.bind(str(stale))
+        daemon = TutorDaemon(output_dir=str(self.students))
+        loop = asyncio.new_event_loop()
+        try:
+            loop.run_until_complete(daemon.start(socket_path=str(stale)))
+            loop.run_until_complete(daemon.stop())
+        finally:
+            loop.close()
+
+    def test_latency_histogram(self):
+        """Test bucketed percentiles never exceed the observed maximum."""
+        histogram = LatencyHistogram()
+        for latency in [5, 9, 20, 20, 300]:
+            histogram.record(latency)
+        summary = histogram.as_dict()
+        self.assertEqual(summary["count"], 5)
+        self.assertEqual(summary["p50_us"], 32)
+        self.assertEqual(summary["p99_us"], 300)
+        self.assertEqual(summary["buckets"], {"le_8us": 1, "le_16us": 1, "le_32us": 2, "le_512us": 1})
+
+if __name__ == '__main__':
+    unittest.main()
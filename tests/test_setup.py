@@ -2,12 +2,21 @@
 Test suite for setup modules.
 """
 
+import json
+import pickle
+import tempfile
+import threading
 import unittest
 from pathlib import Path
 from setup.assessment import UserAssessment
 from setup.workspace import WorkspaceManager
 from setup.lesson_plan import LessonPlanGenerator
-from setup.prompt_setup import PromptManager
+from setup.prompt_setup import CompiledPrompt, PromptManager
+from setup.batch import BatchProvisioner
+from setup.profile import UserProfile
+from setup.status import collect_status
+from setup.tracing import bytes_written, span, start_tracing, stop_tracing
+from setup.validation import LESSON_PLAN_VALIDATOR, PROMPT_VALIDATOR
 
 class TestSetup(unittest.TestCase):
     """Test cases for setup modules."""
@@ -26,7 +35,8 @@ class TestSetup(unittest.TestCase):
             "test_cursor",
             "test_docs",
             "test_prompt.md",
-            "test_lesson_plan.md"
+            "test_lesson_plan.md",
+            ".test_lesson_plan.md.fingerprint"
         ]
         for file in test_files:
             path = Path(file)
@@ -73,6 +83,71 @@ class TestSetup(unittest.TestCase):
         self.assertEqual(config["system_prompt_file"], "test_prompt.md")
         self.assertTrue(config["settings"]["auto_save"])
 
+    def test_workspace_concurrent_updates(self):
+        """Test concurrent deep-merge updates are neither lost nor corrupted."""
+        self.assertTrue(self.workspace.configure_workspace("test_prompt.md"))
+
+        def writer(index):
+            manager = WorkspaceManager(cursor_config_dir="test_cursor")
+            for j in range(15):
+                self.assertTrue(manager.update_workspace_config(
+                    {"settings": {"history": {f"w{index}_{j}": True}}}
+                ))
+
+        threads = [threading.Thread(target=writer, args=(i,)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        config = self.workspace._load_workspace_config()
+        self.assertEqual(len(config["settings"]["history"]), 60)
+        self.assertTrue(config["settings"]["auto_save"])
+
+    def test_workspace_lock_waits_on_windows(self):
+        """Test a blocking save keeps waiting when msvcrt.locking times out."""
+        import errno
+        import types
+        from unittest import mock
+        import setup.workspace as workspace_module
+
+        calls = []
+        def locking(fd, mode, nbytes):
+            calls.append(mode)
+            if mode == fake.LK_LOCK and calls.count(fake.LK_LOCK) < 3:
+                raise OSError(errno.EDEADLOCK, "Resource deadlock avoided")
+        fake = types.SimpleNamespace(LK_LOCK=1, LK_NBLCK=2, LK_UNLCK=0, locking=locking)
+
+        with mock.patch.object(workspace_module, "fcntl", None), \
+                mock.patch.object(workspace_module, "msvcrt", fake, create=True):
+            with self.workspace._locked(blocking=True) as acquired:
+                self.assertTrue(acquired)
+        self.assertEqual(calls, [fake.LK_LOCK] * 3 + [fake.LK_UNLCK])
+
+    def test_status_report(self):
+        """Test status collection for a provisioned workspace."""
+        Path("test_prompt.md").write_text("Test prompt content")
+        self.assertTrue(self.workspace.configure_workspace("test_prompt.md"))
+
+        with tempfile.TemporaryDirectory() as tmp:
+            Path(tmp, "progress.json").write_text(json.dumps({
+                "user_progress": {"current_lesson": {"id": "lesson_1", "status": "in_progress"},
+                                  "completed_lessons": ["lesson_0"]},
+                "practice_stats": {"exercises_completed": 3}
+            }))
+            status = collect_status(
+                cursor_config_dir="test_cursor",
+                prompt_file="test_prompt.md",
+                plan_file="test_lesson_plan.md",
+                config_dir=tmp
+            )
+
+        self.assertTrue(status["workspace"]["configured"])
+        self.assertEqual(status["prompt"]["size"], len("Test prompt content"))
+        self.assertFalse(status["lesson_plan"]["exists"])
+        self.assertEqual(status["progress"]["current_lesson"], "lesson_1")
+        self.assertEqual(status["progress"]["completed_lessons"], 1)
+
     def test_lesson_plan_generation(self):
         """Test lesson plan generation."""
         # Create test template
@@ -90,14 +165,160 @@ class TestSetup(unittest.TestCase):
             "skill_level": "Beginner",
             "theme": "Space"
         }
-        self.assertTrue(
+        self.assertEqual(
             self.lesson_gen.generate_plan(
                 "template.md",
                 "test_lesson_plan.md",
                 user_data
-            )
+            ),
+            "written"
         )
         self.assertTrue(Path("test_lesson_plan.md").exists())
+        self.assertEqual(
+            self.lesson_gen.generate_plan("template.md", "test_lesson_plan.md", user_data),
+            "unchanged"
+        )
+
+    def test_streamed_lesson_plan_validation(self):
+        """Test large plans are streamed, validated, and not replaced when invalid."""
+        Path("test_docs").mkdir(exist_ok=True)
+        sections = ["# Learning Objectives", "## Prerequisites", "## Content",
+                    "## Exercises", "## Additional Resources"]
+        body = "\n".join(f"{s}\n{{% for i in range(n) %}}{{{{ theme }}}} exercise {{{{ i }}}}\n{{% endfor %}}"
+                         for s in sections)
+        Path("test_docs/template.md").write_text(body)
+        Path("test_docs/short.md").write_text("# Learning Objectives\n{{ theme }}")
+
+        user_data = {"theme": "Space"}
+        self.lesson_gen.env.globals["n"] = 4000
+        try:
+            self.assertTrue(self.lesson_gen.generate_plan(
+                "template.md", "test_lesson_plan.md", user_data, validate=True))
+        finally:
+            del self.lesson_gen.env.globals["n"]
+        content = Path("test_lesson_plan.md").read_text()
+        self.assertGreater(len(content), 200_000)
+        self.assertTrue(self.lesson_gen.validate_lesson_plan(content))
+
+        # An invalid plan leaves the previous one and no temporary files behind
+        self.assertIsNone(self.lesson_gen.generate_plan(
+            "short.md", "test_lesson_plan.md", user_data, validate=True))
+        self.assertEqual(Path("test_lesson_plan.md").read_text(), content)
+        self.assertEqual(list(Path(".").glob(".test_lesson_plan.md.*.tmp")), [])
+
+    def test_section_validation_report(self):
+        """Test missing, duplicated and out-of-order sections in one pass."""
+        text = "\n".join([
+            "## Usage", "## Purpose", "## Parameters", "## Usage",
+            "## Response Format"
+        ] + ["line"] * 50)
+        report = PROMPT_VALIDATOR.check(text)
+        self.assertEqual(report.missing, ["## Example Interactions"])
+        self.assertEqual(report.duplicated, ["## Usage"])
+        self.assertEqual(report.out_of_order, ["## Usage"])
+        self.assertEqual(report.line_count, 55)
+        self.assertFalse(report.ok)
+        self.assertEqual(report.errors(), ["Missing required section: ## Example Interactions"])
+
+        # Headings split across blocks are found exactly once
+        scanner = LESSON_PLAN_VALIDATOR.scanner()
+        for piece in ["# Learning Obj", "ectives\n## Prereq", "uisites\n## Con", "tent",
+                      "\n## Con", "tent\n"]:
+            scanner.feed(piece)
+        report = scanner.report()
+        self.assertEqual(report.missing, ["## Exercises", "## Additional Resources"])
+        self.assertEqual(report.duplicated, ["## Content"])
+        self.assertEqual(report.line_count, 5)
+        self.assertTrue(report.too_short)
+
+        # Same verdicts as substring checks on the bundled prompts
+        for path in Path("ai_agents/prompts").glob("*.md"):
+            content = path.read_text()
+            expected = (all(s in content for s in PROMPT_VALIDATOR.sections)
+                        and len(content.split("\n")) >= 50)
+            self.assertEqual(PROMPT_VALIDATOR.check(content).ok, expected)
+
+        # Prompts valid from their literal text alone skip per-render validation
+        valid = Path("ai_agents/prompts/learning_assistant.md").read_text()
+        self.assertTrue(CompiledPrompt(valid).always_valid())
+        split = CompiledPrompt(valid.replace("## Purpose", "## Pur{{X}}pose"))
+        self.assertFalse(split.always_valid())
+        self.assertTrue(self.prompt_mgr.validate_prompt(split.render({"X": ""})))
+
+    def test_parallel_lesson_plan_generation(self):
+        """Test rendering lesson plans for a cohort with worker processes."""
+        Path("test_docs").mkdir(exist_ok=True)
+        Path("test_docs/template.md").write_text("Plan for {{student_name}} ({{skill_level}})")
+
+        with tempfile.TemporaryDirectory() as tmp:
+            records = [
+                (f"student_{i}", {"name": f"Student {i}", "skill_level": "Beginner"})
+                for i in range(6)
+            ]
+            results = self.lesson_gen.generate_plans(
+                records, tmp, template_file="template.md", workers=2, chunksize=2
+            )
+
+            self.assertEqual([r["student"] for r in results], [s for s, _ in records])
+            self.assertTrue(all(r["success"] for r in results))
+            if bytes_written() is not None:
+                # Workers report what they wrote; the parent cannot observe it
+                self.assertTrue(all(r["bytes_written"] > 0 for r in results))
+            self.assertEqual(
+                Path(results[3]["output"]).read_text(),
+                "Plan for Student 3 (Beginner)"
+            )
+
+    def test_unchanged_lesson_plan_is_skipped(self):
+        """Test regeneration is skipped when render inputs are unchanged."""
+        Path("test_docs").mkdir(exist_ok=True)
+        Path("test_docs/template.md").write_text("Plan for {{student_name}} ({{pace}})")
+
+        with tempfile.TemporaryDirectory() as tmp:
+            user_data = {"name": "Ada", "preferences": {"pace": "Quick"}}
+            run = lambda data: self.lesson_gen.generate_plans(
+                [("ada", data)], tmp, template_file="template.md", workers=1
+            )[0]
+
+            self.assertEqual(run(user_data)["status"], "written")
+            self.assertEqual(run(user_data)["status"], "unchanged")
+
+            # An unvalidated plan is not reused when validation is requested
+            Path("test_docs/template.md").write_text(
+                "# Learning Objectives\n## Prerequisites\n## Content\n## Exercises\n"
+                "## Additional Resources\n" + "line\n" * 60
+            )
+            self.assertEqual(run(user_data)["status"], "written")
+            output = str(Path(tmp) / "ada" / "LESSON_PLAN_CUSTOM.md")
+            template = self.lesson_gen._load_template("template.md")
+            self.assertEqual(
+                self.lesson_gen._write_plan(template, output, user_data, validate=True), "written"
+            )
+            self.assertEqual(
+                self.lesson_gen._write_plan(template, output, user_data, validate=True), "unchanged"
+            )
+            self.assertEqual(run(user_data)["status"], "unchanged")
+
+            Path("test_docs/template.md").write_text("Plan for {{student_name}} ({{pace}})")
+            user_data["preferences"]["pace"] = "Thorough"
+            result = run(user_data)
+            self.assertEqual(result["status"], "written")
+            self.assertEqual(Path(result["output"]).read_text(), "Plan for Ada (Thorough)")
+
+    def test_template_cache(self):
+        """Test compiled templates are shared and cached on disk."""
+        Path("test_docs").mkdir(exist_ok=True)
+        Path("test_docs/template.md").write_text("Hello {{student_name}}")
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            first = LessonPlanGenerator(template_dir="test_docs", cache_dir=cache_dir)
+            second = LessonPlanGenerator(template_dir="test_docs", cache_dir=cache_dir)
+            self.assertIs(first.env, second.env)
+            self.assertIs(
+                first._load_template("template.md"),
+                second._load_template("template.md")
+            )
+            self.assertEqual(len(list(Path(cache_dir).glob("*.cache"))), 1)
 
     def test_prompt_customization(self):
         """Test prompt customization."""
@@ -121,5 +342,174 @@ class TestSetup(unittest.TestCase):
         self.assertIn("Theme: Space", result)
         self.assertIn("Pace: Quick", result)
 
+    def test_batch_provisioning(self):
+        """Test provisioning several students from a JSON-lines file."""
+        with tempfile.TemporaryDirectory() as tmp:
+            records = [
+                {
+                    "id": "ada",
+                    "name": "Ada",
+                    "skill_level": "Beginner",
+                    "theme": "Space Exploration 🚀",
+                    "interests": ["web"],
+                    "goals": "Build a website",
+                    "preferences": {"pace": "Quick"}
+                },
+                {"id": "bad", "skill_level": "Expert"}
+            ]
+            records.append(dict(records[0], name="Not Ada"))  # same id as the first record
+            answers = Path(tmp) / "answers.jsonl"
+            answers.write_text(
+                "\n".join(json.dumps(r) for r in records) + "\nnot json\n",
+                encoding="utf-8"
+            )
+            report = Path(tmp) / "report.jsonl"
+
+            provisioner = BatchProvisioner(output_dir=str(Path(tmp) / "students"))
+            summary = provisioner.run(str(answers), str(report))
+
+            self.assertEqual(summary, {"total": 4, "succeeded": 1, "failed": 3})
+            student_dir = Path(tmp) / "students" / "ada"
+            self.assertTrue((student_dir / "LESSON_PLAN_CUSTOM.md").exists())
+            self.assertTrue((student_dir / "prompts" / "learning_assistant.md").exists())
+            self.assertTrue((student_dir / "prompts" / "debug_assistant.md").exists())
+            self.assertTrue((student_dir / "student_config.yaml").exists())
+            self.assertTrue((student_dir / ".cursor" / "workspace_config.yaml").exists())
+
+            results = [json.loads(line) for line in report.read_text().splitlines()]
+            self.assertEqual([r["status"] for r in results], ["ok", "failed", "failed", "failed"])
+            self.assertEqual(
+                results[1]["error"],
+                "Invalid assessment data: Missing required fields: theme, interests, goals, preferences"
+            )
+            self.assertEqual(results[2]["error"], "Duplicate student ada (first used on line 1)")
+            self.assertIn("Ada", (student_dir / "student_config.yaml").read_text())
+            self.assertNotIn("Not Ada", (student_dir / "student_config.yaml").read_text())
+
+            # Rendering plans in worker processes keeps the report in line order
+            parallel = BatchProvisioner(output_dir=str(Path(tmp) / "parallel"), workers=2)
+            self.assertEqual(parallel.run(str(answers), str(report)), summary)
+            results = [json.loads(line) for line in report.read_text().splitlines()]
+            self.assertEqual([r["line"] for r in results], [1, 2, 3, 4])
+            self.assertEqual(results[0]["status"], "ok")
+
+    def test_batch_tracing(self):
+        """Test provisioning spans are nested and written in both trace formats."""
+        record = {
+            "id": "ada", "name": "Ada", "skill_level": "Beginner",
+            "theme": "Space Exploration 🚀", "interests": ["web"],
+            "goals": "Build a website", "preferences": {"pace": "Quick"}
+        }
+        with tempfile.TemporaryDirectory() as tmp:
+            provisioner = BatchProvisioner(output_dir=str(Path(tmp) / "students"))
+
+            trace_file = Path(tmp) / "trace.jsonl"
+            start_tracing(str(trace_file), "jsonl")
+            try:
+                provisioner.provision(record, 1)
+            finally:
+                stop_tracing()
+            spans = {s["name"]: s for s in map(json.loads, trace_file.read_text().splitlines())}
+            self.assertEqual(
+                set(spans),
+                {"provision", "validate", "config_init", "workspace",
+                 "plan_generation", "prompt_customisation"}
+            )
+            root = spans["provision"]
+            self.assertIsNone(root["parent_id"])
+            self.assertEqual(root["attrs"], {"student": "ada", "line": 1, "status": "ok"})
+            self.assertEqual(spans["config_init"]["parent_id"], root["span_id"])
+            self.assertGreaterEqual(root["wall_us"], spans["config_init"]["wall_us"])
+            if root["bytes_written"] is not None:
+                self.assertGreater(spans["config_init"]["bytes_written"], 0)
+            self.assertIsNone(spans["validate"]["bytes_written"])
+
+            chrome_file = Path(tmp) / "trace.json"
+            start_tracing(str(chrome_file), "chrome")
+            try:
+                provisioner.provision(record, 1)
+            finally:
+                stop_tracing()
+            events = json.loads(chrome_file.read_text())
+            self.assertEqual(len(events), 6)
+            self.assertTrue(all(e["ph"] == "X" and "cpu_us" in e["args"] for e in events))
+
+            # A span still open when the tracer closes is dropped
+            start_tracing(str(Path(tmp) / "late.jsonl"))
+            with span("late"):
+                stop_tracing()
+            self.assertEqual((Path(tmp) / "late.jsonl").read_text(), "")
+
+        # Without an active tracer spans are shared no-ops
+        with span("noop") as s:
+            s.set(ok=True)
+
+    def test_prompt_profile_placeholders(self):
+        """Test placeholders drawn from the whole profile and cache invalidation."""
+        Path("test_prompt.md").write_text(
+            "{{NAME}} likes {{INTERESTS}} at {{PREFERENCES_PACE}} pace. {{UNKNOWN}}"
+        )
+        user_data = {
+            "name": "Ada",
+            "interests": ["web", "ai"],
+            "preferences": {"pace": "Quick"}
+        }
+        self.assertEqual(
+            self.prompt_mgr.customize_prompt(user_data),
+            "Ada likes web, ai at Quick pace. {{UNKNOWN}}"
+        )
+
+        Path("test_prompt.md").write_text("Goals: {{GOALS}}")
+        self.assertEqual(
+            self.prompt_mgr.customize_prompt({"goals": "Ship it"}),
+            "Goals: Ship it"
+        )
+
+    def test_user_profile(self):
+        """Test profiles validate once, round-trip and are accepted by every manager."""
+        data = {
+            "name": "Ada",
+            "skill_level": "Beginner",
+            "theme": "Space Exploration 🚀",
+            "interests": ["web", "ai"],
+            "goals": "Build a website",
+            "preferences": {"pace": "Quick", "practice_frequency": "End of each lesson",
+                            "show_hints": False, "notifications_enabled": True}
+        }
+        profile = UserProfile.from_dict(data)
+        self.assertEqual(profile.to_dict(), data)
+        self.assertEqual(pickle.loads(pickle.dumps(profile)), profile)
+        self.assertIs(UserProfile.from_dict(json.loads(json.dumps(data))).theme, profile.theme)
+        with self.assertRaises(AttributeError):
+            profile.pace = "Thorough"
+        self.assertEqual(profile.replace(pace="Thorough").pace, "Thorough")
+        for invalid in ({**data, "skill_level": "Expert"}, {**data, "interests": "web"},
+                        {k: v for k, v in data.items() if k != "goals"}):
+            with self.assertRaises(ValueError):
+                UserProfile.from_dict(invalid)
+            self.assertFalse(self.assessment.validate_assessment(invalid))
+        self.assertFalse(self.assessment.validate_assessment({**data, "preferences": "Quick"}))
+        self.assertIs(self.assessment.build_profile(profile), profile)
+
+        # Managers give the same results for a profile and its dictionary
+        self.assertTrue(self.assessment.validate_assessment(profile))
+        self.assertEqual(self.lesson_gen.customize_lessons(profile),
+                         self.lesson_gen.customize_lessons(data))
+        Path("test_docs").mkdir(exist_ok=True)
+        Path("test_docs/template.md").write_text("{{ student_name }} {{ interests }} {{ pace }}")
+        self.assertTrue(self.lesson_gen.generate_plan("template.md", "test_lesson_plan.md", profile))
+        self.assertEqual(Path("test_lesson_plan.md").read_text(), "Ada ['web', 'ai'] Quick")
+        self.assertTrue(self.lesson_gen.generate_plan("template.md", "test_lesson_plan.md", data))
+        self.assertEqual(Path("test_lesson_plan.md").read_text(), "Ada ['web', 'ai'] Quick")
+        Path("test_prompt.md").write_text("{{PREFERENCES_PRACTICE_FREQUENCY}} / {{INTERESTS}}")
+        self.assertEqual(self.prompt_mgr.customize_prompt(profile), "End of each lesson / web, ai")
+
+        from config.config_manager import ConfigManager
+        with tempfile.TemporaryDirectory() as tmp:
+            config = ConfigManager(tmp)
+            config.initialize_student(profile.name, profile.skill_level, profile)
+            self.assertEqual(config.get_student_preference("preferences.pace"), "Quick")
+            self.assertEqual(config.get_student_preference("interests"), ["web", "ai"])
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
@@ -0,0 +1,87 @@
+"""
+Startup regression tests based on `python -X importtime`.
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# Cumulative import budget for init.py, in microseconds
+INIT_IMPORT_BUDGET_US = 100_000
+
+# Heavy dependencies that importing the CLI or the packages must not load
+DEFERRED_MODULES = {"questionary", "prompt_toolkit", "jinja2", "yaml", "webbrowser", "sqlite3"}
+
+def import_times(statement: str) -> dict:
+    """Run a statement in a fresh interpreter and return {module: cumulative_us}."""
+    with tempfile.TemporaryDirectory() as cwd:
+        env = dict(os.environ, PYTHONPATH=str(REPO_ROOT))
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", statement],
+            cwd=cwd, env=env, capture_output=True, text=True, check=True
+        )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        try:
+            times[name.strip()] = int(cumulative)
+        except ValueError:
+            continue  # header line
+    return times
+
+class TestStartup(unittest.TestCase):
+    """Cold-start regression tests."""
+
+    def test_init_import_is_lazy(self):
+        """Test importing init.py stays within budget and defers heavy imports."""
+        times = import_times("import init")
+        self.assertFalse(DEFERRED_MODULES & set(times), "heavy modules imported at startup")
+        self.assertLess(times["init"], INIT_IMPORT_BUDGET_US)
+
+    def test_packages_import_lazily(self):
+        """Test importing the packages does not import their submodules."""
+        times = import_times("import setup, config")
+        self.assertNotIn("setup.assessment", times)
+        self.assertNotIn("config.config_manager", times)
+        self.assertFalse(DEFERRED_MODULES & set(times))
+
+    def test_config_manager_defers_progress_rules(self):
+        """Test achievements and the curriculum graph load only when progress needs them."""
+        times = import_times("from config.config_manager import ConfigManager")
+        self.assertNotIn("config.achievements", times)
+        self.assertNotIn("config.curriculum", times)
+
+    def test_batch_skips_interactive_dependencies(self):
+        """Test the batch path does not import questionary or webbrowser."""
+        times = import_times("from setup.batch import BatchProvisioner")
+        self.assertNotIn("questionary", times)
+        self.assertNotIn("webbrowser", times)
+
+    def test_status_path_is_lightweight(self):
+        """Test the status command avoids YAML, templates and questionary."""
+        times = import_times("from setup.status import collect_status; collect_status()")
+        self.assertFalse(DEFERRED_MODULES & set(times))
+
+    def test_status_command_is_read_only(self):
+        """Test init.py --status skips argparse and logging and writes no log file."""
+        with tempfile.TemporaryDirectory() as cwd:
+            env = dict(os.environ, PYTHONPATH=str(REPO_ROOT))
+            result = subprocess.run(
+                [sys.executable, "-X", "importtime", str(REPO_ROOT / "init.py"), "--status", "--json"],
+                cwd=cwd, env=env, capture_output=True, text=True, check=True
+            )
+            self.assertEqual(os.listdir(cwd), [])
+        imported = {line.split("|")[-1].strip() for line in result.stderr.splitlines()}
+        self.assertNotIn("argparse", imported)
+        self.assertNotIn("logging", imported)
+        self.assertIn('"workspace"', result.stdout)
+
+if __name__ == '__main__':
+    unittest.main()